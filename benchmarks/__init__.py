@@ -0,0 +1,9 @@
+"""
+Benchmarks for the hwt synthesis and simulation pipeline.
+
+The benchmarks are not part of the installed package, run them from the root of the repository:
+
+.. code-block:: bash
+
+    python -m benchmarks.synthesis --help
+"""
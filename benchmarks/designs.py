@@ -0,0 +1,366 @@
+"""
+Synthetic designs with a single scaling parameter SIZE,
+used to measure how the elaboration and serialization time grows with the size of the design,
+and small representative components used to measure the simulation.
+"""
+from typing import Dict, Type
+
+from hwt.code import If, Switch
+from hwt.hObjList import HObjList
+from hwt.hdl.types.bits import HBits
+from hwt.hdl.types.struct import HStruct
+from hwt.hwIOs.hwIOStruct import HdlType_to_HwIO
+from hwt.hwIOs.std import HwIOVectSignal, HwIOClk, HwIORst_n, HwIOSignal, \
+    HwIOFifoWriter, HwIOFifoReader, HwIODataRdVld, HwIOBramPort_noClk
+from hwt.hwModule import HwModule
+from hwt.hwParam import HwParam
+from hwt.math import log2ceil
+from hwt.pyUtils.typingFuture import override
+
+
+class WideAdder(HwModule):
+    """
+    Sum of SIZE wide operands (balanced tree of adders)
+    """
+
+    @override
+    def hwConfig(self):
+        self.DATA_WIDTH = HwParam(128)
+        self.SIZE = HwParam(8)
+
+    @override
+    def hwDeclr(self):
+        self.din = HObjList(HwIOVectSignal(self.DATA_WIDTH) for _ in range(self.SIZE))
+        self.dout = HwIOVectSignal(self.DATA_WIDTH)._m()
+
+    @override
+    def hwImpl(self):
+        operands = list(self.din)
+        while len(operands) > 1:
+            reduced = [a + b for a, b in zip(operands[::2], operands[1::2])]
+            if len(operands) % 2:
+                reduced.append(operands[-1])
+            operands = reduced
+
+        self.dout(operands[0])
+
+
+class DeepIfTree(HwModule):
+    """
+    Multiplexer described as an If-Else chain SIZE levels deep
+    """
+
+    @override
+    def hwConfig(self):
+        self.DATA_WIDTH = HwParam(8)
+        self.SIZE = HwParam(8)
+
+    @override
+    def hwDeclr(self):
+        self.sel = HwIOVectSignal(self.SIZE)
+        self.din = HObjList(HwIOVectSignal(self.DATA_WIDTH) for _ in range(self.SIZE + 1))
+        self.dout = HwIOVectSignal(self.DATA_WIDTH)._m()
+
+    @override
+    def hwImpl(self):
+        res = self._sig("res", HBits(self.DATA_WIDTH))
+        stm = res(self.din[self.SIZE])
+        for i in reversed(range(self.SIZE)):
+            stm = If(self.sel[i],
+                res(self.din[i])
+            ).Else(
+                stm
+            )
+        self.dout(res)
+
+
+class SwitchFsm(HwModule):
+    """
+    FSM with SIZE states, each state has its own transition condition and output
+    """
+
+    @override
+    def hwConfig(self):
+        self.DATA_WIDTH = HwParam(8)
+        self.SIZE = HwParam(8)
+
+    @override
+    def hwDeclr(self):
+        self.clk = HwIOClk()
+        self.rst_n = HwIORst_n()
+        self.din = HwIOVectSignal(max(log2ceil(self.SIZE), 1))
+        self.dout = HwIOVectSignal(self.DATA_WIDTH)._m()
+
+    @override
+    def hwImpl(self):
+        SIZE = self.SIZE
+        st_t = HBits(max(log2ceil(SIZE), 1))
+        st = self._reg("st", st_t, def_val=0)
+        fsm = Switch(st).add_cases(
+            (i, If(self.din._eq(i),
+                    st((i + 1) % SIZE)
+                ).Elif(self.din._eq((i + 2) % SIZE),
+                    st((i + 3) % SIZE)
+                )
+            )
+            for i in range(SIZE)
+        )
+        out = Switch(st).add_cases(
+            (i, self.dout((i * 7) % (2 ** self.DATA_WIDTH)))
+            for i in range(SIZE)
+        )
+        if SIZE != 2 ** st_t.bit_length():
+            fsm.Default(st(0))
+            out.Default(self.dout(0))
+
+
+class ReplicatedSubmodulesItem(HwModule):
+
+    @override
+    def hwConfig(self):
+        self.DATA_WIDTH = HwParam(8)
+
+    @override
+    def hwDeclr(self):
+        self.a = HwIOVectSignal(self.DATA_WIDTH)
+        self.b = HwIOVectSignal(self.DATA_WIDTH)
+        self.dout = HwIOVectSignal(self.DATA_WIDTH)._m()
+
+    @override
+    def hwImpl(self):
+        self.dout((self.a + self.b) ^ self.a)
+
+
+class ReplicatedSubmodules(HwModule):
+    """
+    Chain of SIZE instances of the same component
+    """
+
+    @override
+    def hwConfig(self):
+        ReplicatedSubmodulesItem.hwConfig(self)
+        self.SIZE = HwParam(8)
+
+    @override
+    def hwDeclr(self):
+        self.din = HwIOVectSignal(self.DATA_WIDTH)
+        self.dout = HwIOVectSignal(self.DATA_WIDTH)._m()
+        with self._hwParamsShared():
+            self.items = HObjList(ReplicatedSubmodulesItem() for _ in range(self.SIZE))
+
+    @override
+    def hwImpl(self):
+        prev = self.din
+        for item in self.items:
+            item.a(self.din)
+            item.b(prev)
+            prev = item.dout
+        self.dout(prev)
+
+
+class WideStructHwIO(HwModule):
+    """
+    Register for a struct with SIZE fields
+    """
+
+    @override
+    def hwConfig(self):
+        self.DATA_WIDTH = HwParam(8)
+        self.SIZE = HwParam(8)
+
+    def _struct_t(self):
+        return HStruct(*((HBits(self.DATA_WIDTH), f"f{i:d}") for i in range(self.SIZE)))
+
+    @override
+    def hwDeclr(self):
+        self.clk = HwIOClk()
+        t = self._struct_t()
+        self.din = HdlType_to_HwIO().apply(t)
+        self.dout = HdlType_to_HwIO().apply(t)._m()
+
+    @override
+    def hwImpl(self):
+        r = self._reg("r", self._struct_t())
+        r(self.din)
+        self.dout(r)
+
+
+# name: design class, every class has SIZE parameter
+DESIGNS: Dict[str, Type[HwModule]] = {
+    "wide_adder": WideAdder,
+    "deep_if_tree": DeepIfTree,
+    "switch_fsm": SwitchFsm,
+    "replicated_submodules": ReplicatedSubmodules,
+    "wide_struct_hwio": WideStructHwIO,
+}
+
+
+def buildDesign(name: str, size: int) -> HwModule:
+    """
+    Create a new instance of the design (each instance can be elaborated only once)
+    """
+    m = DESIGNS[name]()
+    m.SIZE = size
+    return m
+
+
+class SimCounter(HwModule):
+    """
+    Counter with enable
+    """
+
+    @override
+    def hwConfig(self):
+        self.DATA_WIDTH = HwParam(32)
+
+    @override
+    def hwDeclr(self):
+        self.clk = HwIOClk()
+        self.rst_n = HwIORst_n()
+        self.en = HwIOSignal()
+        self.dout = HwIOVectSignal(self.DATA_WIDTH)._m()
+
+    @override
+    def hwImpl(self):
+        r = self._reg("r", HBits(self.DATA_WIDTH), def_val=0)
+        If(self.en,
+           r(r + 1)
+        )
+        self.dout(r)
+
+
+class SimFifo(HwModule):
+    """
+    FIFO with a memory in registers, the read data are available one clock after the read
+    """
+
+    @override
+    def hwConfig(self):
+        self.DATA_WIDTH = HwParam(8)
+        self.DEPTH = HwParam(16)
+
+    @override
+    def hwDeclr(self):
+        assert self.DEPTH >= 2 and self.DEPTH & (self.DEPTH - 1) == 0, ("DEPTH has to be power of 2", self.DEPTH)
+        self.clk = HwIOClk()
+        self.rst_n = HwIORst_n()
+        with self._hwParamsShared():
+            self.dataIn = HwIOFifoWriter()
+            self.dataOut = HwIOFifoReader()._m()
+
+    @override
+    def hwImpl(self):
+        DEPTH = self.DEPTH
+        ptr_t = HBits(log2ceil(DEPTH))
+        mem = self._sig("mem", HBits(self.DATA_WIDTH)[DEPTH])
+        wr_ptr = self._reg("wr_ptr", ptr_t, def_val=0)
+        rd_ptr = self._reg("rd_ptr", ptr_t, def_val=0)
+        size = self._reg("size", HBits(log2ceil(DEPTH + 1)), def_val=0)
+        dout = self._reg("dout", HBits(self.DATA_WIDTH))
+
+        din, dOut = self.dataIn, self.dataOut
+        full = size._eq(DEPTH)
+        empty = size._eq(0)
+        wr_en = self._sig("wr_en")
+        rd_en = self._sig("rd_en")
+        wr_en(din.en & ~full)
+        rd_en(dOut.en & ~empty)
+
+        If(self.clk._onRisingEdge(),
+            If(wr_en,
+               mem[wr_ptr](din.data)
+            )
+        )
+        If(wr_en,
+           wr_ptr(wr_ptr + 1)
+        )
+        If(rd_en,
+           rd_ptr(rd_ptr + 1),
+           dout(mem[rd_ptr]),
+        )
+        If(wr_en & ~rd_en,
+           size(size + 1)
+        ).Elif(~wr_en & rd_en,
+           size(size - 1)
+        )
+        din.wait(full)
+        dOut.wait(empty)
+        dOut.data(dout)
+
+
+class SimHandshakePipeline(HwModule):
+    """
+    Pipeline of SIZE registers with a ready/valid handshake
+    """
+
+    @override
+    def hwConfig(self):
+        self.DATA_WIDTH = HwParam(32)
+        self.SIZE = HwParam(4)
+
+    @override
+    def hwDeclr(self):
+        self.clk = HwIOClk()
+        self.rst_n = HwIORst_n()
+        with self._hwParamsShared():
+            self.dataIn = HwIODataRdVld()
+            self.dataOut = HwIODataRdVld()._m()
+
+    @override
+    def hwImpl(self):
+        stages = [(self._reg(f"st{i:d}_data", HBits(self.DATA_WIDTH)),
+                   self._reg(f"st{i:d}_vld", def_val=0))
+                  for i in range(self.SIZE)]
+        # ready of the input of the stage
+        rds = [self._sig(f"st{i:d}_rd") for i in range(self.SIZE)]
+        for i, ((data, vld), rd) in enumerate(zip(stages, rds)):
+            if i == 0:
+                in_data, in_vld = self.dataIn.data, self.dataIn.vld
+            else:
+                in_data, in_vld = stages[i - 1]
+
+            if i == self.SIZE - 1:
+                out_rd = self.dataOut.rd
+            else:
+                out_rd = rds[i + 1]
+
+            rd(~vld | out_rd)
+            If(rd,
+               data(in_data),
+               vld(in_vld),
+            )
+
+        self.dataIn.rd(rds[0])
+        data, vld = stages[-1]
+        self.dataOut.data(data)
+        self.dataOut.vld(vld)
+
+
+class SimRam(HwModule):
+    """
+    Single port RAM with a read latency 1
+    """
+
+    @override
+    def hwConfig(self):
+        self.ADDR_WIDTH = HwParam(8)
+        self.DATA_WIDTH = HwParam(32)
+
+    @override
+    def hwDeclr(self):
+        self.clk = HwIOClk()
+        with self._hwParamsShared():
+            self.port = HwIOBramPort_noClk()
+
+    @override
+    def hwImpl(self):
+        p = self.port
+        mem = self._sig("ram_memory", HBits(self.DATA_WIDTH)[2 ** self.ADDR_WIDTH])
+        If(self.clk._onRisingEdge(),
+            If(p.en,
+                If(p.we,
+                   mem[p.addr](p.din)
+                ),
+                p.dout(mem[p.addr]),
+            )
+        )
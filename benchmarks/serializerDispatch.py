@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the dispatch of :meth:`hwt.serializer.generic.to_hdl_ast.ToHdlAst.as_hdl`.
+
+For each serializer it measures the time of as_hdl() call for an object with its own as_hdl_* method
+and for a signal which falls back to as_hdl_HdlSignalItem. The converting methods are replaced
+by trivial ones so only the lookup of the method is measured (with the MRO of the real serializer).
+
+.. code-block:: bash
+
+    python -m benchmarks.serializerDispatch --json serializerDispatch.json
+    # only the generic ToHdlAst (does not require the dependencies of the concrete serializers)
+    python -m benchmarks.serializerDispatch --targets generic
+"""
+import argparse
+import importlib
+import sys
+from typing import Callable, List, Optional, Sequence
+
+from benchmarks.utils import measureTime, median, environmentInfo, dumpResults
+from hwt.hdl.types.bits import HBits
+from hwt.synthesizer.rtlLevel.netlist import RtlNetlist
+
+# name: "module:class" of the ToHdlAst class (imported lazily so the targets can be selected
+# in an environment where some serializers can not be imported)
+TARGETS = {
+    "generic": "hwt.serializer.generic.to_hdl_ast:ToHdlAst",
+    "vhdl": "hwt.serializer.vhdl:ToHdlAstVhdl2008",
+    "verilog": "hwt.serializer.verilog:ToHdlAstVerilog",
+    "systemc": "hwt.serializer.systemC:ToHdlAstSystemC",
+    "simmodel": "hwt.serializer.simModel:ToHdlAstSimModel",
+    "hwt": "hwt.serializer.hwt:ToHdlAstHwt",
+}
+
+DEFAULT_CALLS = 100000
+
+
+class _DispatchBenchObj():
+    pass
+
+
+def _importTarget(target: str) -> type:
+    module_name, cls_name = TARGETS[target].split(":")
+    return getattr(importlib.import_module(module_name), cls_name)
+
+
+def _mkSerializer(to_hdl_ast_cls: type):
+    """
+    :return: instance of subclass of to_hdl_ast_cls with trivial converting methods
+    """
+    cls = type(f"{to_hdl_ast_cls.__name__:s}_dispatchBench", (to_hdl_ast_cls,), {
+        "as_hdl__DispatchBenchObj": lambda self, o: o,
+        "as_hdl_HdlSignalItem": lambda self, o, declaration=False: o,
+    })
+    # the constructor is skipped, the state of the serializer is not used by the dispatch
+    return cls.__new__(cls)
+
+
+def _mkRun(ser, obj, calls: int) -> Callable[[], object]:
+    as_hdl = ser.as_hdl
+
+    def run():
+        for _ in range(calls):
+            as_hdl(obj)
+
+    return run
+
+
+def runSerializerDispatchBenchmark(targets: Sequence[str]=tuple(TARGETS.keys()),
+                                   calls: int=DEFAULT_CALLS,
+                                   repeat: int=5,
+                                   log: Optional[Callable[[str], None]]=None) -> dict:
+    """
+    :param calls: number of as_hdl() calls in a single time measurement
+    :param repeat: number of time measurements for each case (the min is used)
+    :return: dictionary with results which can be stored as JSON
+    """
+    objs = {
+        "own_method": _DispatchBenchObj(),
+        "signal_fallback": RtlNetlist().sig("a", HBits(8)),
+    }
+    results = []
+    for target in targets:
+        ser = _mkSerializer(_importTarget(target))
+        for case, obj in objs.items():
+            times = measureTime(_mkRun(ser, obj, calls), repeat)
+            r = {
+                "target": target,
+                "case": case,
+                "times": times,
+                "time_median": median(times),
+                "ns_per_call": min(times) / calls * 1e9,
+            }
+            results.append(r)
+            if log is not None:
+                log(f"{target:s} {case:s} {r['ns_per_call']:.1f}ns/call")
+
+    return {
+        "benchmark": "serializerDispatch",
+        "environment": environmentInfo(),
+        "calls": calls,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]]=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--targets", default=",".join(TARGETS.keys()),
+                        help="comma separated list of targets (%(default)s)")
+    parser.add_argument("--calls", type=int, default=DEFAULT_CALLS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="file where results should be stored")
+    args = parser.parse_args(argv)
+
+    targets = [t for t in args.targets.split(",") if t]
+    for t in targets:
+        if t not in TARGETS:
+            parser.error(f"unknown target {t:s}")
+
+    res = runSerializerDispatchBenchmark(targets, calls=args.calls, repeat=args.repeat, log=print)
+    if args.json:
+        with open(args.json, "w") as f:
+            dumpResults(res, f)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
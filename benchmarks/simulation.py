@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the simulator (build of the simulation model and simulation throughput).
+
+For each scenario it measures:
+
+* build of the simulation model in memory and into files (:meth:`BasicRtlSimulatorVcd.build`)
+* import of the already generated simulation model (python module from the files)
+* instantiation of the simulator (model construction, agents)
+* simulated clock cycles per second without tracing and with a VCD trace
+
+.. code-block:: bash
+
+    python -m benchmarks.simulation --cycles 10000 --json simulation.json
+    python -m benchmarks.simulation --baseline simulation.json
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks.designs import SimCounter, SimFifo, SimHandshakePipeline, SimRam
+from benchmarks.utils import measureTime, median, environmentInfo, dumpResults
+from hwt.constants import READ, WRITE
+from hwt.hwModule import HwModule
+from hwt.simulator.agentConnector import autoAddAgents, \
+    collect_processes_from_sim_agents
+from hwt.simulator.rtlSimulatorVcd import BasicRtlSimulatorVcd
+from hwt.simulator.simTestCase import DummySimPlatform
+from hwt.simulator.utils import reconnectHwModuleSignalsToModel
+from hwtSimApi.constants import CLK_PERIOD
+from hwtSimApi.hdlSimulator import HdlSimulator
+
+
+def _stimCounter(dut: SimCounter, cycles: int):
+    dut.en._ag.data.append(1)
+
+
+def _stimFifo(dut: SimFifo, cycles: int):
+    mask = 2 ** dut.DATA_WIDTH - 1
+    dut.dataIn._ag.data.extend(i & mask for i in range(cycles))
+
+
+def _stimHandshakePipeline(dut: SimHandshakePipeline, cycles: int):
+    mask = 2 ** dut.DATA_WIDTH - 1
+    dut.dataIn._ag.data.extend(i & mask for i in range(cycles))
+
+
+def _stimRam(dut: SimRam, cycles: int):
+    mask = 2 ** dut.DATA_WIDTH - 1
+    addr_mask = 2 ** dut.ADDR_WIDTH - 1
+    reqs = dut.port._ag.requests
+    for i in range(cycles // 2):
+        reqs.append((WRITE, i & addr_mask, (i * 3) & mask))
+        reqs.append((READ, i & addr_mask))
+
+
+# name: (function which creates a new instance of the DUT, function(dut, cycles) which prepares the stimulus)
+SCENARIOS: Dict[str, Tuple[Callable[[], HwModule], Callable[[HwModule, int], None]]] = {
+    "counter": (SimCounter, _stimCounter),
+    "fifo": (SimFifo, _stimFifo),
+    "handshake_pipeline": (SimHandshakePipeline, _stimHandshakePipeline),
+    "ram": (SimRam, _stimRam),
+}
+
+
+def _build(scenario: str, build_dir: Optional[str]) -> BasicRtlSimulatorVcd:
+    dut = SCENARIOS[scenario][0]()
+    return BasicRtlSimulatorVcd.build(dut, f"bench_{scenario:s}", build_dir,
+                                      target_platform=DummySimPlatform())
+
+
+def _importModel(build_dir: str, unique_name: str):
+    """
+    Import the simulation model which was already generated into build_dir
+    """
+    for k in [k for k in sys.modules.keys() if k == unique_name or k.startswith(unique_name + ".")]:
+        del sys.modules[k]
+    importlib.invalidate_caches()
+    sys.path.insert(0, build_dir)
+    try:
+        importlib.import_module(unique_name + "." + unique_name)
+    finally:
+        sys.path.pop(0)
+
+
+def _runSim(rtl_simulator_cls: BasicRtlSimulatorVcd, scenario: str, cycles: int, trace_file: Optional[str]) -> float:
+    """
+    :return: time spent in HdlSimulator.run() [s]
+    """
+    dut = rtl_simulator_cls.synthesised_unit
+    rtl_simulator = rtl_simulator_cls()
+    hdl_simulator = HdlSimulator(rtl_simulator)
+    reconnectHwModuleSignalsToModel(dut, rtl_simulator)
+    autoAddAgents(dut, hdl_simulator)
+    SCENARIOS[scenario][1](dut, cycles)
+    if trace_file is not None:
+        rtl_simulator.set_trace_file(trace_file, -1)
+    procs = collect_processes_from_sim_agents(dut)
+
+    t = perf_counter()
+    hdl_simulator.run(until=cycles * CLK_PERIOD, extraProcesses=procs)
+    rtl_simulator.finalize()
+    return perf_counter() - t
+
+
+def runSimulationBenchmark(scenarios: Sequence[str]=tuple(SCENARIOS.keys()),
+                           cycles: int=2000,
+                           repeat: int=3,
+                           log: Optional[Callable[[str], None]]=None) -> Dict:
+    """
+    :param cycles: number of simulated clock cycles for each run
+    :param repeat: number of measurements for each case (the median is used)
+    :return: dictionary with results which can be stored as JSON
+    """
+    results = []
+    with TemporaryDirectory(prefix="hwt_sim_benchmark_") as tmp:
+        for scenario in scenarios:
+            unique_name = f"bench_{scenario:s}"
+            build_dir = os.path.join(tmp, "build")
+            build_mem = measureTime(lambda: _build(scenario, None), repeat)
+            build_files = measureTime(lambda: _build(scenario, build_dir), repeat)
+            import_times = measureTime(lambda: _importModel(build_dir, unique_name), repeat)
+
+            rtl_simulator_cls = _build(scenario, None)
+            instantiate = measureTime(rtl_simulator_cls, repeat)
+
+            r = {
+                "scenario": scenario,
+                "build_in_memory_time": median(build_mem),
+                "build_to_files_time": median(build_files),
+                "import_time": median(import_times),
+                "instantiate_time": median(instantiate),
+                "run": {},
+            }
+            for trace in ("none", "vcd"):
+                trace_file = None if trace == "none" else os.path.join(tmp, f"{scenario:s}.vcd")
+                times = [_runSim(rtl_simulator_cls, scenario, cycles, trace_file) for _ in range(repeat)]
+                t = median(times)
+                r["run"][trace] = {
+                    "times": times,
+                    "time_median": t,
+                    "cycles_per_s": cycles / t if t else None,
+                }
+                if log is not None:
+                    log(f"{scenario:s} trace:{trace:s} {cycles / t:.1f} cycles/s")
+            if log is not None:
+                log(f"{scenario:s} build:{r['build_in_memory_time']:.4f}s "
+                    f"build to files:{r['build_to_files_time']:.4f}s "
+                    f"import:{r['import_time']:.4f}s instantiate:{r['instantiate_time']:.4f}s")
+            results.append(r)
+
+    return {
+        "benchmark": "simulation",
+        "environment": environmentInfo(),
+        "cycles": cycles,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compareWithBaseline(res: Dict, baseline: Dict, max_slowdown: float,
+                        log: Optional[Callable[[str], None]]=None) -> bool:
+    """
+    Compare the simulation throughput with the baseline results
+
+    :param max_slowdown: max allowed ratio baseline cycles/s / actual cycles/s
+    :return: True if no scenario is slower than allowed
+    """
+    base = {r["scenario"]: r for r in baseline["results"]}
+    ok = True
+    for r in res["results"]:
+        b = base.get(r["scenario"], None)
+        if b is None:
+            continue
+        for trace, run in r["run"].items():
+            b_run = b["run"].get(trace, None)
+            if b_run is None or not run["cycles_per_s"] or not b_run["cycles_per_s"]:
+                continue
+            slowdown = b_run["cycles_per_s"] / run["cycles_per_s"]
+            case_ok = slowdown <= max_slowdown
+            ok &= case_ok
+            if log is not None:
+                log(f"{r['scenario']:s} trace:{trace:s} slowdown:{slowdown:.2f}x{'' if case_ok else ' REGRESSION'}")
+    return ok
+
+
+def main(argv: Optional[List[str]]=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS.keys()),
+                        help="comma separated list of scenarios (%(default)s)")
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="file where results should be stored")
+    parser.add_argument("--baseline", help="JSON file with results of previous run used for comparison")
+    parser.add_argument("--max-slowdown", type=float, default=1.2,
+                        help="max allowed ratio of the baseline and actual throughput (%(default)s)")
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    for s in scenarios:
+        if s not in SCENARIOS:
+            parser.error(f"unknown scenario {s:s}")
+
+    res = runSimulationBenchmark(scenarios, cycles=args.cycles, repeat=args.repeat, log=print)
+    if args.json:
+        with open(args.json, "w") as f:
+            dumpResults(res, f)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if not compareWithBaseline(res, baseline, args.max_slowdown, log=print):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
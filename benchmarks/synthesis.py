@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the elaboration and serialization of synthetic designs of increasing size.
+
+For each design, target and size it measures the wall time and the peak of allocated memory
+and it fits the dependency of the time on the size as time = c * size ** k.
+The exponent k is checked against a limit so a pass with a quadratic complexity
+makes the benchmark fail (non zero exit code).
+
+.. code-block:: bash
+
+    python -m benchmarks.synthesis --sizes 16,32,64,128 --json synthesis.json
+"""
+import argparse
+import sys
+from typing import Callable, Dict, List, Optional, Sequence
+
+from benchmarks.designs import DESIGNS, buildDesign
+from benchmarks.utils import measureTime, measurePeakMemory, median, \
+    scalingExponent, environmentInfo, dumpResults, parseSizes
+from hwt.serializer.simModel import SimModelSerializer
+from hwt.serializer.systemC import SystemCSerializer
+from hwt.serializer.verilog import VerilogSerializer
+from hwt.serializer.vhdl import Vhdl2008Serializer
+from hwt.synth import to_rtl_str, synthesised
+
+# name: serializer class (None means elaboration only, :func:`hwt.synth.synthesised`)
+TARGETS = {
+    "synthesised": None,
+    "vhdl": Vhdl2008Serializer,
+    "verilog": VerilogSerializer,
+    "systemc": SystemCSerializer,
+    "simmodel": SimModelSerializer,
+}
+
+DEFAULT_SIZES = (8, 16, 32, 64)
+# the exponent of the time complexity which is considered as a regression
+DEFAULT_MAX_EXPONENT = 1.5
+
+
+def _mkRun(design: str, target: str, size: int) -> Callable[[], object]:
+    serializer_cls = TARGETS[target]
+    if serializer_cls is None:
+        return lambda: synthesised(buildDesign(design, size))
+    else:
+        return lambda: to_rtl_str(buildDesign(design, size), serializer_cls=serializer_cls)
+
+
+def runSynthesisBenchmark(designs: Sequence[str]=tuple(DESIGNS.keys()),
+                          targets: Sequence[str]=tuple(TARGETS.keys()),
+                          sizes: Sequence[int]=DEFAULT_SIZES,
+                          repeat: int=3,
+                          measure_memory: bool=True,
+                          max_exponent: Optional[float]=DEFAULT_MAX_EXPONENT,
+                          log: Optional[Callable[[str], None]]=None) -> Dict:
+    """
+    :param repeat: number of time measurements for each case (the median is used)
+    :param measure_memory: if True an extra run under tracemalloc is performed
+        to resolve the peak memory
+    :param max_exponent: max allowed scaling exponent, None to disable the check
+    :return: dictionary with results which can be stored as JSON
+    """
+    results = []
+    scaling = []
+    for design in designs:
+        for target in targets:
+            points = []
+            for size in sizes:
+                run = _mkRun(design, target, size)
+                times = measureTime(run, repeat)
+                r = {
+                    "design": design,
+                    "target": target,
+                    "size": size,
+                    "times": times,
+                    "time_median": median(times),
+                    "time_min": min(times),
+                    "peak_memory": measurePeakMemory(run) if measure_memory else None,
+                }
+                results.append(r)
+                points.append((size, r["time_min"]))
+                if log is not None:
+                    mem = "" if r["peak_memory"] is None else f" peak_memory:{r['peak_memory'] / 2 ** 20:.2f}MiB"
+                    log(f"{design:s} {target:s} size:{size:d} time:{r['time_median']:.4f}s{mem:s}")
+
+            k = scalingExponent(points)
+            s = {
+                "design": design,
+                "target": target,
+                "exponent": k,
+                "ok": k is None or max_exponent is None or k <= max_exponent,
+            }
+            scaling.append(s)
+            if log is not None and k is not None:
+                log(f"{design:s} {target:s} scaling exponent:{k:.2f}{'' if s['ok'] else ' REGRESSION'}")
+
+    return {
+        "benchmark": "synthesis",
+        "environment": environmentInfo(),
+        "sizes": list(sizes),
+        "repeat": repeat,
+        "max_exponent": max_exponent,
+        "results": results,
+        "scaling": scaling,
+    }
+
+
+def main(argv: Optional[List[str]]=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--designs", default=",".join(DESIGNS.keys()),
+                        help="comma separated list of designs (%(default)s)")
+    parser.add_argument("--targets", default=",".join(TARGETS.keys()),
+                        help="comma separated list of targets (%(default)s)")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma separated list of values of SIZE parameter (%(default)s)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="do not measure the peak memory (saves one run for each case)")
+    parser.add_argument("--max-exponent", type=float, default=DEFAULT_MAX_EXPONENT,
+                        help="max allowed exponent of time complexity, negative value disables the check")
+    parser.add_argument("--json", help="file where results should be stored")
+    args = parser.parse_args(argv)
+
+    designs = [d for d in args.designs.split(",") if d]
+    targets = [t for t in args.targets.split(",") if t]
+    for d in designs:
+        if d not in DESIGNS:
+            parser.error(f"unknown design {d:s}")
+    for t in targets:
+        if t not in TARGETS:
+            parser.error(f"unknown target {t:s}")
+    max_exponent = args.max_exponent if args.max_exponent >= 0 else None
+
+    res = runSynthesisBenchmark(designs, targets, parseSizes(args.sizes),
+                                repeat=args.repeat,
+                                measure_memory=not args.no_memory,
+                                max_exponent=max_exponent,
+                                log=print)
+    if args.json:
+        with open(args.json, "w") as f:
+            dumpResults(res, f)
+
+    return 0 if all(s["ok"] for s in res["scaling"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
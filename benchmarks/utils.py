@@ -0,0 +1,90 @@
+from math import log
+import json
+import platform
+import sys
+from time import perf_counter
+import tracemalloc
+from typing import Callable, List, Sequence, Tuple, Optional, TextIO
+
+
+def measureTime(fn: Callable[[], object], repeat: int) -> List[float]:
+    """
+    :return: list of wall times of fn() calls [s]
+    """
+    times = []
+    for _ in range(repeat):
+        t = perf_counter()
+        fn()
+        times.append(perf_counter() - t)
+    return times
+
+
+def measurePeakMemory(fn: Callable[[], object]) -> int:
+    """
+    :return: peak of memory allocated during fn() call [B] (measured using tracemalloc)
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return peak - start
+
+
+def median(values: Sequence[float]) -> float:
+    values = sorted(values)
+    n = len(values)
+    if n % 2:
+        return values[n // 2]
+    else:
+        return (values[n // 2 - 1] + values[n // 2]) / 2
+
+
+def scalingExponent(points: Sequence[Tuple[float, float]]) -> Optional[float]:
+    """
+    Fit the points (size, time) with time = c * size ** k
+    (least squares in log-log space)
+
+    :return: the exponent k (1.0 for linear, 2.0 for quadratic, ...) or None if it can not be resolved
+    """
+    points = [(log(x), log(y)) for x, y in points if x > 0 and y > 0]
+    if len(points) < 2:
+        return None
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return None
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return cov / var_x
+
+
+def environmentInfo() -> dict:
+    """
+    :return: info about the environment which should be stored together with results
+    """
+    return {
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def dumpResults(results: dict, file: TextIO):
+    json.dump(results, file, indent=2)
+    file.write("\n")
+
+
+def parseSizes(sizes: str) -> List[int]:
+    """
+    Parse a comma separated list of ints
+    """
+    return [int(s) for s in sizes.split(",") if s]
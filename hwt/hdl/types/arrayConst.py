@@ -1,5 +1,5 @@
 from copy import copy
-from typing import Union, Self
+from typing import Union, Self, Optional, Tuple
 
 from hwt.doc_markers import internal
 from hwt.hdl.const import HConst
@@ -111,6 +111,32 @@ class HArrayConst(HConst):
 
         return cls(typeObj, elements, vld_mask)
 
+    @classmethod
+    def from_numpy(cls, typeObj, values: "numpy.ndarray", vld_mask: Optional["numpy.ndarray"]=None):
+        """
+        Bulk variant of :meth:`~.from_py` for arrays of HBits items
+
+        :param values: NumPy array of unsigned representation of item values
+        :param vld_mask: optional NumPy array of item validity masks, if None all items are valid
+        """
+        from hwt.simulator.numpyUtils import numpyToArrayItems
+        size = typeObj.size
+        if isinstance(size, HConst):
+            size = int(size)
+        if len(values) > size:
+            raise ValueError("Initialization value sequence is larger than size of initialized array", typeObj, len(values))
+
+        elements = numpyToArrayItems(typeObj.element_t, values, vld_mask)
+        vld = int(len(elements) == size and all(e._is_full_valid() for e in elements.values()))
+        return cls(typeObj, elements, vld)
+
+    def to_numpy(self) -> Tuple["numpy.ndarray", "numpy.ndarray"]:
+        """
+        :return: tuple of NumPy arrays (values, validity masks)
+        """
+        from hwt.simulator.numpyUtils import arrayValueToNumpy
+        return arrayValueToNumpy(self)
+
     def to_py(self):
         if not self._is_full_valid():
             raise ValidityError(f"Value of {self} is not fully defined")
@@ -1,7 +1,11 @@
 from collections import deque
+from typing import Optional, Tuple
 
 from hwt.constants import READ, WRITE, NOP
-from hwt.simulator.agentBase import SyncAgentBase
+from hwt.hdl.const import HConst
+from hwt.hdl.types.array import HArray
+from hwt.simulator.agentBase import SyncAgentBase, DEFAULT_CHECKPOINT_ATTRS
+from hwt.simulator.numpyUtils import numpyToArrayItems, arrayValueToNumpy
 from hwtSimApi.agents.clk import ClockAgent
 from hwtSimApi.hdlSimulator import HdlSimulator
 from hwtSimApi.triggers import WaitCombRead, WaitWriteOnly, WaitCombStable, Timer
@@ -19,6 +23,7 @@ class HwIOBramPort_noClkAgent(SyncAgentBase):
     :ivar ~.mem: if agent is in monitor mode (= is slave) all reads and writes
         are performed on mem object
     """
+    CHECKPOINT_ATTRS = (*DEFAULT_CHECKPOINT_ATTRS, "mem", "requests", "r_data", "readPending", "requireInit")
 
     def __init__(self, sim: HdlSimulator, hwIO: "HwIOBramPort_noClk"):
         super().__init__(sim, hwIO, allowNoReset=True)
@@ -77,6 +82,40 @@ class HwIOBramPort_noClkAgent(SyncAgentBase):
         """
         self.requests.append((WRITE, addr, data))
 
+    def _memItemType(self):
+        hwIO = self.hwIO
+        if hwIO.HAS_R:
+            return hwIO.dout._dtype
+        else:
+            return hwIO.din._dtype
+
+    def loadMem(self, values: "numpy.ndarray", vld_mask: Optional["numpy.ndarray"]=None, offset: int=0):
+        """
+        Bulk load the content of "mem" (used in monitor mode)
+
+        :param values: NumPy array of unsigned representation of item values
+        :param vld_mask: optional NumPy array of item validity masks, if None all items are valid
+        :param offset: address of the first item
+        """
+        numpyToArrayItems(self._memItemType(), values, vld_mask, offset=offset, dst=self.mem)
+
+    def readMem(self, size: int, offset: int=0) -> Tuple["numpy.ndarray", "numpy.ndarray"]:
+        """
+        Bulk read of the content of "mem" (used in monitor mode)
+
+        :return: tuple of NumPy arrays (values, validity masks),
+            missing items are 0 with 0 validity mask
+        """
+        t = self._memItemType()
+        items = {}
+        for i, v in self.mem.items():
+            if offset <= i < offset + size:
+                if not isinstance(v, HConst):
+                    v = t.from_py(v)
+                items[i - offset] = v
+        arr_t = HArray(t, size)
+        return arrayValueToNumpy(arr_t._from_py(items, 0))
+
     def monitor(self):
         """
         Handle read/write request on this interfaces
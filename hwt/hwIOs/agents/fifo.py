@@ -1,23 +1,31 @@
-from collections import deque
-
-from hwt.simulator.agentBase import SyncAgentBase
+from hwt.simulator.agentBase import SyncAgentBase, DEFAULT_CHECKPOINT_ATTRS
+from hwt.simulator.idleAwareCallbackLoop import OnRisingCallbackLoopIdleAware
 from hwtSimApi.constants import CLK_PERIOD
 from hwtSimApi.hdlSimulator import HdlSimulator
 from hwtSimApi.process_utils import OnRisingCallbackLoop
 from hwtSimApi.triggers import Timer, WaitWriteOnly, WaitCombRead, WaitCombStable, \
     WaitTimeslotEnd
 
+# marker for "no data was written yet"
+_NOT_WRITTEN = object()
+
 
 class HwIOFifoReaderAgent(SyncAgentBase):
     """
     Simulation agent for FifoReader interface
     """
+    CHECKPOINT_ATTRS = (*DEFAULT_CHECKPOINT_ATTRS, "lastData", "readPending",
+                        "lastData_invalidate", "readPending_invalidate")
 
     def __init__(self, sim: HdlSimulator, hwIO: "HwIOFifoReader", allowNoReset=False):
         super(HwIOFifoReaderAgent, self).__init__(sim, hwIO, allowNoReset)
-        self.data = deque()
+        self.data = self._newDataQueue()
         self.readPending = False
         self.lastData = None
+        # last value written by driver (used to detect idle state of driver processes)
+        self._driverLastWait = None
+        self._lastDataWritten = _NOT_WRITTEN
+        self.driver = self._idleAwareLoop(self.driver, self._driverIsIdle)
 
         # flags to keep data coherent when enable state changes
         self.lastData_invalidate = False
@@ -29,6 +37,7 @@ class HwIOFifoReaderAgent(SyncAgentBase):
         lastEn = self._enabled
         super(HwIOFifoReaderAgent, self).setEnable_asDriver(en)
         self.hwIO.wait.write(not en)
+        self._driverLastWait = None
         self.lastData_invalidate = not en
         if not lastEn:
             self.dataWriter.setEnable(en)
@@ -105,10 +114,24 @@ class HwIOFifoReaderAgent(SyncAgentBase):
 
         self.readPending = rd
 
+    def _driverIsIdle(self):
+        return not self.data and self._driverLastWait == 1
+
+    def _dataWriterIsIdle(self):
+        return not self.data and self.lastData is self._lastDataWritten
+
+    def _wakeUpIdleProcesses(self):
+        super(HwIOFifoReaderAgent, self)._wakeUpIdleProcesses()
+        dataWriter = self.dataWriter
+        if isinstance(dataWriter, OnRisingCallbackLoopIdleAware):
+            dataWriter.wakeUp()
+
     def getDrivers(self):
-        self.dataWriter = OnRisingCallbackLoop(self.sim, self.clk,
-                                               self.dataWriter,
-                                               self.getEnable)
+        self.dataWriter = self._idleAwareLoop(
+            OnRisingCallbackLoop(self.sim, self.clk,
+                                 self.dataWriter,
+                                 self.getEnable),
+            self._dataWriterIsIdle)
         yield self.driver_init()
         yield from super(HwIOFifoReaderAgent, self).getDrivers()
         yield self.dataWriter()
@@ -123,6 +146,7 @@ class HwIOFifoReaderAgent(SyncAgentBase):
         yield Timer(1)
         yield WaitWriteOnly()
         self.set_data(self.lastData)
+        self._lastDataWritten = self.lastData
         if self.lastData_invalidate:
             self.lastData = None
 
@@ -145,6 +169,7 @@ class HwIOFifoReaderAgent(SyncAgentBase):
 
         yield WaitWriteOnly()
         hwIO.wait.write(wait)
+        self._driverLastWait = wait
 
         if rst_n:
             # wait for potential update of en
@@ -170,7 +195,10 @@ class HwIOFifoWriterAgent(SyncAgentBase):
     def __init__(self, sim: HdlSimulator, hwIO: "HwIOFifoWriter", allowNoReset=False):
         super(HwIOFifoWriterAgent, self).__init__(
             sim, hwIO, allowNoReset=allowNoReset)
-        self.data = deque()
+        self.data = self._newDataQueue()
+        # last value of "en" written by driver (used to detect idle state of driver)
+        self._driverLastEn = None
+        self.driver = self._idleAwareLoop(self.driver, self._driverIsIdle)
         if hwIO.DATA_WIDTH == 0:
             raise NotImplementedError()
 
@@ -185,6 +213,7 @@ class HwIOFifoWriterAgent(SyncAgentBase):
     def setEnable_asDriver(self, en: bool):
         SyncAgentBase.setEnable_asDriver(self, en)
         self.hwIO.en.write(en)
+        self._driverLastEn = None
 
     def setEnable_asMonitor(self, en: bool):
         SyncAgentBase.setEnable_asMonitor(self, en)
@@ -241,6 +270,10 @@ class HwIOFifoWriterAgent(SyncAgentBase):
         yield WaitWriteOnly()
         self.set_data(d)
         hwIO.en.write(v)
+        self._driverLastEn = v
+
+    def _driverIsIdle(self):
+        return not self.data and self._driverLastEn == 0
 
     def getDrivers(self):
         yield from SyncAgentBase.getDrivers(self)
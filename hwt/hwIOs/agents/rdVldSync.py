@@ -1,4 +1,8 @@
+from typing import Tuple
+
+from hwt.hdl.types.hdlType import HdlType
 from hwt.simulator.agentBase import SyncAgentBase
+from hwt.simulator.numpyUtils import numpyStructToValues, valuesToNumpyStruct
 from hwtSimApi.agents.rdVldSync import DataRdVldAgent
 from hwtSimApi.hdlSimulator import HdlSimulator
 
@@ -53,6 +57,33 @@ class HwIODataRdVldAgent(SyncAgentBase, DataRdVldAgent):
         """write data to interface"""
         self.hwIO.data.write(data)
 
+    def _numpyDataFields(self) -> Tuple[Tuple[str, HdlType], ...]:
+        """
+        :return: tuple of tuples (name, type) for each data signal
+            (fields of NumPy structured array used by bulk data methods)
+        """
+        return (("data", self.hwIO.data._dtype),)
+
+    def extendDataFromNumpy(self, arr: "numpy.ndarray"):
+        """
+        Bulk variant of data.extend() for driver mode
+
+        :param arr: NumPy structured array (:func:`hwt.simulator.numpyUtils.numpyStructToValues`)
+        """
+        self.data.extend(numpyStructToValues(arr, self._numpyDataFields()))
+
+    def dataToNumpy(self, clear=False) -> "numpy.ndarray":
+        """
+        Bulk conversion of data collected in monitor mode to NumPy structured array
+        with a value and a validity mask field for each data signal
+
+        :param clear: if True the converted data is removed from agent
+        """
+        arr = valuesToNumpyStruct(self.data, self._numpyDataFields())
+        if clear:
+            self.data.clear()
+        return arr
+
 
 class UniversalRdVldSyncAgent(HwIODataRdVldAgent):
     """
@@ -76,6 +107,9 @@ class UniversalRdVldSyncAgent(HwIODataRdVldAgent):
         self._signals = tuple(signals)
         self._sigCnt = len(signals)
 
+    def _numpyDataFields(self) -> Tuple[Tuple[str, HdlType], ...]:
+        return tuple((s._name, s._dtype) for s in self._signals)
+
     def get_data(self):
         if self._sigCnt == 1:
             return self._signals[0].read()
@@ -1,3 +1,5 @@
+from typing import Dict, Any
+
 from hwt.hwIOs.agents.signal import HwIOSignalAgent
 from hwt.hwIOs.agents.vldSync import HwIODataVldAgent
 from hwt.simulator.agentBase import SyncAgentBase
@@ -48,3 +50,15 @@ class HwIORegCntrlAgent(SyncAgentBase):
     def getMonitors(self):
         yield from self._din.getDrivers()
         yield from self._dout.getMonitors()
+
+    def _getCheckpointState(self) -> Dict[str, Any]:
+        return {
+            "_enabled": self._enabled,
+            "_din": self._din._getCheckpointState(),
+            "_dout": self._dout._getCheckpointState(),
+        }
+
+    def _setCheckpointState(self, state: Dict[str, Any]):
+        self._enabled = state["_enabled"]
+        self._din._setCheckpointState(state["_din"])
+        self._dout._setCheckpointState(state["_dout"])
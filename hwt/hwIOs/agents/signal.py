@@ -1,6 +1,5 @@
-from collections import deque
-
-from hwt.simulator.agentBase import SyncAgentBase
+from hwt.simulator.agentBase import SyncAgentBase, DEFAULT_CHECKPOINT_ATTRS
+from hwt.simulator.idleAwareCallbackLoop import OnRisingCallbackLoopIdleAware
 from hwt.synthesizer.exceptions import IntfLvlConfErr
 from hwtSimApi.agents.base import AgentBase
 from hwtSimApi.constants import CLK_PERIOD
@@ -15,6 +14,7 @@ class HwIOSignalAgent(SyncAgentBase):
 
     :attention: clock synchronization has higher priority
     """
+    CHECKPOINT_ATTRS = (*DEFAULT_CHECKPOINT_ATTRS, "initPending")
 
     def __init__(self, sim: HdlSimulator, hwIO: "HwIOSignal", delay=None):
         AgentBase.__init__(self, sim, hwIO)
@@ -27,7 +27,7 @@ class HwIOSignalAgent(SyncAgentBase):
         except IntfLvlConfErr:
             self.clk = None
         self.rst, self.rstOffIn = self._discoverReset(hwIO, True)
-        self.data = deque()
+        self.data = self._newDataQueue()
 
         self.initPending = True
     
@@ -43,7 +43,7 @@ class HwIOSignalAgent(SyncAgentBase):
                 raise ValueError("clock and delay synchronization at once")
             c = self.SELECTED_EDGE_CALLBACK
             self.monitor = c(self.sim, self.clk, self.monitorWithClk, self.getEnable)
-            self.driver = c(self.sim, self.clk, self.driverWithClk, self.getEnable)
+            self.driver = self._mkDriverWithClkLoop()
 
     def getDrivers(self):
         yield self.driverInit()
@@ -58,7 +58,7 @@ class HwIOSignalAgent(SyncAgentBase):
                 raise ValueError("clock and delay synchronization at once")
             c = self.SELECTED_EDGE_CALLBACK
             if not isinstance(self.driver, c):
-                self.driver = c(self.sim, self.clk, self.driverWithClk, self.getEnable)
+                self.driver = self._mkDriverWithClkLoop()
             yield self.driver()
             
     def getMonitors(self):
@@ -76,6 +76,21 @@ class HwIOSignalAgent(SyncAgentBase):
                 self.monitor = c(self.sim, self.clk, self.monitorWithClk, self.getEnable)
             yield self.monitor()
 
+    def _mkDriverWithClkLoop(self):
+        if self.IDLE_AWARE_PROCESSES:
+            return OnRisingCallbackLoopIdleAware(self.sim, self.clk, self.driverWithClk,
+                                                 self.getEnable, self._driverIsIdle)
+        else:
+            return self.SELECTED_EDGE_CALLBACK(self.sim, self.clk, self.driverWithClk, self.getEnable)
+
+    def _driverIsIdle(self):
+        return not self.data
+
+    def setEnable(self, en):
+        super(HwIOSignalAgent, self).setEnable(en)
+        if en:
+            self._wakeUpIdleProcesses()
+
     def driverInit(self):
         yield WaitWriteOnly()
         if not self._enabled:
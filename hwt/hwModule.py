@@ -199,10 +199,14 @@ class HwModule(PropDeclrCollector, HwModuleImplHelpers):
             for proc in target_platform.beforeToRtlImpl:
                 proc(self)
 
+        profiler = store_manager.profiler
         try:
             store_manager.hierarchy_push(mdec)
             if do_serialize_this:
-                self._loadImpl()
+                with profiler.phase(self, "hwImpl") as r:
+                    self._loadImpl()
+                if r is not None:
+                    profiler.recordNetlistStats(r, self._ctx)
                 yield from self._lazy_loaded
 
                 if not self._ctx.hwIOs:
@@ -218,8 +222,9 @@ class HwModule(PropDeclrCollector, HwModuleImplHelpers):
             mdec.ports[:] = natsorted(mdec.ports, key=lambda x: x.name)
             if do_serialize_this:
                 # synthesize signal level context
-                mdef = self._ctx.create_HdlModuleDef(
-                    target_platform, store_manager)
+                with profiler.phase(self, "create_HdlModuleDef"):
+                    mdef = self._ctx.create_HdlModuleDef(
+                        target_platform, store_manager)
                 mdef.origin = self
 
             for hwIO in self._hwIOs:
@@ -231,7 +236,8 @@ class HwModule(PropDeclrCollector, HwModuleImplHelpers):
             if do_serialize_this:
                 if add_param_asserts and self._hwParams:
                     mdef.objs.extend(store_manager.as_hdl_ast._as_hdl_HdlModuleDef_param_asserts(mdec))
-                store_manager.write(mdef)
+                with profiler.phase(self, "write"):
+                    store_manager.write(mdef)
 
             yield True, self
 
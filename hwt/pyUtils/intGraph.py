@@ -0,0 +1,217 @@
+from array import array
+from typing import Generic, TypeVar, Dict, List, Iterable, Generator, Hashable, Tuple
+
+T = TypeVar('T', bound=Hashable)
+
+
+class IntGraph(Generic[T]):
+    """
+    Directed graph where vertices are interned to dense integer ids
+    and successors are stored in CSR (compressed sparse row) arrays.
+    The algorithms work only with the integer ids, which is significantly faster
+    than the work with dictionaries keyed by objects with an expensive __hash__/__eq__
+    (e.g. :class:`hwt.synthesizer.componentPath.ComponentPath`).
+
+    Usage:
+
+    .. code-block:: python
+
+        g = IntGraph.fromDict({"a": ["b"], "b": ["a", "c"]})
+        for scc in g.stronglyConnectedComponentsObj():
+            print(scc)
+
+    :ivar ~.vertices: list of vertex objects, index is the id of the vertex
+    :ivar ~.vertexId: dictionary vertex object: id
+    :ivar ~.offsets: CSR array, successors of vertex i are succ[offsets[i]:offsets[i + 1]]
+        (None if the graph was modified and :meth:`~.build` was not called yet)
+    :ivar ~.succ: CSR array of successor ids
+    :ivar ~.weights: CSR array of weights of edges (same indexes as succ)
+    """
+
+    def __init__(self):
+        self.vertices: List[T] = []
+        self.vertexId: Dict[T, int] = {}
+        self._edgeSrc = array("l")
+        self._edgeDst = array("l")
+        self._edgeWeight = array("d")
+        self.offsets = None
+        self.succ = None
+        self.weights = None
+
+    @classmethod
+    def fromDict(cls, g: Dict[T, Iterable[T]]) -> "IntGraph[T]":
+        """
+        :param g: graph represented as a dictionary { <vertex> : <successors of vertex> }
+        """
+        self = cls()
+        addVertex = self.addVertex
+        for v, successors in g.items():
+            self.addEdges(addVertex(v), (addVertex(w) for w in successors))
+        return self
+
+    def addVertex(self, v: T) -> int:
+        """
+        :return: id of the vertex (a new id is assigned if the vertex is not in the graph yet)
+        """
+        i = self.vertexId.get(v, None)
+        if i is None:
+            i = self.vertexId[v] = len(self.vertices)
+            self.vertices.append(v)
+            self.offsets = None
+        return i
+
+    def addEdge(self, src: int, dst: int, weight: float=0.0):
+        """
+        :note: src and dst are vertex ids (:meth:`~.addVertex`)
+        """
+        self._edgeSrc.append(src)
+        self._edgeDst.append(dst)
+        self._edgeWeight.append(weight)
+        self.offsets = None
+
+    def addEdges(self, src: int, dsts: Iterable[int], weight: float=0.0):
+        n = len(self._edgeDst)
+        self._edgeDst.extend(dsts)
+        added = len(self._edgeDst) - n
+        self._edgeSrc.extend(src for _ in range(added))
+        self._edgeWeight.extend(weight for _ in range(added))
+        self.offsets = None
+
+    def build(self):
+        """
+        Build CSR arrays from the list of edges (counting sort by the source vertex)
+        """
+        n = len(self.vertices)
+        offsets = array("l", bytes(array("l").itemsize * (n + 1)))
+        for s in self._edgeSrc:
+            offsets[s + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        succ = array("l", bytes(array("l").itemsize * len(self._edgeDst)))
+        weights = array("d", bytes(array("d").itemsize * len(self._edgeDst)))
+        pos = array("l", offsets[:n])
+        for s, d, w in zip(self._edgeSrc, self._edgeDst, self._edgeWeight):
+            p = pos[s]
+            succ[p] = d
+            weights[p] = w
+            pos[s] = p + 1
+
+        self.offsets = offsets
+        self.succ = succ
+        self.weights = weights
+
+    def _getCsr(self) -> Tuple[array, array]:
+        if self.offsets is None:
+            self.build()
+        return self.offsets, self.succ
+
+    def successors(self, v: int) -> array:
+        offsets, succ = self._getCsr()
+        return succ[offsets[v]:offsets[v + 1]]
+
+    def stronglyConnectedComponents(self) -> Generator[List[int], None, None]:
+        """
+        Iterative Tarjan's strongly connected component search
+
+        :return: generator of lists of vertex ids, the components are yielded in reversed topological order
+            (a component is yielded before any component which has an edge to it)
+        """
+        offsets, succ = self._getCsr()
+        n = len(self.vertices)
+        index = array("l", [-1]) * n
+        lowlink = array("l", [-1]) * n
+        on_stack = bytearray(n)
+        stack = []
+        # stack to replace recursion, vertex and position of the next successor to process
+        call_v = []
+        call_e = []
+        counter = 0
+        for root in range(n):
+            if index[root] != -1:
+                continue
+
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            call_v.append(root)
+            call_e.append(offsets[root])
+            while call_v:
+                v = call_v[-1]
+                e = call_e[-1]
+                if e < offsets[v + 1]:
+                    call_e[-1] = e + 1
+                    w = succ[e]
+                    if index[w] == -1:
+                        index[w] = lowlink[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = 1
+                        call_v.append(w)
+                        call_e.append(offsets[w])
+                    elif on_stack[w]:
+                        if index[w] < lowlink[v]:
+                            lowlink[v] = index[w]
+                else:
+                    call_v.pop()
+                    call_e.pop()
+                    if lowlink[v] == index[v]:
+                        scc = []
+                        while True:
+                            w = stack.pop()
+                            on_stack[w] = 0
+                            scc.append(w)
+                            if w == v:
+                                break
+                        yield scc
+
+                    if call_v:
+                        u = call_v[-1]
+                        if lowlink[v] < lowlink[u]:
+                            lowlink[u] = lowlink[v]
+
+    def stronglyConnectedComponentsObj(self) -> Generator[List[T], None, None]:
+        """
+        :see: :meth:`~.stronglyConnectedComponents`
+        :return: generator of lists of vertex objects
+        """
+        vertices = self.vertices
+        for scc in self.stronglyConnectedComponents():
+            yield [vertices[v] for v in scc]
+
+    def longestPaths(self) -> Tuple[array, array]:
+        """
+        Resolve the longest (max sum of edge weights) path which ends in each vertex.
+        Edges inside of strongly connected components are ignored (the graph is handled as a DAG
+        of the components), each vertex can be a start of the path.
+
+        :return: tuple (array of lengths of the longest path for each vertex id,
+            array of the predecessor on this path for each vertex id, -1 for the start of the path)
+        """
+        offsets, succ = self._getCsr()
+        weights = self.weights
+        n = len(self.vertices)
+        dist = array("d", bytes(array("d").itemsize * n))
+        pred = array("l", [-1]) * n
+        component = array("l", [-1]) * n
+        sccs = list(self.stronglyConnectedComponents())
+        for ci, scc in enumerate(sccs):
+            for v in scc:
+                component[v] = ci
+
+        # the components are in reversed topological order
+        for scc in reversed(sccs):
+            for v in scc:
+                c = component[v]
+                d = dist[v]
+                for e in range(offsets[v], offsets[v + 1]):
+                    w = succ[e]
+                    if component[w] == c:
+                        continue
+                    _d = d + weights[e]
+                    if _d > dist[w] or pred[w] == -1:
+                        dist[w] = _d
+                        pred[w] = v
+
+        return dist, pred
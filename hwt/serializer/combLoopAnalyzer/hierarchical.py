@@ -0,0 +1,242 @@
+from collections import deque
+from typing import Dict, Set, List, Tuple, Optional, Generator
+
+from hdlConvertorAst.hdlAst._structural import HdlModuleDef, HdlCompInst
+from hwt.doc_markers import internal
+from hwt.hdl.portItem import HdlPortItem
+from hwt.hdl.statements.codeBlockContainer import HdlStmCodeBlockContainer
+from hwt.hwModule import HwModule
+from hwt.serializer.combLoopAnalyzer import collect_comb_drivers
+from hwt.serializer.combLoopAnalyzer.tarjan import StronglyConnectedComponentSearchTarjan
+from hwt.synthesizer.componentPath import ComponentPath
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
+from ipCorePackager.constants import DIRECTION
+
+
+class _NoPathPrefix():
+    """
+    A path prefix for :func:`hwt.serializer.combLoopAnalyzer.collect_comb_drivers`
+    which does not wrap the signal into :class:`hwt.synthesizer.componentPath.ComponentPath`
+    (the graph of a single module does not need the paths)
+    """
+
+    def __truediv__(self, other):
+        return other
+
+
+_NO_PATH_PREFIX = _NoPathPrefix()
+
+
+class CombModuleSummary():
+    """
+    Combinational connections of a single module body (:class:`hdlConvertorAst.hdlAst.HdlModuleDef`)
+
+    :ivar ~.graph: dictionary signal: set of signals combinationally driven by this signal
+        (sub components are represented by edges between the signals connected to their ports)
+    :ivar ~.through_subcomponent: dictionary (src signal, dst signal): list of tuples
+        (instance of sub component, input port name, output port name) for the edges in graph
+        which are realized by a sub component
+    :ivar ~.port_reach: dictionary name of input port: set of names of output ports which are
+        combinationally driven by this input
+    :ivar ~.loops: list of strongly connected components in graph (combinational loops in this module body)
+    :ivar ~.has_loops_in_hierarchy: True if there is a loop in this module or any of its sub components
+    """
+    __slots__ = ["graph", "through_subcomponent", "port_reach", "loops", "has_loops_in_hierarchy"]
+
+    def __init__(self):
+        self.graph: Dict[RtlSignal, Set[RtlSignal]] = {}
+        self.through_subcomponent: Dict[Tuple[RtlSignal, RtlSignal], List[Tuple[HwModule, str, str]]] = {}
+        self.port_reach: Dict[str, Set[str]] = {}
+        self.loops: List[List[RtlSignal]] = []
+        self.has_loops_in_hierarchy = False
+
+
+@internal
+def _findPath(graph: Dict[RtlSignal, Set[RtlSignal]], src: RtlSignal, dst: RtlSignal) -> Optional[List[RtlSignal]]:
+    """
+    BFS for a shortest path from src to dst
+    """
+    prev = {src: None}
+    q = deque((src,))
+    while q:
+        v = q.popleft()
+        if v is dst:
+            path = []
+            while v is not None:
+                path.append(v)
+                v = prev[v]
+            path.reverse()
+            return path
+        for w in graph.get(v, ()):
+            if w not in prev:
+                prev[w] = v
+                q.append(w)
+    return None
+
+
+class CombLoopAnalyzerHierarchical():
+    """
+    Combinational loop analyzer which analyzes each unique module body only once.
+    For each module body it resolves which outputs are combinationally driven from which inputs
+    (:class:`~.CombModuleSummary`) and the sub components are represented only by this summary
+    in the graph of parent. The loops are searched in the graph of each unique module body
+    and the paths in the hierarchy are resolved only for the reported loops.
+
+    The usage is same as for :class:`hwt.serializer.combLoopAnalyzer.CombLoopAnalyzer`.
+
+    .. code-block:: python
+
+        m = MyTop()
+        synthesised(m)
+        a = CombLoopAnalyzerHierarchical()
+        a.visit_HwModule(m)
+        for loop in a.report():
+            print(loop)
+
+    :note: The reported loop is a list of :class:`hwt.synthesizer.componentPath.ComponentPath` instances
+        (path of sub component instances from top and the signal). If the loop goes through
+        sub components it contains also signals on the combinational path inside of the sub component.
+    :ivar ~.summaries: cache HdlModuleDef: CombModuleSummary
+    :ivar ~.top: top module which was visited
+    """
+
+    def __init__(self):
+        self.summaries: Dict[HdlModuleDef, CombModuleSummary] = {}
+        self.top: Optional[HwModule] = None
+
+    @staticmethod
+    def _getHdlModuleDef(m: HwModule) -> HdlModuleDef:
+        if m._shared_component_with is None:
+            arch = m._ctx.hwModDef
+        else:
+            _m, _, _ = m._shared_component_with
+            arch = _m._ctx.hwModDef
+        assert arch is not None, m
+        return arch
+
+    def getSummary(self, m: HwModule) -> CombModuleSummary:
+        """
+        Get summary for module body of the module instance (analyze it if it was not analyzed yet)
+        """
+        arch = self._getHdlModuleDef(m)
+        s = self.summaries.get(arch, None)
+        if s is None:
+            s = self._analyzeHdlModuleDef(arch)
+            self.summaries[arch] = s
+        return s
+
+    @internal
+    def _analyzeHdlModuleDef(self, arch: HdlModuleDef) -> CombModuleSummary:
+        s = CombModuleSummary()
+        graph = s.graph
+        has_loops_in_sub = False
+        for o in arch.objs:
+            if isinstance(o, HdlStmCodeBlockContainer):
+                collect_comb_drivers(_NO_PATH_PREFIX, o, graph, tuple())
+            elif isinstance(o, HdlCompInst):
+                cs = self.getSummary(o.origin)
+                has_loops_in_sub |= cs.has_loops_in_hierarchy
+                ports = {pi.name: pi for pi in o.port_map}
+                for in_name, out_names in cs.port_reach.items():
+                    src = ports[in_name].getOuterSig()
+                    for out_name in out_names:
+                        dst = ports[out_name].getOuterSig()
+                        graph.setdefault(src, set()).add(dst)
+                        s.through_subcomponent.setdefault((src, dst), []).append((o.origin, in_name, out_name))
+
+        outputs = {}
+        inputs = []
+        for pi in arch.dec.ports:
+            pi: HdlPortItem
+            if pi.direction == DIRECTION.OUT:
+                outputs[pi.getInternSig()] = pi.name
+            elif pi.direction == DIRECTION.IN:
+                inputs.append(pi)
+            else:
+                raise NotImplementedError(pi.direction)
+
+        for pi in inputs:
+            # all signals reachable from this input
+            src = pi.getInternSig()
+            seen = {src}
+            q = deque((src,))
+            reached_outputs = set()
+            while q:
+                v = q.popleft()
+                o_name = outputs.get(v, None)
+                if o_name is not None:
+                    reached_outputs.add(o_name)
+                for w in graph.get(v, ()):
+                    if w not in seen:
+                        seen.add(w)
+                        q.append(w)
+            if reached_outputs:
+                s.port_reach[pi.name] = reached_outputs
+
+        scc_search = StronglyConnectedComponentSearchTarjan(graph)
+        for scc in scc_search.search_strongly_connected_components():
+            if len(scc) > 1:
+                s.loops.append(scc)
+
+        s.has_loops_in_hierarchy = bool(s.loops) or has_loops_in_sub
+        return s
+
+    def visit_HwModule(self, m: HwModule):
+        self.top = m
+        self.getSummary(m)
+
+    @internal
+    def _expandPortPath(self, m: HwModule, in_name: str, out_name: str, path: ComponentPath) -> List[ComponentPath]:
+        """
+        Resolve the combinational path inside of the sub component from the input port to the output port
+        """
+        s = self.getSummary(m)
+        arch = self._getHdlModuleDef(m)
+        src = dst = None
+        for pi in arch.dec.ports:
+            if pi.name == in_name:
+                src = pi.getInternSig()
+            elif pi.name == out_name:
+                dst = pi.getInternSig()
+        p = _findPath(s.graph, src, dst)
+        assert p is not None, (m, in_name, out_name)
+        return self._expandSignalPath(s, p, path)
+
+    @internal
+    def _expandSignalPath(self, s: CombModuleSummary, signals: List[RtlSignal], path: ComponentPath) -> List[ComponentPath]:
+        res = [path / sig for sig in signals]
+        for src, dst in zip(signals, signals[1:]):
+            through = s.through_subcomponent.get((src, dst), None)
+            if through is not None:
+                sm, in_name, out_name = through[0]
+                res.extend(self._expandPortPath(sm, in_name, out_name, path / sm))
+        return res
+
+    @internal
+    def _expandLoop(self, s: CombModuleSummary, scc: List[RtlSignal], path: ComponentPath) -> List[ComponentPath]:
+        res = [path / sig for sig in scc]
+        scc_set = set(scc)
+        for (src, dst), through in s.through_subcomponent.items():
+            if src in scc_set and dst in scc_set:
+                for sm, in_name, out_name in through:
+                    res.extend(self._expandPortPath(sm, in_name, out_name, path / sm))
+        return res
+
+    @internal
+    def _report(self, m: HwModule, path: ComponentPath) -> Generator[List[ComponentPath], None, None]:
+        s = self.getSummary(m)
+        if not s.has_loops_in_hierarchy:
+            return
+        for scc in s.loops:
+            yield self._expandLoop(s, scc, path)
+
+        for o in self._getHdlModuleDef(m).objs:
+            if isinstance(o, HdlCompInst):
+                yield from self._report(o.origin, path / o.origin)
+
+    def report(self) -> Generator[List[ComponentPath], None, None]:
+        """
+        :return: generator of combinational loops (one for each instance of the module with the loop)
+        """
+        assert self.top is not None, "visit_HwModule() has to be called first"
+        yield from self._report(self.top, ComponentPath())
@@ -1,19 +1,15 @@
-from typing import Generator
+from typing import Generator, List
 
-
-def _tarjan_head(index, lowlink, S, S_set, T, g, v):
-    lowlink[v] = index[v] = len(index)
-    S.append(v)
-    S_set.add(v)
-    it = iter(g.get(v, ()))
-    T.append((it, False, v, None))
+from hwt.pyUtils.intGraph import IntGraph
 
 
 class StronglyConnectedComponentSearchTarjan():
     """
-    Tarjan's strongly connected component search graph algorithm for DAGs
-    
-    based on https://github.com/bwesterb/py-tarjan
+    Tarjan's strongly connected component search graph algorithm
+
+    :note: The vertices are interned to integer ids and the search itself
+        is performed by :meth:`hwt.pyUtils.intGraph.IntGraph.stronglyConnectedComponents`
+        (vertices are hashed only once during the construction of the graph).
     """
 
     def __init__(self, g: dict):
@@ -23,46 +19,8 @@ class StronglyConnectedComponentSearchTarjan():
         """
         self.g = g
 
-    def search_strongly_connected_components(self) -> Generator:
+    def search_strongly_connected_components(self) -> Generator[List, None, None]:
         """
-        yields the strongly connected components of the graph in a topological order.
+        yields the strongly connected components of the graph in a reversed topological order.
         """
-        g = self.g # the graph
-        S = [] # The main stack of the alg.
-        S_set = set() # == set(S) for performance
-        index = {} # { v : <index of v> }
-        lowlink = {} # { v : <lowlink of v> }
-        T = [] # stack to replace recursion
-        main_iter = iter(g)
-        for v in main_iter:
-            if v not in index:
-                _tarjan_head(index, lowlink, S, S_set, T, g, v)
-
-            while T:
-                it, inside, v, w = T.pop()
-                if inside:
-                    lowlink[v] = min(lowlink[w], lowlink[v])
-
-                body_break = False
-                for w in it:
-                    if w not in index:
-                        T.append((it, True, v, w))
-                        _tarjan_head(index, lowlink, S, S_set, T, g, w)
-                        body_break = True
-                        break
-
-                    if w in S_set:
-                        lowlink[v] = min(lowlink[v], index[w])
-
-                if body_break:
-                    continue
-
-                if lowlink[v] == index[v]:
-                    scc = []
-                    w = None
-                    while v != w:
-                        w = S.pop()
-                        scc.append(w)
-                        S_set.remove(w)
-
-                    yield scc
+        yield from IntGraph.fromDict(self.g).stronglyConnectedComponentsObj()
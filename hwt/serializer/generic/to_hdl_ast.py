@@ -1,5 +1,5 @@
 from copy import copy, deepcopy
-from typing import Optional, List, Union
+from typing import Callable, Dict, Optional, List, Union
 
 from hdlConvertorAst.hdlAst import iHdlStatement, iHdlObj, HdlIdDef, \
     HdlValueId, HdlTypeType, iHdlExpr, HdlStmBlock, HdlStmIf, HdlStmCase, \
@@ -46,12 +46,16 @@ class ToHdlAst():
         It is set if it is possible to create a tmp variable.
     :ivar ~.constCache: A ConstCache instance used o extract values as a constants.
     :type ~.constCache: Optional[ConstantCache]
+    :ivar ~.memory_init_file_store: optional store manager used to write the initialization files of memories
+        (:meth:`hwt.serializer.store_manager.StoreManager.writeMemoryInitFile`)
     """
     # used to filter statems from other object by class without using
     # isisnstance
     ALL_STATEMENT_CLASSES = [*ALL_STATEMENT_CLASSES, HdlStmCodeBlockContainer]
     TMP_VAR_CONSTRUCTOR = TmpVarConstructor
     _keywords_dict = {}
+    # cache for :meth:`~.as_hdl` {class of converted object: unbound as_hdl_* method or None}
+    _as_hdl_dispatch: Dict[type, Optional[Callable[["ToHdlAst", object], iHdlObj]]] = {}
 
     @classmethod
     def getBaseNameScope(cls):
@@ -68,6 +72,26 @@ class ToHdlAst():
         self.name_scope = name_scope
         self.tmpVars = NoTmpVars()
         self.constCache = None
+        self.memory_init_file_store = None
+
+    def __init_subclass__(cls, **kwargs):
+        super(ToHdlAst, cls).__init_subclass__(**kwargs)
+        # the methods are resolved for each class separately
+        cls._as_hdl_dispatch = {}
+
+    @classmethod
+    def _resolve_as_hdl_fn(cls, obj_cls: type) -> Optional[Callable[["ToHdlAst", object], iHdlObj]]:
+        """
+        Resolve the method which converts the objects of obj_cls in :meth:`~.as_hdl`
+        and store it in the dispatch cache
+
+        :return: unbound method or None if there is not any
+        """
+        serFn = getattr(cls, "as_hdl_" + obj_cls.__name__, None)
+        if serFn is None and issubclass(obj_cls, RtlSignalBase):
+            serFn = getattr(cls, "as_hdl_HdlSignalItem", None)
+        cls._as_hdl_dispatch[obj_cls] = serFn
+        return serFn
 
     def as_hdl(self, obj) -> iHdlObj:
         """
@@ -75,15 +99,16 @@ class ToHdlAst():
 
         :param obj: object to convert
         """
-        serFn = getattr(self, "as_hdl_" + obj.__class__.__name__, None)
-        if serFn is not None:
-            return serFn(obj)
-        elif isinstance(obj, RtlSignalBase):
-            return self.as_hdl_HdlSignalItem(obj)
-        else:
+        try:
+            serFn = self._as_hdl_dispatch[obj.__class__]
+        except KeyError:
+            serFn = self._resolve_as_hdl_fn(obj.__class__)
+
+        if serFn is None:
             raise SerializerException(self,
                                       "Not implemented for obj of",
                                       obj.__class__, obj)
+        return serFn(self, obj)
 
     def as_hdl_HdlType(self, typ: HdlType, declaration=False):
         try:
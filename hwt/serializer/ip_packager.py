@@ -14,7 +14,7 @@ from hwt.hdl.types.bits import HBits
 from hwt.hdl.types.defs import BOOL, STR, BIT, INT
 from hwt.hdl.types.hdlType import HdlType
 from hwt.mainBases import RtlSignalBase
-from hwt.serializer.store_manager import SaveToFilesFlat
+from hwt.serializer.store_manager import SaveToFilesFlatBuffered
 from hwt.serializer.vhdl import Vhdl2008Serializer, ToHdlAstVhdl2008
 from hwt.synth import to_rtl
 from hwt.synthesizer.dummyPlatform import DummyPlatform
@@ -80,7 +80,7 @@ class IpPackager(IpCorePackager):
         :return: list of file names in correct compile order
         """
         ser = self.serializer
-        store = SaveToFilesFlat(ser, saveTo)
+        store = SaveToFilesFlatBuffered(ser, saveTo)
         to_rtl(top, name=topName, store_manager=store,
               target_platform=self.target_platform)
         return store.files
@@ -0,0 +1,223 @@
+from math import ceil, log
+from typing import Tuple
+
+from hwt.hdl.operatorDefs import HOperatorDef, HwtOps
+from hwt.serializer.resourceAnalyzer.resourceTypes import ResourceMUX, \
+    ResourceFF, ResourceLatch, ResourceRAM
+
+BITWISE_OPERATORS = {
+    HwtOps.AND,
+    HwtOps.OR,
+    HwtOps.XOR,
+}
+ADD_LIKE_OPERATORS = {
+    HwtOps.ADD,
+    HwtOps.SUB,
+    HwtOps.MINUS_UNARY,
+}
+EQ_OPERATORS = {
+    HwtOps.EQ,
+    HwtOps.NE,
+}
+CMP_OPERATORS = {
+    HwtOps.GT, HwtOps.GE, HwtOps.LT, HwtOps.LE,
+    HwtOps.UGT, HwtOps.UGE, HwtOps.ULT, HwtOps.ULE,
+    HwtOps.SGT, HwtOps.SGE, HwtOps.SLT, HwtOps.SLE,
+}
+DIV_OPERATORS = {
+    HwtOps.DIV,
+    HwtOps.UDIV,
+    HwtOps.SDIV,
+    HwtOps.MOD,
+}
+# operators which are just a wiring
+FREE_OPERATORS = {
+    HwtOps.NOT,  # absorbed in the LUT of the consumer
+    HwtOps.CONCAT,
+    HwtOps.INDEX,
+    HwtOps.BitsAsSigned,
+    HwtOps.BitsAsUnsigned,
+    HwtOps.BitsAsVec,
+    HwtOps.RISING_EDGE,
+    HwtOps.FALLING_EDGE,
+}
+
+
+class ResourceEstimate():
+    """
+    Estimated usage of the resources of the target device
+
+    :ivar ~.lut: number of LUTs used for logic
+    :ivar ~.lutram: number of LUTs used as a distributed memory
+    :ivar ~.ff: number of flip-flops
+    :ivar ~.latch: number of latches
+    :ivar ~.carry: number of carry chain cells
+    :ivar ~.dsp: number of DSP blocks
+    :ivar ~.bram: number of block RAMs
+    :ivar ~.depth: logic levels (in LUTs) of the slowest operator
+        (the operators are not chained, for the depth of the paths see the timing estimator)
+    """
+    __slots__ = ["lut", "lutram", "ff", "latch", "carry", "dsp", "bram", "depth"]
+
+    def __init__(self):
+        self.lut = 0
+        self.lutram = 0
+        self.ff = 0
+        self.latch = 0
+        self.carry = 0
+        self.dsp = 0
+        self.bram = 0
+        self.depth = 0.0
+
+    def as_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __repr__(self):
+        return "<%s %s>" % (
+            self.__class__.__name__,
+            ", ".join(f"{k:s}:{v}" for k, v in self.as_dict().items() if v))
+
+
+class ResourceCostModel():
+    """
+    Cost model which converts the resource counts from
+    :class:`hwt.serializer.resourceAnalyzer.analyzer.ResourceAnalyzer`
+    to an estimated number of the primitives of the target device.
+    The default values correspond to a generic FPGA with 6-input LUTs, 4-bit carry cells,
+    25x18 multipliers in DSP blocks and 36Kbit block RAMs. Platform specific
+    models are supposed to be a subclasses which override the class attributes
+    and the cost methods, the instance of the model is stored in
+    :attr:`hwt.synthesizer.dummyPlatform.DummyPlatform.resourceCostModel`.
+
+    .. code-block:: python
+
+        a = ResourceAnalyzerHierarchical()
+        a.visit_HwModule(m)
+        est = DummyPlatform().resourceCostModel.estimate(a.report())
+
+    :note: The cost of the operator depends only on its width because
+        the analyzer does not keep anything else.
+    """
+    LUT_INPUTS = 6
+    # number of data inputs of a MUX implemented in a single LUT
+    MUX_INPUTS_PER_LUT = 4
+    CARRY_BITS = 4
+    # delay of a single carry cell in logic levels
+    CARRY_LEVEL_DELAY = 0.125
+    DSP_A_WIDTH = 25
+    DSP_B_WIDTH = 18
+    # delay of the DSP multiplier in logic levels
+    DSP_LEVEL_DELAY = 3.0
+    BRAM_BITS = 36 * 1024
+    BRAM_MAX_WIDTH = 72
+    BRAM_PORTS = 2
+    # memories smaller than this are implemented in LUTs
+    BRAM_MIN_BITS = 2048
+    LUTRAM_BITS = 64
+
+    def _reductionTree(self, inputs: int) -> Tuple[int, int]:
+        """
+        :return: number of LUTs and logic levels of a tree which reduces the inputs to a single bit
+        """
+        luts = 0
+        depth = 0
+        while inputs > 1:
+            inputs = ceil(inputs / self.LUT_INPUTS)
+            luts += inputs
+            depth += 1
+        return luts, depth
+
+    def _carryChain(self, width: int) -> Tuple[int, int, float]:
+        """
+        :return: LUTs, carry cells, logic levels of an operation on carry chain (adder, comparator)
+        """
+        carry = ceil(width / self.CARRY_BITS)
+        return width, carry, 1 + carry * self.CARRY_LEVEL_DELAY
+
+    def operatorCost(self, op: HOperatorDef, width: int) -> Tuple[int, int, int, float]:
+        """
+        :param width: width of the first operand of the operator
+        :return: LUTs, carry cells, DSPs, logic levels
+        """
+        if op in FREE_OPERATORS:
+            return 0, 0, 0, 0
+        elif op in BITWISE_OPERATORS:
+            return width, 0, 0, 1
+        elif op in ADD_LIKE_OPERATORS or op in CMP_OPERATORS:
+            lut, carry, depth = self._carryChain(width)
+            return lut, 0 if width == 1 else carry, 0, depth
+        elif op in EQ_OPERATORS:
+            # one LUT compares LUT_INPUTS // 2 bits of each operand
+            cmp = ceil(width / (self.LUT_INPUTS // 2))
+            lut, depth = self._reductionTree(cmp)
+            return cmp + lut, 0, 0, 1 + depth
+        elif op == HwtOps.MUL:
+            dsp = ceil(width / self.DSP_A_WIDTH) * ceil(width / self.DSP_B_WIDTH)
+            # partial products are summed in the DSP cascade
+            return 0, 0, dsp, self.DSP_LEVEL_DELAY * ceil(log(dsp, 2) + 1)
+        elif op in DIV_OPERATORS:
+            # restoring array divider, one subtractor per bit of the result
+            lut, carry, depth = self._carryChain(width)
+            return lut * width, carry * width, 0, depth * width
+        else:
+            # unknown operator, approximate as a bitwise operator
+            return width, 0, 0, 1
+
+    def muxCost(self, width: int, inputs: int) -> Tuple[int, int]:
+        """
+        :return: LUTs, logic levels
+        """
+        lut_per_bit = 0
+        depth = 0
+        while inputs > 1:
+            inputs = ceil(inputs / self.MUX_INPUTS_PER_LUT)
+            lut_per_bit += inputs
+            depth += 1
+        return width * lut_per_bit, depth
+
+    def ramCost(self, ram: ResourceRAM, est: ResourceEstimate):
+        """
+        Add the cost of the memory to the estimate
+        """
+        bits = ram.width * ram.items
+        async_ports = ram.rwAsync + ram.rAsync + ram.wAsync + ram.rAsync_wSync
+        ports = async_ports + ram.rwSync + ram.rSync + ram.wSync + ram.rSync_wAsync
+        if async_ports or bits < self.BRAM_MIN_BITS:
+            read_ports = ram.rwSync + ram.rSync + ram.rSync_wAsync + \
+                ram.rwAsync + ram.rAsync + ram.rAsync_wSync
+            read_ports = max(read_ports, 1)
+            # each read port has its own copy of the memory
+            est.lutram += ceil(bits / self.LUTRAM_BITS) * read_ports
+        else:
+            bram = max(ceil(bits / self.BRAM_BITS), ceil(ram.width / self.BRAM_MAX_WIDTH))
+            # replication for ports which do not fit into a single block
+            est.bram += bram * ceil(ports / self.BRAM_PORTS)
+
+    def estimate(self, resources: dict) -> ResourceEstimate:
+        """
+        :param resources: dictionary {type of resource: cnt}
+            (:meth:`hwt.serializer.resourceAnalyzer.analyzer.ResourceAnalyzer.report`)
+        """
+        est = ResourceEstimate()
+        for k, cnt in resources.items():
+            if k is ResourceFF:
+                est.ff += cnt
+            elif k is ResourceLatch:
+                est.latch += cnt
+            elif isinstance(k, ResourceRAM):
+                for _ in range(cnt):
+                    self.ramCost(k, est)
+            elif isinstance(k, tuple) and k[0] is ResourceMUX:
+                _, width, inputs = k
+                lut, depth = self.muxCost(width, inputs)
+                est.lut += lut * cnt
+                est.depth = max(est.depth, depth)
+            else:
+                op, width = k
+                lut, carry, dsp, depth = self.operatorCost(op, width)
+                est.lut += lut * cnt
+                est.carry += carry * cnt
+                est.dsp += dsp * cnt
+                est.depth = max(est.depth, depth)
+
+        return est
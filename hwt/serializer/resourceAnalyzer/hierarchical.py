@@ -0,0 +1,207 @@
+from typing import Dict, Optional, Generator, List, Tuple
+
+from hdlConvertorAst.hdlAst._structural import HdlModuleDef, HdlCompInst
+from hwt.doc_markers import internal
+from hwt.hwModule import HwModule
+from hwt.pyUtils.intGraph import IntGraph
+from hwt.serializer.resourceAnalyzer.analyzer import ResourceAnalyzer
+from hwt.synthesizer.componentPath import ComponentPath
+
+
+@internal
+def _addResources(dst: dict, src: dict, multiplicity: int=1):
+    for k, cnt in src.items():
+        dst[k] = dst.get(k, 0) + cnt * multiplicity
+
+
+class _ResourceAnalyzerModuleBody(ResourceAnalyzer):
+    """
+    :class:`hwt.serializer.resourceAnalyzer.analyzer.ResourceAnalyzer` for a single module body
+    which only collects the instances of sub components instead of analyzing them
+    """
+
+    def __init__(self):
+        super(_ResourceAnalyzerModuleBody, self).__init__()
+        self.subcomponents = []
+
+    def visit_HdlCompInst(self, o: HdlCompInst) -> None:
+        self.subcomponents.append(o.origin)
+
+
+class ResourceModuleSummary():
+    """
+    Resources of a single module body (:class:`hdlConvertorAst.hdlAst.HdlModuleDef`)
+
+    :ivar ~.name: name of the module
+    :ivar ~.own: dictionary {type of resource: cnt} for resources of this module body without sub components
+    :ivar ~.total: dictionary {type of resource: cnt} for resources of this module body including all sub components
+    :ivar ~.subcomponents: list of instances of the sub components (:class:`hwt.hwModule.HwModule`)
+    :ivar ~.instance_cnt: number of instances of this module in the hierarchy of the analyzed top
+    """
+    __slots__ = ["name", "own", "total", "subcomponents", "instance_cnt"]
+
+    def __init__(self, name: str):
+        self.name = name
+        self.own: dict = {}
+        self.total: dict = {}
+        self.subcomponents = []
+        self.instance_cnt = 0
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__:s} {self.name:s} x{self.instance_cnt:d}>"
+
+
+class ResourceAnalyzerHierarchical():
+    """
+    Resource analyzer which analyzes each unique module body only once
+    and resolves the resources of the hierarchy by the multiplication of the cached results.
+    The module body is unique for each :class:`hdlConvertorAst.hdlAst.HdlModuleDef`,
+    the instances of the shared components (:attr:`hwt.hwModule.HwModule._shared_component_with`)
+    share the results.
+
+    .. code-block:: python
+
+        m = MyTop()
+        synthesised(m)
+        a = ResourceAnalyzerHierarchical()
+        a.visit_HwModule(m)
+        a.report() # resources of the whole design
+        a.reportPerModule() # resources for each unique module body
+        for path, s in a.reportPerInstance():
+            print(path, s.total)
+
+    :ivar ~.summaries: cache HdlModuleDef: ResourceModuleSummary
+    :ivar ~.top: top module which was visited
+    :ivar ~._top_summaries: summaries of module bodies used in the hierarchy of the top, in topological order
+    """
+
+    def __init__(self):
+        self.summaries: Dict[HdlModuleDef, ResourceModuleSummary] = {}
+        self.top: Optional[HwModule] = None
+        self._top_summaries: List[ResourceModuleSummary] = []
+
+    @staticmethod
+    def _getHdlModuleDef(m: HwModule) -> HdlModuleDef:
+        if m._shared_component_with is None:
+            arch = m._ctx.hwModDef
+        else:
+            _m, _, _ = m._shared_component_with
+            arch = _m._ctx.hwModDef
+        assert arch is not None, m
+        return arch
+
+    def getSummary(self, m: HwModule) -> ResourceModuleSummary:
+        """
+        Get summary for module body of the module instance (analyze it if it was not analyzed yet)
+        """
+        arch = self._getHdlModuleDef(m)
+        s = self.summaries.get(arch, None)
+        if s is None:
+            s = self._analyzeHdlModuleDef(arch)
+            self.summaries[arch] = s
+        return s
+
+    @internal
+    def _analyzeHdlModuleDef(self, arch: HdlModuleDef) -> ResourceModuleSummary:
+        a = _ResourceAnalyzerModuleBody()
+        a.visit_HdlModuleDef(arch)
+        s = ResourceModuleSummary(arch.module_name.val)
+        s.own = a.report()
+        s.subcomponents = a.subcomponents
+        _addResources(s.total, s.own)
+        for sm in s.subcomponents:
+            _addResources(s.total, self.getSummary(sm).total)
+        return s
+
+    def visit_HwModule(self, m: HwModule):
+        for s in self._top_summaries:
+            s.instance_cnt = 0
+        self.top = m
+        top = self.getSummary(m)
+
+        # resolve the number of instances of each module body used in the hierarchy of this top
+        # (the cache may contain the module bodies from previously visited designs)
+        children: Dict[ResourceModuleSummary, Dict[ResourceModuleSummary, int]] = {}
+        toSearch = [top]
+        while toSearch:
+            s = toSearch.pop()
+            if s in children:
+                continue
+            ch = children[s] = {}
+            for sm in s.subcomponents:
+                sms = self.getSummary(sm)
+                ch[sms] = ch.get(sms, 0) + 1
+                toSearch.append(sms)
+
+        top.instance_cnt = 1
+        # SCCs are in reversed topological order, the hierarchy is a DAG so each SCC is a single module
+        self._top_summaries = [s for (s,) in reversed(list(IntGraph.fromDict(children).stronglyConnectedComponentsObj()))]
+        for s in self._top_summaries:
+            for sms, n in children[s].items():
+                sms.instance_cnt += s.instance_cnt * n
+
+    def releaseNotShared(self):
+        """
+        Remove the summaries of the module bodies from the hierarchy of the visited top
+        which can not be reused by other designs (the top and the sub components without
+        :attr:`hwt.hwModule.HwModule._serializeDecision` which are not a part of a module with it).
+        This releases the netlists in long running processes which analyze many designs
+        (e.g. :class:`hwt.synthesizer.paramSweep.HwParamSweep`).
+        """
+        assert self.top is not None, "visit_HwModule() has to be called first"
+        keep = set()
+        release = []
+        seen = set()
+        top = self._getHdlModuleDef(self.top)
+        toSearch = [(top, False)]
+        while toSearch:
+            arch, inShared = toSearch.pop()
+            if (arch, inShared) in seen:
+                continue
+            seen.add((arch, inShared))
+            if inShared:
+                keep.add(arch)
+            else:
+                release.append(arch)
+            s = self.summaries.get(arch, None)
+            if s is not None:
+                for sm in s.subcomponents:
+                    toSearch.append((self._getHdlModuleDef(sm),
+                                     inShared or sm._shared_component_with is not None or sm._serializeDecision is not None))
+
+        for arch in release:
+            if arch not in keep:
+                self.summaries.pop(arch, None)
+
+        for s in self._top_summaries:
+            s.instance_cnt = 0
+        self._top_summaries = []
+        self.top = None
+
+    def report(self) -> dict:
+        """
+        :return: dictionary {type of resource: cnt} for the whole design
+        """
+        assert self.top is not None, "visit_HwModule() has to be called first"
+        return self.getSummary(self.top).total
+
+    def reportPerModule(self) -> Dict[str, ResourceModuleSummary]:
+        """
+        :return: dictionary name of the module: summary of the module body
+        """
+        assert self.top is not None, "visit_HwModule() has to be called first"
+        return {s.name: s for s in self._top_summaries}
+
+    @internal
+    def _reportPerInstance(self, m: HwModule, path: ComponentPath) -> Generator[Tuple[ComponentPath, ResourceModuleSummary], None, None]:
+        s = self.getSummary(m)
+        yield (path, s)
+        for sm in s.subcomponents:
+            yield from self._reportPerInstance(sm, path / sm)
+
+    def reportPerInstance(self) -> Generator[Tuple[ComponentPath, ResourceModuleSummary], None, None]:
+        """
+        :return: generator of tuples (path of the instance, summary of the module body)
+        """
+        assert self.top is not None, "visit_HwModule() has to be called first"
+        yield from self._reportPerInstance(self.top, ComponentPath(self.top))
@@ -0,0 +1,411 @@
+from typing import List, Optional, Tuple, Union
+
+from hdlConvertorAst.hdlAst import HdlStmBlock, HdlStmIf, HdlStmAssign, \
+    iHdlExpr, iHdlStatement
+from hdlConvertorAst.hdlAst._expr import HdlValueId, HdlValueInt, HdlOp, \
+    HdlOpType
+from hdlConvertorAst.translate.verilog_to_basic_hdl_sim_model.utils import hdl_call, \
+    hdl_getattr
+from hwt.doc_markers import internal
+from hwt.hdl.const import HConst
+from hwt.hdl.operator import HOperatorNode
+from hwt.hdl.operatorDefs import HwtOps, CAST_OPS, EVENT_OPS
+from hwt.hdl.statements.assignmentContainer import HdlAssignmentContainer
+from hwt.hdl.statements.codeBlockContainer import HdlStmCodeBlockContainer
+from hwt.hdl.statements.ifContainter import IfContainer
+from hwt.hdl.statements.switchContainer import SwitchContainer
+from hwt.hdl.types.bits import HBits
+from hwt.hdl.types.slice import HSlice
+from hwt.mainBases import RtlSignalBase
+from hwt.pyUtils.setList import SetList
+from pyMathBitPrecise.bit_utils import mask
+
+
+@internal
+class _IntFastPathUnsupported(Exception):
+    """
+    Raised if some part of the process can not be evaluated on plain ints
+    """
+
+
+@internal
+class _IntFastPathCtx():
+    """
+    :ivar ~.inputs: signals read by the fast path, all of them have to be fully valid
+        in order to use the fast path
+    :ivar ~.tmp_cnt: counter used for names of tmp variables
+    """
+
+    def __init__(self):
+        self.inputs: SetList[RtlSignalBase] = SetList()
+        self.tmp_cnt = 0
+
+    def tmpVar(self, stms: List[iHdlStatement], v: iHdlExpr) -> HdlValueId:
+        """
+        Store the value to a new local variable
+        """
+        var = HdlValueId(f"_t{self.tmp_cnt:d}")
+        self.tmp_cnt += 1
+        a = HdlStmAssign(v, var)
+        a.is_blocking = True
+        stms.append(a)
+        return var
+
+
+class ToHdlAstSimModel_intFastPath():
+    """
+    Part of ToHdlAstSimModel which generates the second variant of the process body
+    which computes on plain python ints instead of :class:`pyMathBitPrecise.bits3t.Bits3val`.
+    The process uses this body if all signals read by the process are fully valid,
+    the original 3-valued body is used otherwise.
+
+    .. code-block:: python
+
+        def assig_process_c(self):
+            if (self.io.a.val.vld_mask == 255) & (self.io.b.val.vld_mask == 255):
+                self.io.c.val_next = (Bits3val(self.io.c._dtype, self.io.a.val.val + self.io.b.val.val & 255, 255), 1, )
+            else:
+                self.io.c.val_next = (self.io.a.val + self.io.b.val, 1, )
+
+    :ivar ~.INT_FAST_PATH: if True the fast path is generated for every process where it is possible
+    :note: The ints are in the same format as :attr:`pyMathBitPrecise.bits3t.Bits3val.val`
+        (negative for negative values of signed types). Processes with an unsupported operator,
+        statement or a non :class:`hwt.hdl.types.bits.HBits` type (e.g. arrays) do not have the fast path.
+    """
+    INT_FAST_PATH = True
+    INT = HdlValueId("int", obj=int)
+    _int_fast_path_cmp_ops = {
+        HwtOps.EQ: HdlOpType.EQ,
+        HwtOps.NE: HdlOpType.NE,
+        HwtOps.GT: HdlOpType.GT,
+        HwtOps.GE: HdlOpType.GE,
+        HwtOps.LT: HdlOpType.LT,
+        HwtOps.LE: HdlOpType.LE,
+        HwtOps.UGT: HdlOpType.GT,
+        HwtOps.UGE: HdlOpType.GE,
+        HwtOps.ULT: HdlOpType.LT,
+        HwtOps.ULE: HdlOpType.LE,
+        HwtOps.SGT: HdlOpType.GT,
+        HwtOps.SGE: HdlOpType.GE,
+        HwtOps.SLT: HdlOpType.LT,
+        HwtOps.SLE: HdlOpType.LE,
+    }
+    _int_fast_path_arith_ops = {
+        HwtOps.ADD: HdlOpType.ADD,
+        HwtOps.SUB: HdlOpType.SUB,
+        HwtOps.MUL: HdlOpType.MUL,
+    }
+    _int_fast_path_bitwise_ops = {
+        HwtOps.AND: HdlOpType.AND,
+        HwtOps.OR: HdlOpType.OR,
+        HwtOps.XOR: HdlOpType.XOR,
+    }
+
+    def as_hdl_int_fast_path(self, proc: HdlStmCodeBlockContainer) -> Optional[Tuple[Optional[iHdlExpr], iHdlStatement]]:
+        """
+        :return: tuple (guard expression or None if the process does not read any signal, fast path body)
+            or None if the fast path can not be used for this process
+        """
+        ctx = _IntFastPathCtx()
+        try:
+            body = self._int_fast_path_statements(ctx, proc.statements)
+        except _IntFastPathUnsupported:
+            return None
+
+        guard = None
+        for s in ctx.inputs:
+            c = HdlOp(HdlOpType.EQ, [hdl_getattr(self.as_hdl_HdlSignalItem(s), "vld_mask"),
+                                     self.as_hdl_int(s._dtype.all_mask())])
+            if guard is None:
+                guard = c
+            else:
+                guard = HdlOp(HdlOpType.AND, [guard, c])
+
+        return guard, body
+
+    @internal
+    def _int_fast_path_block(self, stms: List[iHdlStatement]) -> iHdlStatement:
+        if len(stms) == 1:
+            return stms[0]
+        b = HdlStmBlock()
+        b.body = stms
+        return b
+
+    @internal
+    def _int_fast_path_statements(self, ctx: _IntFastPathCtx, stm_list) -> Optional[iHdlStatement]:
+        if stm_list is None:
+            return None
+        return self._int_fast_path_block([self._int_fast_path_statement(ctx, s) for s in stm_list])
+
+    @internal
+    def _int_fast_path_statement(self, ctx: _IntFastPathCtx, stm) -> iHdlStatement:
+        if isinstance(stm, HdlAssignmentContainer):
+            return self._int_fast_path_HdlAssignmentContainer(ctx, stm)
+        elif isinstance(stm, IfContainer):
+            return self._int_fast_path_IfContainer(ctx, stm)
+        elif isinstance(stm, SwitchContainer):
+            return self._int_fast_path_SwitchContainer(ctx, stm)
+        else:
+            raise _IntFastPathUnsupported(stm)
+
+    @internal
+    def _int_fast_path_HdlAssignmentContainer(self, ctx: _IntFastPathCtx, a: HdlAssignmentContainer) -> iHdlStatement:
+        dst = a.dst
+        src = a.src
+        dst_t = dst._dtype
+        src_t = src._dtype
+        if a.indexes is not None\
+                or not isinstance(dst_t, HBits)\
+                or not isinstance(src_t, HBits)\
+                or dst_t.bit_length() != src_t.bit_length()\
+                or bool(dst_t.signed) != bool(src_t.signed):
+            raise _IntFastPathUnsupported(a)
+
+        stms = []
+        v = self._int_fast_path_expr(ctx, stms, src)
+        dst_io = hdl_getattr(self.SELF_IO, dst._name)
+        v = hdl_call(self.Bits3val, [hdl_getattr(dst_io, "_dtype"), v, self.as_hdl_int(dst_t.all_mask())])
+        ev = HdlValueInt(int(a._event_dependent_from_branch == 0), None, None)
+        hdl_a = HdlStmAssign((v, ev), hdl_getattr(dst_io, "val_next"))
+        hdl_a.is_blocking = dst.virtual_only
+        stms.append(hdl_a)
+        return self._int_fast_path_block(stms)
+
+    @internal
+    def _int_fast_path_IfContainer(self, ctx: _IntFastPathCtx, ifc: IfContainer) -> iHdlStatement:
+        stms = []
+        _if = HdlStmIf()
+        _if.cond = self._int_fast_path_cond(ctx, stms, ifc.cond)
+        _if.if_true = self._int_fast_path_statements(ctx, ifc.ifTrue)
+        stms.append(_if)
+        for c, eif_stms in ifc.elIfs:
+            c_stms = []
+            c = self._int_fast_path_cond(ctx, c_stms, c)
+            if_true = self._int_fast_path_statements(ctx, eif_stms)
+            if c_stms:
+                # the condition requires tmp variables which have to be resolved before the condition
+                newIf = HdlStmIf()
+                newIf.cond = c
+                newIf.if_true = if_true
+                _if.if_false = self._int_fast_path_block([*c_stms, newIf])
+                _if = newIf
+            else:
+                _if.elifs.append((c, if_true))
+
+        _if.if_false = self._int_fast_path_statements(ctx, ifc.ifFalse)
+        return self._int_fast_path_block(stms)
+
+    @internal
+    def _int_fast_path_SwitchContainer(self, ctx: _IntFastPathCtx, sw: SwitchContainer) -> iHdlStatement:
+        switchOn = sw.switchOn
+        if not isinstance(switchOn._dtype, HBits):
+            raise _IntFastPathUnsupported(sw)
+
+        stms = []
+        v = ctx.tmpVar(stms, self._int_fast_path_expr(ctx, stms, switchOn))
+        _if = None
+        for key, statements in sw.cases:
+            c = HdlOp(HdlOpType.EQ, [v, self._int_fast_path_const(key)])
+            if_true = self._int_fast_path_statements(ctx, statements)
+            if _if is None:
+                _if = HdlStmIf()
+                _if.cond = c
+                _if.if_true = if_true
+            else:
+                _if.elifs.append((c, if_true))
+
+        default = self._int_fast_path_statements(ctx, sw.default)
+        if _if is None:
+            if default is not None:
+                stms.append(default)
+        else:
+            _if.if_false = default
+            stms.append(_if)
+        return self._int_fast_path_block(stms)
+
+    @internal
+    def _int_fast_path_cond(self, ctx: _IntFastPathCtx, stms: List[iHdlStatement], c) -> iHdlExpr:
+        t = c._dtype
+        if not isinstance(t, HBits) or t.bit_length() != 1:
+            raise _IntFastPathUnsupported(c)
+        v = self._int_fast_path_expr(ctx, stms, c)
+        if t.negated:
+            v = self._int_fast_path_bin_op(ctx, stms, HdlOpType.XOR, v, self.as_hdl_int(1))
+        return v
+
+    @internal
+    def _int_fast_path_atom(self, ctx: _IntFastPathCtx, stms: List[iHdlStatement], v: iHdlExpr) -> iHdlExpr:
+        """
+        Store the expression to a tmp variable if it is not just a value or variable
+        """
+        if isinstance(v, HdlOp):
+            return ctx.tmpVar(stms, v)
+        return v
+
+    @internal
+    def _int_fast_path_bin_op(self, ctx: _IntFastPathCtx, stms: List[iHdlStatement],
+                              fn: HdlOpType, a: iHdlExpr, b: iHdlExpr) -> HdlOp:
+        if fn == HdlOpType.XOR and isinstance(a, HdlOp) and a.fn == HdlOpType.OR:
+            # "|" and "^" have a same precedence for the serializer but not in python,
+            # (a | b) ^ c would be serialized as a | b ^ c
+            a = ctx.tmpVar(stms, a)
+        return HdlOp(fn, [a, b])
+
+    @internal
+    def _int_fast_path_normalize(self, v: iHdlExpr, t: HBits) -> iHdlExpr:
+        """
+        Cut off the overflow bits and convert the value to a negative int if the type is signed
+        and the msb is set
+        """
+        w = t.bit_length()
+        v = HdlOp(HdlOpType.AND, [v, self.as_hdl_int(mask(w))])
+        if t.signed:
+            # ((v & m) ^ msb) - msb
+            msb = self.as_hdl_int(1 << (w - 1))
+            v = HdlOp(HdlOpType.SUB, [HdlOp(HdlOpType.XOR, [v, msb]), msb])
+        return v
+
+    @internal
+    def _int_fast_path_const(self, v: HConst) -> HdlValueInt:
+        if not isinstance(v._dtype, HBits) or not v._is_full_valid():
+            raise _IntFastPathUnsupported(v)
+        return self.as_hdl_int(int(v.val))
+
+    @internal
+    def _int_fast_path_expr(self, ctx: _IntFastPathCtx, stms: List[iHdlStatement],
+                            v: Union[RtlSignalBase, HConst]) -> iHdlExpr:
+        """
+        :param stms: list where the statements which have to be evaluated before the expression are stored
+        """
+        if isinstance(v, RtlSignalBase):
+            if v.hidden:
+                o = v.origin
+                if isinstance(o, HOperatorNode):
+                    return self._int_fast_path_HOperatorNode(ctx, stms, o)
+                raise _IntFastPathUnsupported(v)
+            elif not isinstance(v._dtype, HBits):
+                raise _IntFastPathUnsupported(v)
+            elif v._const:
+                return self._int_fast_path_const(v._val)
+
+            ctx.inputs.append(v)
+            return hdl_getattr(self.as_hdl_HdlSignalItem(v), "val")
+        elif isinstance(v, HConst):
+            return self._int_fast_path_const(v)
+        else:
+            raise _IntFastPathUnsupported(v)
+
+    @internal
+    def _int_fast_path_HOperatorNode(self, ctx: _IntFastPathCtx, stms: List[iHdlStatement],
+                                     op: HOperatorNode) -> iHdlExpr:
+        o = op.operator
+        ops = op.operands
+        res_t = op.result._dtype
+        if not isinstance(res_t, HBits):
+            raise _IntFastPathUnsupported(op)
+
+        if o in EVENT_OPS:
+            s, = ops
+            if not isinstance(s, RtlSignalBase) or s.hidden or not isinstance(s._dtype, HBits):
+                raise _IntFastPathUnsupported(op)
+            ctx.inputs.append(s)
+            fn = "_onRisingEdge" if o == HwtOps.RISING_EDGE else "_onFallingEdge"
+            # pop .val
+            s_io = self.as_hdl_HdlSignalItem(s).ops[0]
+            return hdl_getattr(hdl_call(hdl_getattr(s_io, fn), []), "val")
+
+        elif o == HwtOps.INDEX:
+            src, index = ops
+            src_t = src._dtype
+            if not isinstance(src_t, HBits) or not isinstance(index, HConst) or not index._is_full_valid():
+                raise _IntFastPathUnsupported(op)
+            if isinstance(index._dtype, HSlice):
+                start, stop, step = index.val.start, index.val.stop, index.val.step
+                if not all(isinstance(i, HConst) for i in (start, stop, step)) or int(step) != -1:
+                    raise _IntFastPathUnsupported(op)
+                lo = int(stop)
+                w = int(start) - lo
+            else:
+                lo = int(index)
+                w = 1
+            if lo < 0 or w <= 0 or lo + w > src_t.bit_length():
+                raise _IntFastPathUnsupported(op)
+
+            v = self._int_fast_path_expr(ctx, stms, src)
+            if lo:
+                v = HdlOp(HdlOpType.SRL, [v, self.as_hdl_int(lo)])
+            return HdlOp(HdlOpType.AND, [v, self.as_hdl_int(mask(w))])
+
+        for operand in ops:
+            if not isinstance(operand._dtype, HBits):
+                raise _IntFastPathUnsupported(op)
+
+        if o == HwtOps.TERNARY:
+            c, a, b = ops
+            c = self._int_fast_path_atom(ctx, stms, self._int_fast_path_cond(ctx, stms, c))
+            a = self._int_fast_path_atom(ctx, stms, self._int_fast_path_expr(ctx, stms, a))
+            b = self._int_fast_path_atom(ctx, stms, self._int_fast_path_expr(ctx, stms, b))
+            # the python ternary can be serialized only with simple operands and only as a top expression
+            return ctx.tmpVar(stms, HdlOp(HdlOpType.TERNARY, [c, a, b]))
+
+        elif o in CAST_OPS:
+            src, = ops
+            v = self._int_fast_path_expr(ctx, stms, src)
+            if bool(src._dtype.signed) == bool(res_t.signed):
+                return v
+            return self._int_fast_path_normalize(v, res_t)
+
+        elif o == HwtOps.CONCAT:
+            a, b = ops
+            if a._dtype.signed or b._dtype.signed or res_t.signed:
+                raise _IntFastPathUnsupported(op)
+            a = self._int_fast_path_expr(ctx, stms, a)
+            a = HdlOp(HdlOpType.SLL, [a, self.as_hdl_int(ops[1]._dtype.bit_length())])
+            b = self._int_fast_path_expr(ctx, stms, b)
+            return HdlOp(HdlOpType.OR, [a, b])
+
+        elif o == HwtOps.NOT:
+            a, = ops
+            v = self._int_fast_path_expr(ctx, stms, a)
+            if a._dtype.signed:
+                return HdlOp(HdlOpType.NEG, [v, ])
+            else:
+                return self._int_fast_path_bin_op(ctx, stms, HdlOpType.XOR, v, self.as_hdl_int(a._dtype.all_mask()))
+
+        elif o == HwtOps.MINUS_UNARY:
+            a, = ops
+            if not a._dtype.signed:
+                raise _IntFastPathUnsupported(op)
+            v = HdlOp(HdlOpType.MINUS_UNARY, [self._int_fast_path_expr(ctx, stms, a), ])
+            return self._int_fast_path_normalize(v, a._dtype)
+
+        fn = self._int_fast_path_cmp_ops.get(o, None)
+        if fn is not None:
+            a, b = ops
+            if a._dtype.bit_length() != b._dtype.bit_length() or a._dtype.signed != b._dtype.signed:
+                raise _IntFastPathUnsupported(op)
+            a = self._int_fast_path_expr(ctx, stms, a)
+            b = self._int_fast_path_expr(ctx, stms, b)
+            # int() to get 0/1 and to prevent chaining of python comparisons
+            return hdl_call(self.INT, [HdlOp(fn, [a, b]), ])
+
+        is_arith = False
+        fn = self._int_fast_path_bitwise_ops.get(o, None)
+        if fn is None:
+            fn = self._int_fast_path_arith_ops.get(o, None)
+            if fn is None:
+                raise _IntFastPathUnsupported(op)
+            is_arith = True
+
+        a, b = ops
+        a_t = a._dtype
+        w = a_t.bit_length()
+        # the result has the type of the first operand (same as in Bits3val)
+        if b._dtype.bit_length() != w or res_t.bit_length() != w or bool(res_t.signed) != bool(a_t.signed):
+            raise _IntFastPathUnsupported(op)
+        v = self._int_fast_path_bin_op(ctx, stms, fn,
+                                       self._int_fast_path_expr(ctx, stms, a),
+                                       self._int_fast_path_expr(ctx, stms, b))
+        if is_arith or a_t.signed or b._dtype.signed:
+            v = self._int_fast_path_normalize(v, a_t)
+        return v
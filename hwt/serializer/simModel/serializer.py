@@ -9,7 +9,7 @@ from hdlConvertorAst.hdlAst._structural import HdlModuleDec, HdlModuleDef
 from hdlConvertorAst.to.basic_hdl_sim_model.keywords import SIMMODEL_KEYWORDS
 from hdlConvertorAst.translate.common.name_scope import LanguageKeyword, NameScope
 from hdlConvertorAst.translate.verilog_to_basic_hdl_sim_model.utils import hdl_getattr, \
-    hdl_map_asoc, hdl_call
+    hdl_map_asoc
 from hwt.hdl.operator import HOperatorNode
 from hwt.hdl.operatorDefs import HwtOps
 from hwt.hdl.portItem import HdlPortItem
@@ -17,24 +17,24 @@ from hwt.hdl.statements.assignmentContainer import HdlAssignmentContainer
 from hwt.hdl.statements.codeBlockContainer import HdlStmCodeBlockContainer
 from hwt.hdl.statements.ifContainter import IfContainer
 from hwt.hdl.statements.switchContainer import SwitchContainer
+from hwt.hdl.types.bits import HBits
 from hwt.serializer.generic.constant_cache import ConstantCache
 from hwt.serializer.generic.to_hdl_ast import ToHdlAst
+from hwt.serializer.simModel.intFastPath import ToHdlAstSimModel_intFastPath
 from hwt.serializer.simModel.tmpVarConstructorConstOnly import TmpVarConstructorConstOnly
 from hwt.serializer.simModel.types import ToHdlAstSimModel_types
 from hwt.serializer.simModel.value import ToHdlAstSimModel_value
 from hwt.mainBases import RtlSignalBase
-from hwtSimApi.basic_hdl_simulator.sim_utils import sim_eval_cond
 
 
-class ToHdlAstSimModel(ToHdlAstSimModel_value, ToHdlAstSimModel_types,
-                       ToHdlAst):
+class ToHdlAstSimModel(ToHdlAstSimModel_intFastPath, ToHdlAstSimModel_value,
+                       ToHdlAstSimModel_types, ToHdlAst):
     """
     Serializer which converts :class:`hwt.hwModule.HwModule` instances to simulator code
     """
     _keywords_dict = {kw: LanguageKeyword() for kw in SIMMODEL_KEYWORDS}
-    SIM_EVAL_COND = HdlValueId("sim_eval_cond", obj=sim_eval_cond)
     C = HdlValueId("c", obj=LanguageKeyword())
-    CVLD = HdlValueId("cVld", obj=LanguageKeyword())
+    SW = HdlValueId("sw", obj=LanguageKeyword())
     TMP_VAR_CONSTRUCTOR = TmpVarConstructorConstOnly
 
     def __init__(self, name_scope: Optional[NameScope]=None):
@@ -96,14 +96,16 @@ class ToHdlAstSimModel(ToHdlAstSimModel_value, ToHdlAstSimModel_types,
     def as_hdl_IfContainer_cond_eval(self, cond):
         """
         constructs condition evaluation statement
-        c, cVld = sim_eval_cond(cond)
+        c = cond
+
+        :return: tuple (expression for value of condition as int,
+            expression for validity of condition as int, condition evaluation statement)
         """
-        c, cVld = self.C, self.CVLD
+        c = self.C
         cond = self.as_hdl_cond(cond, True)
-        cond_eval = hdl_call(self.SIM_EVAL_COND, [cond])
-        cond_eval = HdlStmAssign(cond_eval, (c, cVld))
+        cond_eval = HdlStmAssign(cond, c)
         cond_eval.is_blocking = True
-        return c, cVld, cond_eval
+        return hdl_getattr(c, "val"), hdl_getattr(c, "vld_mask"), cond_eval
 
     def as_hdl_IfContainer(self, ifc: IfContainer) -> HdlStmIf:
         """
@@ -118,13 +120,16 @@ class ToHdlAstSimModel(ToHdlAstSimModel_value, ToHdlAstSimModel_types,
 
         .. code-block:: python
 
-            c, cVld = sim_eval_cond(cond)
-            if not cVld:
+            c = cond
+            if not c.vld_mask:
                 # ivalidate outputs
-            elif c:
+            elif c.val:
                 ... # original if true branch
             else:
                 ... # original if else brach
+
+        :note: The condition is always 1b wide and the branch is resolved directly
+            from int value and validity mask of the condition value.
         """
         invalidate_block = self.as_hdl_IfContainer_out_invalidate_section(
             ifc._outputs, ifc)
@@ -156,8 +161,58 @@ class ToHdlAstSimModel(ToHdlAstSimModel_value, ToHdlAstSimModel_types,
 
         return res
 
+    def _can_use_int_switch(self, sw: SwitchContainer):
+        """
+        :return: True if the switch can be resolved by comparison of int values
+        """
+        t = sw.switchOn._dtype
+        return isinstance(t, HBits) and not t.signed and all(
+            k._is_full_valid() for k, _ in sw.cases)
+
+    def as_hdl_SwitchContainer_int(self, sw: SwitchContainer) -> HdlStmBlock:
+        """
+        .. code-block:: python
+
+            sw = switchOn
+            if sw.vld_mask != mask:
+                # invalidate outputs
+            elif sw.val == 0:
+                ... # case 0
+            elif sw.val == 1:
+                ... # case 1
+            else:
+                ... # default
+
+        :note: The switchOn value is evaluated only once and the cases are compared
+            as a plain ints instead of Bits3val._eq() for each case.
+        """
+        switchOn = sw.switchOn
+        invalidate_block = self.as_hdl_IfContainer_out_invalidate_section(
+            sw._outputs, sw)
+        sw_val = self.SW
+        sw_eval = HdlStmAssign(self.as_hdl_Value(switchOn), sw_val)
+        sw_eval.is_blocking = True
+
+        _if = HdlStmIf()
+        mask = switchOn._dtype.all_mask()
+        _if.cond = HdlOp(HdlOpType.NE, [hdl_getattr(sw_val, "vld_mask"),
+                                        HdlValueInt(mask, None, None)])
+        _if.if_true = invalidate_block
+        v = hdl_getattr(sw_val, "val")
+        for key, statements in sw.cases:
+            c = HdlOp(HdlOpType.EQ, [v, HdlValueInt(int(key.val), None, None)])
+            _if.elifs.append((c, self.as_hdl_statements(statements)))
+        _if.if_false = self.as_hdl_statements(sw.default)
+
+        res = HdlStmBlock()
+        res.body = [sw_eval, _if]
+        return res
+
     def as_hdl_SwitchContainer(self, sw: SwitchContainer) -> HdlStmIf:
         "switch -> if"
+        if self._can_use_int_switch(sw):
+            return self.as_hdl_SwitchContainer_int(sw)
+
         switchOn = sw.switchOn
 
         def mkCond(c):
@@ -203,6 +258,19 @@ class ToHdlAstSimModel(ToHdlAstSimModel_value, ToHdlAstSimModel_types,
 
     def as_hdl_HdlStmCodeBlockContainer(self, proc: HdlStmCodeBlockContainer) -> HdlStmProcess:
         p = ToHdlAst.as_hdl_HdlStmCodeBlockContainer(self, proc)
+        if self.INT_FAST_PATH and proc.statements:
+            fast_path = self.as_hdl_int_fast_path(proc)
+            if fast_path is not None:
+                guard, fast_body = fast_path
+                if guard is None:
+                    # does not read any signal, the values are always valid
+                    p.body = fast_body
+                else:
+                    _if = HdlStmIf()
+                    _if.cond = guard
+                    _if.if_true = fast_body
+                    _if.if_false = p.body
+                    p.body = _if
         self.stm_outputs[p] = sorted(
             [HdlValueId(o._name, obj=o)
              for o in proc._outputs]
@@ -1,14 +1,18 @@
-from io import StringIO
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from io import StringIO, BytesIO
 import os
-from typing import Type, Optional, Union
+import pickle
+from typing import Type, Optional, Union, Dict, List
 
 from hdlConvertorAst.hdlAst import HdlModuleDef
 from hdlConvertorAst.hdlAst._bases import iHdlObj
 from hdlConvertorAst.translate.common.name_scope import NameScope
+from hwt.doc_markers import internal
 from hwt.pyUtils.setList import SetList
 from hwt.serializer.serializer_config import DummySerializerConfig
 from hwt.serializer.serializer_filter import SerializerFilter
 from hwt.hwModule import HdlConstraintList
+from hwt.synthesizer.elaborationProfiler import NO_ELABORATION_PROFILER
 from hdlConvertorAst.hdlAst._structural import HdlModuleDec
 
 
@@ -16,7 +20,15 @@ class StoreManager(object):
     """
     A base class for an objects which manage
     how the output of the serialization is stored by serializer_cls
+
+    :ivar ~.profiler: profiler of the elaboration
+        (:class:`hwt.synthesizer.elaborationProfiler.ElaborationProfiler`), set in :func:`hwt.synth.to_rtl`
+    :ivar ~.memory_init_file_threshold: min number of items of an array constant (ROM) which is initialized
+        from an external file written by :meth:`~.writeMemoryInitFile` instead of an assignment per item,
+        None to disable (supported only by serializers and store managers which are able to write such a file)
     """
+    profiler = NO_ELABORATION_PROFILER
+    memory_init_file_threshold: Optional[int] = None
 
     def __init__(self,
                  serializer_cls: DummySerializerConfig,
@@ -28,6 +40,7 @@ class StoreManager(object):
         if _filter is None:
             _filter = SerializerFilter()
         self.filter = _filter
+        self.as_hdl_ast.memory_init_file_store = self
 
     def hierarchy_push(self, obj: Union[HdlModuleDec, HdlModuleDef]) -> NameScope:
         c = self.name_scope.level_push(obj.name)
@@ -43,6 +56,23 @@ class StoreManager(object):
     def write(self, obj: Union[iHdlObj, HdlConstraintList]):
         pass
 
+    def writeMemoryInitFile(self, name: str, data: str) -> Optional[str]:
+        """
+        Store the initialization file of a memory (e.g. a hex file for $readmemh)
+
+        :param name: suggested name of the file
+        :param data: content of the file
+        :return: path of the file which should be used in HDL code,
+            None if this store manager does not support the initialization files
+        """
+        return None
+
+    def finalize(self):
+        """
+        Called once all objects were written (at the end of :func:`hwt.synth.to_rtl`)
+        """
+        pass
+
 
 class SaveToStream(StoreManager):
     """
@@ -72,7 +102,29 @@ class SaveToStream(StoreManager):
             self.ser.visit_iHdlObj(hdl)
 
 
-class SaveToFilesFlat(StoreManager):
+class _SaveMemoryInitFilesToRootMixin():
+    """
+    Common code for store managers which write the memory initialization files to the root directory
+
+    :ivar ~.memory_init_files: list of paths of written memory initialization files
+    """
+
+    def writeMemoryInitFile(self, name: str, data: str) -> Optional[str]:
+        f_name = name + ".hex"
+        fp = os.path.join(self.root, f_name)
+        i = 0
+        while fp in self.memory_init_files:
+            i += 1
+            f_name = f"{name:s}_{i:d}.hex"
+            fp = os.path.join(self.root, f_name)
+        self.memory_init_files.append(fp)
+        with open(fp, "w") as f:
+            f.write(data)
+        # the file is stored next to the source files
+        return f_name
+
+
+class SaveToFilesFlat(_SaveMemoryInitFilesToRootMixin, StoreManager):
     """
     Store all produced code to a single directory, file per component.
     """
@@ -86,6 +138,7 @@ class SaveToFilesFlat(StoreManager):
             serializer_cls, _filter=_filter, name_scope=name_scope)
         self.root = root
         self.files = SetList()
+        self.memory_init_files = SetList()
         self.module_path_prefix = None
         os.makedirs(root, exist_ok=True)
 
@@ -110,10 +163,11 @@ class SaveToFilesFlat(StoreManager):
             s = SaveToStream(self.serializer_cls, f,
                              self.filter, self.name_scope)
             s.ser.module_path_prefix = self.module_path_prefix
+            s.as_hdl_ast.memory_init_file_store = self
             s.write(obj)
 
 
-class SaveToSingleFiles(StoreManager):
+class SaveToSingleFiles(_SaveMemoryInitFilesToRootMixin, StoreManager):
     """
     Store all produced code to a single directory, all component source code to single file
     and all constrains to single file.
@@ -132,6 +186,7 @@ class SaveToSingleFiles(StoreManager):
         self.file_const = os.path.join(self.root, self.comp_name + self.serializer_cls.TO_CONSTRAINTS.fileExtension)
         self.file_src = os.path.join(self.root, self.comp_name + self.serializer_cls.fileExtension)
         self.files = SetList()
+        self.memory_init_files = SetList()
         self.module_path_prefix = None
         os.makedirs(root, exist_ok=True)
 
@@ -151,4 +206,224 @@ class SaveToSingleFiles(StoreManager):
             s = SaveToStream(self.serializer_cls, f,
                              self.filter, self.name_scope)
             s.ser.module_path_prefix = self.module_path_prefix
+            s.as_hdl_ast.memory_init_file_store = self
             s.write(obj)
+
+
+class _SaveToFilesBufferedMixin():
+    """
+    Common code for store managers which write to in memory buffers and write each file only once
+    in :meth:`~.finalize`
+
+    :ivar ~.ser: the serializer (serializer_cls.TO_HDL) which is used together with :attr:`~.as_hdl_ast`
+        for all files of this store manager, only its output is redirected to the buffer of the file
+    :ivar ~._file_buffers: dictionary file name: buffer with the content of the file
+    """
+    FILE_BUFFERING = 1 << 20
+
+    def _initFileBuffers(self):
+        self._file_buffers: Dict[str, StringIO] = {}
+        ser = self.ser = self.serializer_cls.TO_HDL(StringIO())
+        if hasattr(ser, "stm_outputs"):
+            ser.stm_outputs = self.as_hdl_ast.stm_outputs
+
+    def _getFileBuffer(self, f_name: str) -> StringIO:
+        try:
+            buff = self._file_buffers[f_name]
+        except KeyError:
+            buff = self._file_buffers[f_name] = StringIO()
+            self.files.append(f_name)
+        return buff
+
+    def _writeToFile(self, f_name: str, obj: Union[iHdlObj, HdlConstraintList]):
+        buff = self._getFileBuffer(f_name)
+        self.as_hdl_ast.name_scope = self.name_scope
+        if isinstance(obj, HdlConstraintList):
+            if self.serializer_cls.TO_CONSTRAINTS is not None:
+                to_constr = self.serializer_cls.TO_CONSTRAINTS(buff)
+                to_constr.visit_HdlConstraintList(obj)
+        else:
+            hdl = self.as_hdl_ast.as_hdl(obj)
+            ser = self.ser
+            ser.module_path_prefix = self.module_path_prefix
+            # :note: each object is serialized as a whole, the indentation is always 0 between the objects
+            ser.out.stream = buff
+            ser.visit_iHdlObj(hdl)
+
+    def finalize(self):
+        for f_name, buff in self._file_buffers.items():
+            with open(f_name, "w", buffering=self.FILE_BUFFERING) as f:
+                f.write(buff.getvalue())
+        self._file_buffers.clear()
+
+
+class SaveToFilesFlatBuffered(_SaveToFilesBufferedMixin, SaveToFilesFlat):
+    """
+    :class:`~.SaveToFilesFlat` which writes each file only once
+    and reuses a single serializer instance for all files
+
+    :attention: the files are written in :meth:`~.finalize`
+    """
+
+    def __init__(self,
+                 serializer_cls: DummySerializerConfig,
+                 root: str,
+                 _filter: "SerializerFilter"=None,
+                 name_scope: Optional[NameScope]=None):
+        super(SaveToFilesFlatBuffered, self).__init__(
+            serializer_cls, root, _filter=_filter, name_scope=name_scope)
+        self._initFileBuffers()
+
+    def write(self, obj: Union[iHdlObj, HdlConstraintList]):
+        if isinstance(obj, HdlConstraintList):
+            f_name = "constraints" + self.serializer_cls.TO_CONSTRAINTS.fileExtension
+        else:
+            if isinstance(obj, HdlModuleDef):
+                name = obj.module_name.val
+            else:
+                name = obj.name
+            f_name = name + self.serializer_cls.fileExtension
+
+        self._writeToFile(os.path.join(self.root, f_name), obj)
+
+
+class SaveToSingleFilesBuffered(_SaveToFilesBufferedMixin, SaveToSingleFiles):
+    """
+    :class:`~.SaveToSingleFiles` which writes each file only once
+    and reuses a single serializer instance for all files
+
+    :attention: the files are written in :meth:`~.finalize`
+    """
+
+    def __init__(self,
+                 serializer_cls: DummySerializerConfig,
+                 root: str,
+                 name: str,
+                 _filter: "SerializerFilter"=None,
+                 name_scope: Optional[NameScope]=None):
+        super(SaveToSingleFilesBuffered, self).__init__(
+            serializer_cls, root, name, _filter=_filter, name_scope=name_scope)
+        self._initFileBuffers()
+
+    def write(self, obj: Union[iHdlObj, HdlConstraintList]):
+        if isinstance(obj, HdlConstraintList):
+            f_name = self.file_const
+        else:
+            f_name = self.file_src
+        self._writeToFile(f_name, obj)
+
+
+class _HdlAstPickler(pickle.Pickler):
+    """
+    Pickler for HDL AST which replaces references to hwt objects (e.g. :attr:`HdlValueId.obj`, :attr:`HdlIdDef.origin`)
+    by None, the text serializers do not use them and pickling of them would pickle whole netlist
+    """
+
+    def persistent_id(self, obj):
+        if type(obj).__module__.startswith("hwt."):
+            return "hwt"
+        return None
+
+
+class _HdlAstUnpickler(pickle.Unpickler):
+
+    def persistent_load(self, pid):
+        return None
+
+
+@internal
+def _serializeHdlAst(serializer_cls: DummySerializerConfig, data: bytes) -> str:
+    """
+    Serialize pickled HDL AST to a string (executed in a worker process)
+    """
+    hdl = _HdlAstUnpickler(BytesIO(data)).load()
+    buff = StringIO()
+    serializer_cls.TO_HDL(buff).visit_iHdlObj(hdl)
+    return buff.getvalue()
+
+
+class SaveToStreamParallel(StoreManager):
+    """
+    Store all produced code to an output stream, the conversion to HDL AST is performed in this process,
+    the serialization of the HDL AST to text is performed in a pool of processes.
+    The output is written in the same order as with :class:`~.SaveToStream` in :meth:`~.finalize`.
+
+    :ivar ~.executor: the pool of worker processes, if None the serialization is performed in this process
+    :ivar ~._results: list of strings or futures with the code for each written object
+    :note: If the HDL AST can not be pickled the object is serialized in this process.
+    :attention: The serializers which require a state shared with the conversion to HDL AST
+        (:class:`hwt.serializer.simModel.SimModelSerializer`) are not supported.
+    """
+
+    def __init__(self,
+                 serializer_cls: DummySerializerConfig,
+                 stream: StringIO,
+                 _filter: "SerializerFilter"=None,
+                 name_scope: Optional[NameScope]=None,
+                 max_workers: Optional[int]=None,
+                 executor: Optional[Executor]=None):
+        """
+        :param max_workers: number of worker processes (default os.cpu_count()),
+            if 1 the serialization is performed in this process
+        :param executor: optional executor to use instead of a new process pool
+            (it is not shut down in :meth:`~.finalize`)
+        """
+        super(SaveToStreamParallel, self).__init__(
+            serializer_cls, _filter=_filter, name_scope=name_scope)
+        self.stream = stream
+        if hasattr(self.serializer_cls.TO_HDL(StringIO()), "stm_outputs"):
+            raise NotImplementedError(
+                "Serializer requires a state shared with the conversion to HDL AST,"
+                " it can not be executed in other process", serializer_cls)
+        self._own_executor = False
+        if executor is None and (max_workers is None or max_workers > 1):
+            try:
+                executor = ProcessPoolExecutor(max_workers=max_workers)
+                self._own_executor = True
+            except (OSError, NotImplementedError, ImportError):
+                # platform without support for multiprocessing
+                executor = None
+        self.executor = executor
+        self._results: List[Union[str, Future]] = []
+
+    def _serializeLocal(self, hdl: iHdlObj) -> str:
+        buff = StringIO()
+        self.serializer_cls.TO_HDL(buff).visit_iHdlObj(hdl)
+        return buff.getvalue()
+
+    def write(self, obj: Union[iHdlObj, HdlConstraintList]):
+        self.as_hdl_ast.name_scope = self.name_scope
+        if isinstance(obj, HdlConstraintList):
+            if self.serializer_cls.TO_CONSTRAINTS is not None:
+                buff = StringIO()
+                to_constr = self.serializer_cls.TO_CONSTRAINTS(buff)
+                to_constr.visit_HdlConstraintList(obj)
+                self._results.append(buff.getvalue())
+            return
+
+        hdl = self.as_hdl_ast.as_hdl(obj)
+        if self.executor is not None:
+            buff = BytesIO()
+            try:
+                _HdlAstPickler(buff, protocol=pickle.HIGHEST_PROTOCOL).dump(hdl)
+            except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+                pass
+            else:
+                self._results.append(self.executor.submit(
+                    _serializeHdlAst, self.serializer_cls, buff.getvalue()))
+                return
+
+        self._results.append(self._serializeLocal(hdl))
+
+    def finalize(self):
+        try:
+            for r in self._results:
+                if isinstance(r, Future):
+                    r = r.result()
+                self.stream.write(r)
+        finally:
+            self._results.clear()
+            if self._own_executor:
+                self.executor.shutdown()
+                self.executor = None
+                self._own_executor = False
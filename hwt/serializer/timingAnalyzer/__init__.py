@@ -0,0 +1,353 @@
+"""
+Timing analyzer estimates the number of logic levels on the paths between registers
+without any synthesis tool.
+"""
+from itertools import chain
+from typing import Dict, List, Optional, Union, Tuple
+
+from hdlConvertorAst.hdlAst._structural import HdlModuleDef, HdlCompInst
+from hwt.doc_markers import internal
+from hwt.hdl.const import HConst
+from hwt.hdl.operator import HOperatorNode, isConst
+from hwt.hdl.operatorDefs import HwtOps, EVENT_OPS
+from hwt.hdl.statements.assignmentContainer import HdlAssignmentContainer
+from hwt.hdl.statements.codeBlockContainer import HdlStmCodeBlockContainer
+from hwt.hdl.statements.ifContainter import IfContainer
+from hwt.hdl.statements.statement import HdlStatement
+from hwt.hdl.statements.switchContainer import SwitchContainer
+from hwt.hdl.types.array import HArray
+from hwt.hwModule import HwModule
+from hwt.pyUtils.intGraph import IntGraph
+from hwt.serializer.resourceAnalyzer.analyzer import ResourceAnalyzer, \
+    count_mux_inputs_for_outputs
+from hwt.serializer.resourceAnalyzer.costModel import ResourceCostModel
+from hwt.synthesizer.componentPath import ComponentPath
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
+from ipCorePackager.constants import DIRECTION
+
+# a marker of the input of the register in the timing graph
+# (the node for register input is a tuple (REGISTER_INPUT, path of the register signal))
+REGISTER_INPUT = "D"
+
+TimingNode = Union[ComponentPath, Tuple[str, ComponentPath]]
+
+
+def operatorNodeDepth(cost_model: ResourceCostModel, op: HOperatorNode) -> float:
+    """
+    :return: delay of the operator in logic levels
+    """
+    o = op.operator
+    o0 = op.operands[0]
+    if o == HwtOps.INDEX:
+        o1 = op.operands[1]
+        if isConst(o1):
+            return 0
+        elif isinstance(o0._dtype, HArray):
+            # asynchronous read of memory
+            return 1
+        else:
+            return cost_model.muxCost(1, o0._dtype.bit_length())[1]
+    elif o == HwtOps.TERNARY:
+        return cost_model.muxCost(1, 2)[1]
+    else:
+        return cost_model.operatorCost(o, o0._dtype.bit_length())[3]
+
+
+class TimingPath():
+    """
+    A combinational path between two timing points (register, top input/output)
+
+    :ivar ~.depth: number of logic levels on the path (as resolved by the cost model)
+    :ivar ~.nodes: list of tuples (path of the signal, depth from the start of the path)
+        if the path ends in the register, the last signal is the register itself
+    :ivar ~.ends_in_register: True if the path ends in the input of the register, False if it ends in top output
+    :ivar ~.clk: path of the clock signal of the register where the path ends (None for top outputs)
+    """
+    __slots__ = ["depth", "nodes", "ends_in_register", "clk"]
+
+    def __init__(self, depth: float, nodes: List[Tuple[ComponentPath, float]],
+                 ends_in_register: bool, clk: Optional[ComponentPath]):
+        self.depth = depth
+        self.nodes = nodes
+        self.ends_in_register = ends_in_register
+        self.clk = clk
+
+    @property
+    def start(self) -> ComponentPath:
+        return self.nodes[0][0]
+
+    @property
+    def end(self) -> ComponentPath:
+        return self.nodes[-1][0]
+
+    def __repr__(self):
+        return (f"<{self.__class__.__name__:s} depth:{self.depth:.2f}"
+                f" {self.start.resolve()} -> {self.end.resolve()}{'.D' if self.ends_in_register else ''}>")
+
+
+class TimingDepthAnalyzer():
+    """
+    Visitor which walks synthesised :class:`hwt.hwModule.HwModule` instances (including the sub components)
+    and estimates the longest combinational paths between registers, top inputs and top outputs.
+    The delay of each operator and each MUX is specified by a cost model
+    (:class:`hwt.serializer.resourceAnalyzer.costModel.ResourceCostModel`) in logic levels.
+
+    .. code-block:: python
+
+        m = MyTop()
+        synthesised(m)
+        a = TimingDepthAnalyzer()
+        a.visit_HwModule(m)
+        for p in a.report(10):
+            print(p)
+
+    :note: Only the worst path for each endpoint is reported.
+    :note: The edges in combinational loops are ignored (:class:`hwt.serializer.combLoopAnalyzer.CombLoopAnalyzer`
+        can be used to detect them).
+    :ivar ~.cost_model: model which specifies delays of operators, if None the model from
+        :attr:`hwt.synthesizer.dummyPlatform.DummyPlatform.resourceCostModel` of the top module is used
+    :ivar ~.graph: graph of signals with edges weighted by the delay
+    :ivar ~.register_clk: dictionary path of register: path of its clock signal
+    :ivar ~.top_outputs: list of paths of output signals of the top module
+    :ivar ~.input_port_driver: dictionary path of signal connected to input port inside of component:
+        path of the signal connected to this port in parent (used to resolve the clock domains)
+    :ivar ~.actual_path_prefix: path of the currently analyzed module instance
+    """
+
+    def __init__(self, cost_model: Optional[ResourceCostModel]=None):
+        self.cost_model = cost_model
+        self.graph: IntGraph[TimingNode] = IntGraph()
+        self.register_clk: Dict[ComponentPath, ComponentPath] = {}
+        self.top_outputs: List[ComponentPath] = []
+        self.input_port_driver: Dict[ComponentPath, ComponentPath] = {}
+        self.actual_path_prefix = ComponentPath()
+        self._expr_depth_cache: Dict[RtlSignal, Dict[RtlSignal, float]] = {}
+
+    @internal
+    def _exprSources(self, e: Union[RtlSignal, HConst]) -> Dict[RtlSignal, float]:
+        """
+        :return: dictionary non hidden signal: max number of logic levels between this signal and e
+        """
+        if isinstance(e, HConst):
+            return {}
+        elif not e.hidden:
+            return {e: 0}
+
+        cache = self._expr_depth_cache
+        res = cache.get(e, None)
+        if res is not None:
+            return res
+
+        res = {}
+        for d in e.drivers:
+            if not isinstance(d, HOperatorNode):
+                continue
+            if d.operator in EVENT_OPS:
+                # clock is not a data path
+                continue
+            depth = operatorNodeDepth(self.cost_model, d)
+            for op in d.operands:
+                for s, s_depth in self._exprSources(op).items():
+                    s_depth += depth
+                    if res.get(s, -1) < s_depth:
+                        res[s] = s_depth
+        cache[e] = res
+        return res
+
+    @internal
+    def _mergeSources(self, a: Dict[RtlSignal, float], b: Dict[RtlSignal, float]) -> Dict[RtlSignal, float]:
+        res = dict(a)
+        for s, d in b.items():
+            if res.get(s, -1) < d:
+                res[s] = d
+        return res
+
+    @internal
+    def _clockOf(self, ev_cond: RtlSignal) -> RtlSignal:
+        for d in ev_cond.drivers:
+            if isinstance(d, HOperatorNode) and d.operator in EVENT_OPS:
+                return d.operands[0]
+        raise NotImplementedError("Can not resolve clock signal from event dependent condition", ev_cond)
+
+    @internal
+    def _addEdges(self, sources: Dict[RtlSignal, float], dst: TimingNode, extra_depth: float):
+        g = self.graph
+        prefix = self.actual_path_prefix
+        dst = g.addVertex(dst)
+        for s, depth in sources.items():
+            g.addEdge(g.addVertex(prefix / s), dst, depth + extra_depth)
+
+    @internal
+    def _visitStatement(self, stm: HdlStatement, cond_sources: Dict[RtlSignal, float],
+                        clk: Optional[RtlSignal], mux_inputs: Dict[RtlSignal, int]):
+        """
+        :param cond_sources: sources of the conditions of the branch where this statement is
+        :param clk: clock signal if this statement is in event dependent branch
+        :param mux_inputs: number of assignments for each output of the top statement
+        """
+        if isinstance(stm, HdlAssignmentContainer):
+            sources = self._mergeSources(cond_sources, self._exprSources(stm.src))
+            if stm.indexes:
+                for i in stm.indexes:
+                    sources = self._mergeSources(sources, self._exprSources(i))
+            o = stm.dst
+            o_path = self.actual_path_prefix / o
+            cnt = mux_inputs.get(o, 1)
+            mux_depth = self.cost_model.muxCost(1, cnt)[1] if cnt > 1 else 0
+            if clk is None:
+                dst = o_path
+            else:
+                dst = (REGISTER_INPUT, o_path)
+                self.register_clk[o_path] = self.actual_path_prefix / clk
+            self._addEdges(sources, dst, mux_depth)
+
+        elif isinstance(stm, IfContainer):
+            ev_dep_branch = stm._event_dependent_from_branch
+            branches = ((stm.cond, stm.ifTrue), *stm.elIfs)
+            for branch_i, (cond, stms) in enumerate(branches):
+                # :note: the nested statements in clocked branch have _event_dependent_from_branch set as well,
+                #     their conditions are data (e.g. reset, clock enable)
+                if clk is None and ev_dep_branch is not None and ev_dep_branch == branch_i:
+                    _clk = self._clockOf(cond)
+                    for sub_stm in stms:
+                        self._visitStatement(sub_stm, cond_sources, _clk, mux_inputs)
+                    # the rest of the branches are not reachable in hardware
+                    return
+
+                cond_sources = self._mergeSources(cond_sources, self._exprSources(cond))
+                for sub_stm in stms:
+                    self._visitStatement(sub_stm, cond_sources, clk, mux_inputs)
+
+            if stm.ifFalse is not None:
+                for sub_stm in stm.ifFalse:
+                    self._visitStatement(sub_stm, cond_sources, clk, mux_inputs)
+
+        elif isinstance(stm, SwitchContainer):
+            cond_sources = self._mergeSources(cond_sources, self._exprSources(stm.switchOn))
+            cases = stm.cases
+            if stm.default is not None:
+                cases = chain(cases, ((None, stm.default),))
+            for _, case_stms in cases:
+                for sub_stm in case_stms:
+                    self._visitStatement(sub_stm, cond_sources, clk, mux_inputs)
+
+        elif isinstance(stm, HdlStmCodeBlockContainer):
+            for sub_stm in stm.statements:
+                self._visitStatement(sub_stm, cond_sources, clk, count_mux_inputs_for_outputs(sub_stm))
+
+        else:
+            raise NotImplementedError(stm)
+
+    def visit_HwModule(self, m: HwModule):
+        top = self.actual_path_prefix == ComponentPath()
+        if top:
+            if self.cost_model is None:
+                self.cost_model = m._target_platform.resourceCostModel
+            for pi in m._ctx.hwModDec.ports:
+                if pi.direction == DIRECTION.OUT:
+                    s = pi.getInternSig()
+                    self.top_outputs.append(ComponentPath(s))
+                    self.graph.addVertex(ComponentPath(s))
+
+        if m._shared_component_with is None:
+            arch = m._ctx.hwModDef
+        else:
+            _m, _, _ = m._shared_component_with
+            arch = _m._ctx.hwModDef
+        assert arch is not None, m
+
+        self.visit_HdlModuleDef(arch)
+
+    def visit_HdlModuleDef(self, m: HdlModuleDef) -> None:
+        ResourceAnalyzer.visit_HdlModuleDef(self, m)
+
+    def visit_HdlStmCodeBlockContainer(self, proc: HdlStmCodeBlockContainer) -> None:
+        self._visitStatement(proc, {}, None, {})
+
+    def visit_HdlCompInst(self, o: HdlCompInst) -> None:
+        orig_path_prefix = self.actual_path_prefix
+        in_component_path_prefix = orig_path_prefix / o.origin
+
+        try:
+            self.actual_path_prefix = in_component_path_prefix
+            self.visit_HwModule(o.origin)
+        finally:
+            self.actual_path_prefix = orig_path_prefix
+
+        g = self.graph
+        for pm in o.port_map:
+            if pm.direction == DIRECTION.OUT:
+                src = in_component_path_prefix / pm.src
+                dst = orig_path_prefix / pm.dst
+            elif pm.direction == DIRECTION.IN:
+                src = orig_path_prefix / pm.src
+                dst = in_component_path_prefix / pm.dst
+                self.input_port_driver[dst] = src
+            else:
+                raise NotImplementedError(pm.direction)
+            g.addEdge(g.addVertex(src), g.addVertex(dst), 0.0)
+
+    def resolveClk(self, clk: ComponentPath) -> ComponentPath:
+        """
+        Follow the input ports to the top-most signal of the clock
+        """
+        while True:
+            _clk = self.input_port_driver.get(clk, None)
+            if _clk is None:
+                return clk
+            clk = _clk
+
+    def report(self, n: Optional[int]=None, clk: Optional[ComponentPath]=None) -> List[TimingPath]:
+        """
+        :param n: max number of reported paths (None for all endpoints)
+        :param clk: if specified only the paths which end in registers with this clock are reported
+            (path of the top-most signal of the clock, :meth:`~.resolveClk`)
+        :return: list of worst paths (one for each endpoint), the slowest first
+        """
+        g = self.graph
+        dist, pred = g.longestPaths()
+        vertexId = g.vertexId
+        endpoints = []
+        if clk is None:
+            for o in self.top_outputs:
+                endpoints.append((vertexId[o], False, None))
+
+        for reg, reg_clk in self.register_clk.items():
+            reg_clk = self.resolveClk(reg_clk)
+            if clk is not None and reg_clk != clk:
+                continue
+            v = vertexId.get((REGISTER_INPUT, reg), None)
+            if v is not None:
+                endpoints.append((v, True, reg_clk))
+
+        endpoints.sort(key=lambda x: dist[x[0]], reverse=True)
+        if n is not None:
+            endpoints = endpoints[:n]
+
+        res = []
+        vertices = g.vertices
+        for v, is_reg, reg_clk in endpoints:
+            nodes = []
+            u = v
+            while u != -1:
+                node = vertices[u]
+                if is_reg and u == v:
+                    # (REGISTER_INPUT, path of register)
+                    node = node[1]
+                nodes.append((node, dist[u]))
+                u = pred[u]
+            nodes.reverse()
+            res.append(TimingPath(dist[v], nodes, is_reg, reg_clk))
+        return res
+
+    def reportPerClockDomain(self, n: Optional[int]=None) -> Dict[Optional[ComponentPath], List[TimingPath]]:
+        """
+        :return: dictionary path of clock signal: worst paths which end in registers of this clock domain,
+            None for the paths which end in the top outputs
+        """
+        res = {}
+        for p in self.report():
+            paths = res.setdefault(p.clk, [])
+            if n is None or len(paths) < n:
+                paths.append(p)
+        return res
@@ -1,4 +1,5 @@
 from copy import copy
+from math import ceil
 from typing import Optional, List
 
 from hdlConvertorAst.hdlAst import HdlStmIf, HdlOp, \
@@ -12,6 +13,7 @@ from hdlConvertorAst.translate.common.name_scope import LanguageKeyword, NameSco
 from hdlConvertorAst.translate.verilog_to_basic_hdl_sim_model.utils import hdl_call
 from hwt.hdl.portItem import HdlPortItem
 from hwt.hdl.types.array import HArray
+from hwt.hdl.types.bits import HBits
 from hwt.hdl.types.defs import STR, INT, BOOL
 from hwt.serializer.generic.to_hdl_ast import ToHdlAst
 from hwt.serializer.verilog.context import SignalTypeSwap
@@ -20,6 +22,7 @@ from hwt.serializer.verilog.statements import ToHdlAstVerilog_statements
 from hwt.serializer.verilog.types import ToHdlAstVerilog_types
 from hwt.serializer.verilog.utils import SIGNAL_TYPE, verilogTypeOfSig
 from hwt.serializer.verilog.value import ToHdlAstVerilog_Value
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
 
 
 class ToHdlAstVerilog(ToHdlAstVerilog_types,
@@ -31,6 +34,32 @@ class ToHdlAstVerilog(ToHdlAstVerilog_types,
         ToHdlAst.__init__(self, name_scope=name_scope)
         self.signalType = SIGNAL_TYPE.PORT_WIRE
 
+    def _as_hdl_rom_init_file(self, rom: RtlSignal) -> Optional[str]:
+        """
+        Write the content of the array constant to a hex file for $readmemh
+        if the array is large enough (:attr:`hwt.serializer.store_manager.StoreManager.memory_init_file_threshold`)
+
+        :return: path of the file or None if the array should be initialized by the assignment per item
+        """
+        store = self.memory_init_file_store
+        if store is None or store.memory_init_file_threshold is None:
+            return None
+        t = rom._dtype
+        if int(t.size) < store.memory_init_file_threshold or not isinstance(t.element_t, HBits):
+            return None
+
+        digits = ceil(t.element_t.bit_length() / 4)
+        all_mask = t.element_t.all_mask()
+        lines = []
+        for _v in rom.def_val:
+            if _v._is_full_valid():
+                # two's complement for signed items
+                lines.append(f"{_v.val & all_mask:0{digits:d}x}")
+            else:
+                lines.append("x" * digits)
+        lines.append("")
+        return store.writeMemoryInitFile(f"{rom.ctx.hwModDec.name:s}_{rom._name:s}", "\n".join(lines))
+
     def as_hdl_HdlModuleDef_variable(
             self, v, types, hdl_types, hdl_variables,
             processes, component_insts):
@@ -53,11 +82,15 @@ class ToHdlAstVerilog(ToHdlAstVerilog_types,
                     p.labels.append(label)
                     p.body = HdlStmBlock()
                     body = p.body.body
-                    for i, _v in enumerate(rom.def_val):
-                        a = HdlStmAssign(self.as_hdl_int(int(_v)),
-                                         self.as_hdl(rom[i]))
-                        a.is_blocking = True
-                        body.append(a)
+                    init_file = self._as_hdl_rom_init_file(rom)
+                    if init_file is None:
+                        for i, _v in enumerate(rom.def_val):
+                            a = HdlStmAssign(self.as_hdl_int(int(_v)),
+                                             self.as_hdl(rom[i]))
+                            a.is_blocking = True
+                            body.append(a)
+                    else:
+                        body.append(hdl_call(HdlValueId("$readmemh"), [init_file, self.as_hdl(rom)]))
                     w = HdlStmWait()
                     w.val = []  # initial process
                     body.append(w)
@@ -1,8 +1,70 @@
+from collections import deque
+from typing import Callable, Dict, Any, Sequence
+
+from hwt.hdl.const import HConst
+from hwt.simulator.idleAwareCallbackLoop import OnRisingCallbackLoopIdleAware, \
+    NotifyingDeque
 from hwt.synthesizer.exceptions import IntfLvlConfErr
 from hwtSimApi.agents.base import AgentBase, SyncAgentBase as pcSyncAgentBase, \
     AgentWitReset as pcAgentWitReset
 from hwtSimApi.hdlSimulator import HdlSimulator
 from hwtSimApi.process_utils import OnRisingCallbackLoop
+from pyMathBitPrecise.array3t import Array3val
+from pyMathBitPrecise.bits3t import Bits3val
+
+# attributes which hold the data of the agent if the agent does not specify them (:meth:`SyncAgentBase._getCheckpointState`)
+DEFAULT_CHECKPOINT_ATTRS = ("_enabled", "data", "actualData")
+
+
+def copyAgentData(v):
+    """
+    Copy the data of the agent (values, and deque, list, tuple, dict, set of them)
+
+    :raise TypeError: if the data contains any other object (e.g. interface, signal, process)
+    """
+    if v is None or isinstance(v, (int, float, str)):
+        # includes bool and hwtSimApi.agents.base.NOP
+        return v
+    elif isinstance(v, (HConst, Bits3val, Array3val)):
+        return v.__copy__()
+
+    t = type(v)
+    if t is deque or t is NotifyingDeque:
+        # the callback of NotifyingDeque is not a data, the state is restored to the existing deque
+        return deque(copyAgentData(i) for i in v)
+    elif t in (list, tuple, set):
+        return t(copyAgentData(i) for i in v)
+    elif t is dict:
+        return {copyAgentData(k): copyAgentData(_v) for k, _v in v.items()}
+    else:
+        raise TypeError("Not an agent data", v)
+
+
+def getAgentCheckpointState(agent, attrs: Sequence[str]) -> Dict[str, Any]:
+    """
+    :return: dictionary attribute name: copy of the value for the attributes which are present on the agent
+    """
+    state = {}
+    agent_dict = vars(agent)
+    for k in attrs:
+        if k in agent_dict:
+            state[k] = copyAgentData(agent_dict[k])
+    return state
+
+
+def setAgentCheckpointState(agent, state: Dict[str, Any]):
+    """
+    Load the values from :func:`~.getAgentCheckpointState`
+    """
+    for k, v in state.items():
+        v = copyAgentData(v)
+        cur = getattr(agent, k, None)
+        if isinstance(cur, deque) and isinstance(v, deque):
+            # keep the original object because it may be a NotifyingDeque
+            cur.clear()
+            cur.extend(v)
+        else:
+            setattr(agent, k, v)
 
 
 class AgentWitReset(pcAgentWitReset):
@@ -40,8 +102,15 @@ class SyncAgentBase(AgentWitReset, pcSyncAgentBase):
 
     :attention: requires clk and rst/rstn signal
         (if you do not have any create simulation wrapper with it)
+    :cvar IDLE_AWARE_PROCESSES: if True agents which support it suspend its processes
+        while they do not have anything to do (e.g. driver without data) instead of waking up
+        on every clock edge (:class:`hwt.simulator.idleAwareCallbackLoop.OnRisingCallbackLoopIdleAware`)
     """
     SELECTED_EDGE_CALLBACK = OnRisingCallbackLoop
+    IDLE_AWARE_PROCESSES = False
+    # names of attributes which hold the data of the agent
+    # (stored in :class:`hwt.simulator.checkpoint.SimCheckpoint`)
+    CHECKPOINT_ATTRS = DEFAULT_CHECKPOINT_ATTRS
 
     def __init__(self, sim: HdlSimulator, hwIO, allowNoReset=False):
         self.hwIO = hwIO
@@ -50,3 +119,41 @@ class SyncAgentBase(AgentWitReset, pcSyncAgentBase):
         pcSyncAgentBase.__init__(
             self, sim, hwIO, clk, rst)
 
+    def _wakeUpIdleProcesses(self):
+        """
+        Wake up suspended processes of this agent (if :attr:`~.IDLE_AWARE_PROCESSES` is used)
+        """
+        for p in (self.driver, self.monitor):
+            if isinstance(p, OnRisingCallbackLoopIdleAware):
+                p.wakeUp()
+
+    def _idleAwareLoop(self, loop: OnRisingCallbackLoop, isIdleFn: Callable[[], bool]) -> OnRisingCallbackLoop:
+        """
+        Replace the callback loop with its idle aware variant if :attr:`~.IDLE_AWARE_PROCESSES` is used
+        """
+        if self.IDLE_AWARE_PROCESSES:
+            return OnRisingCallbackLoopIdleAware(self.sim, loop.sig, loop.fn, loop.shouldBeEnabledFn, isIdleFn)
+        else:
+            return loop
+
+    def _newDataQueue(self) -> deque:
+        """
+        :return: deque for data of this agent, if :attr:`~.IDLE_AWARE_PROCESSES` is used
+            the deque wakes up idle processes when data is added
+        """
+        if self.IDLE_AWARE_PROCESSES:
+            return NotifyingDeque(onAppend=self._wakeUpIdleProcesses)
+        else:
+            return deque()
+
+    def _getCheckpointState(self) -> Dict[str, Any]:
+        """
+        :return: copy of the data of this agent (:attr:`~.CHECKPOINT_ATTRS`)
+        """
+        return getAgentCheckpointState(self, self.CHECKPOINT_ATTRS)
+
+    def _setCheckpointState(self, state: Dict[str, Any]):
+        """
+        Load the data from :meth:`~._getCheckpointState`
+        """
+        setAgentCheckpointState(self, state)
@@ -1,4 +1,7 @@
+from typing import Optional, Callable, Generator
+
 from hwt.doc_markers import internal
+from hwt.hwIO import HwIO
 from hwt.constants import INTF_DIRECTION
 from hwt.hwModule import HwModule
 from hwtSimApi.hdlSimulator import HdlSimulator
@@ -20,7 +23,11 @@ def autoAddAgents(module: HwModule, sim: HdlSimulator):
 
 
 @internal
-def collect_processes_from_sim_agents(module: HwModule):
+def collect_processes_from_sim_agents(module: HwModule, wrapProc: Optional[Callable[[Generator, HwIO], Generator]]=None):
+    """
+    :param wrapProc: optional function (process, interface) -> process which is applied on every process
+        (e.g. :meth:`hwt.simulator.profiler.SimProfiler.wrapAgentProcess`)
+    """
     proc = []
     for hio in module._hwIOs:
         a = hio._ag
@@ -34,6 +41,8 @@ def collect_processes_from_sim_agents(module: HwModule):
         else:
             raise NotImplementedError(f"hio._direction {hio._direction} for {hio}")
 
+        if wrapProc is not None:
+            agProcs = [wrapProc(p, hio) for p in agProcs]
         proc.extend(agProcs)
 
     return proc
@@ -0,0 +1,137 @@
+import pickle
+from typing import Dict, Tuple, Any, Union
+
+from hwt.doc_markers import internal
+from hwt.hObjList import HObjList
+from hwt.hwModule import HwModule
+from hwt.mainBases import HwIOBase
+from hwt.simulator.agentBase import DEFAULT_CHECKPOINT_ATTRS, \
+    getAgentCheckpointState, setAgentCheckpointState
+from hwtSimApi.basic_hdl_simulator.model import BasicRtlSimModel
+from hwtSimApi.basic_hdl_simulator.rtlSimulator import BasicRtlSimulator
+from hwtSimApi.hdlSimulator import HdlSimulator
+
+
+@internal
+def _walkSimModelSignals(model: BasicRtlSimModel, path: Tuple[int, ...]):
+    """
+    :return: generator of tuples (key, signal proxy) for all signals in model and its sub models
+    """
+    for s in model._hwIOs:
+        yield (path, s.name), s
+    for i, sm in enumerate(model._subHwModules):
+        yield from _walkSimModelSignals(sm, (*path, i))
+
+
+@internal
+def _walkAgents(obj: Union[HwModule, HwIOBase]):
+    """
+    :return: generator of tuples (name of interface, agent) for all agents in the object
+    """
+    if isinstance(obj, HObjList):
+        for item in obj:
+            yield from _walkAgents(item)
+        return
+
+    if isinstance(obj, HwIOBase):
+        ag = obj._ag
+        if ag is not None:
+            yield obj._getFullName(), ag
+
+    for hio in obj._hwIOs:
+        yield from _walkAgents(hio)
+
+
+@internal
+def _agentState(agent) -> Dict[str, Any]:
+    """
+    :return: copy of the data of the agent (:meth:`hwt.simulator.agentBase.SyncAgentBase._getCheckpointState`)
+    """
+    getState = getattr(agent, "_getCheckpointState", None)
+    if getState is None:
+        # agent from hwtSimApi
+        return getAgentCheckpointState(agent, DEFAULT_CHECKPOINT_ATTRS)
+    return getState()
+
+
+@internal
+def _setAgentState(agent, state: Dict[str, Any]):
+    setState = getattr(agent, "_setCheckpointState", None)
+    if setState is None:
+        setAgentCheckpointState(agent, state)
+    else:
+        setState(state)
+
+
+class SimCheckpoint():
+    """
+    Snapshot of the simulation state which can be used to continue the simulation
+    in a new instance of the simulator (e.g. to share the reset and initialization phase
+    between several tests).
+
+    :ivar ~.time: simulation time when the checkpoint was taken
+    :ivar ~.signals: dictionary (sub model index path, signal name): value of the signal
+    :ivar ~.agents: dictionary name of the interface: dictionary attribute name: value
+        (a copy of data of the agent, e.g. data, mem, _enabled)
+
+    :note: Only values are stored. The simulation processes (including processes of agents)
+        are restarted in the restored simulation. Because of this the checkpoint should be taken
+        while the processes are in their idle state (e.g. right before the clock edge)
+        and processes in SimTestCase.procs have to be added again.
+    """
+
+    def __init__(self, time: int,
+                 signals: Dict[Tuple[Tuple[int, ...], str], Any],
+                 agents: Dict[str, Dict[str, Any]]):
+        self.time = time
+        self.signals = signals
+        self.agents = agents
+
+    @classmethod
+    def capture(cls, rtl_simulator: BasicRtlSimulator, hdl_simulator: HdlSimulator,
+                dut: HwModule) -> "SimCheckpoint":
+        """
+        Create a checkpoint from actual state of the simulation (after HdlSimulator.run() ended)
+        """
+        signals = {k: s.val.__copy__()
+                   for k, s in _walkSimModelSignals(rtl_simulator.model, ())}
+        agents = {name: _agentState(ag) for name, ag in _walkAgents(dut)}
+        return cls(hdl_simulator.now, signals, agents)
+
+    def restore(self, rtl_simulator: BasicRtlSimulator, hdl_simulator: HdlSimulator,
+                dut: HwModule):
+        """
+        Load the state to a new simulator (before HdlSimulator.run() was called)
+        """
+        assert hdl_simulator.now == 0 and rtl_simulator.needs_init, (
+            "The checkpoint can be restored only into a new simulator")
+        signals = self.signals
+        for k, s in _walkSimModelSignals(rtl_simulator.model, ()):
+            v = signals[k]
+            s.val = v.__copy__()
+            s.val_next = None
+
+        # all signals have value from checkpoint, the initialization with default values
+        # and the evaluation of all processes is not required
+        rtl_simulator.needs_init = False
+        rtl_simulator.time = hdl_simulator.now = self.time
+
+        for name, ag in _walkAgents(dut):
+            _setAgentState(ag, self.agents[name])
+
+    def save(self, file_name: str):
+        """
+        Store checkpoint to a file
+        """
+        with open(file_name, "wb") as f:
+            pickle.dump(self, f)
+
+    @classmethod
+    def load(cls, file_name: str) -> "SimCheckpoint":
+        """
+        Load checkpoint from a file
+        """
+        with open(file_name, "rb") as f:
+            c = pickle.load(f)
+        assert isinstance(c, cls), c
+        return c
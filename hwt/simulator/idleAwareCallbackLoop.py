@@ -0,0 +1,128 @@
+from collections import deque
+from copy import deepcopy
+from typing import Callable, Optional
+
+from hwtSimApi.process_utils import OnRisingCallbackLoop, ExitCallbackLoop
+from hwtSimApi.triggers import Action, Edge, WaitCombRead
+
+
+class NotifyingDeque(deque):
+    """
+    A deque which calls onAppend() when an item is added
+    (used to wake up idle agent processes when new data is available)
+
+    :note: copy/deepcopy/pickle produces a plain deque
+    """
+
+    def __init__(self, iterable=(), onAppend: Optional[Callable[[], None]]=None):
+        super(NotifyingDeque, self).__init__(iterable)
+        self.onAppend = onAppend
+
+    def _notify(self):
+        onAppend = self.onAppend
+        if onAppend is not None:
+            onAppend()
+
+    def append(self, x):
+        super(NotifyingDeque, self).append(x)
+        self._notify()
+
+    def appendleft(self, x):
+        super(NotifyingDeque, self).appendleft(x)
+        self._notify()
+
+    def extend(self, iterable):
+        super(NotifyingDeque, self).extend(iterable)
+        self._notify()
+
+    def extendleft(self, iterable):
+        super(NotifyingDeque, self).extendleft(iterable)
+        self._notify()
+
+    def insert(self, i, x):
+        super(NotifyingDeque, self).insert(i, x)
+        self._notify()
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __copy__(self):
+        return deque(self)
+
+    def __deepcopy__(self, memo):
+        return deque(deepcopy(list(self), memo))
+
+    def __reduce__(self):
+        return (deque, (list(self),))
+
+
+class WaitWakeUp(Action):
+    """
+    Suspend the process until :meth:`OnRisingCallbackLoopIdleAware.wakeUp` is called
+    """
+
+    def __init__(self, loop: "OnRisingCallbackLoopIdleAware"):
+        self.loop = loop
+
+    def applyProcess(self, sim, process):
+        self.loop._parked = process
+        return False
+
+
+class OnRisingCallbackLoopIdleAware(OnRisingCallbackLoop):
+    """
+    :class:`hwtSimApi.process_utils.OnRisingCallbackLoop` which does not wait on every clock edge
+    if there is nothing to do. If the loop is disabled or isIdleFn() returns True
+    the process is suspended until wakeUp() is called. The wake up takes the effect
+    on the first rising edge of the clock after the call of wakeUp().
+
+    :ivar ~.isIdleFn: function() -> bool, returns True if the callback would do nothing
+        until some external event (e.g. new data is added to agent)
+    :ivar ~._parked: the suspended process or None
+    """
+
+    def __init__(self, sim: "HdlSimulator", sig: "RtlSignal", fn, shouldBeEnabledFn,
+                 isIdleFn: Callable[[], bool]):
+        super(OnRisingCallbackLoopIdleAware, self).__init__(sim, sig, fn, shouldBeEnabledFn)
+        self.isIdleFn = isIdleFn
+        self._parked = None
+
+    def setEnable(self, en):
+        super(OnRisingCallbackLoopIdleAware, self).setEnable(en)
+        if en:
+            self.wakeUp()
+
+    def wakeUp(self):
+        """
+        Resume the suspended process on next edge of the clock signal
+        """
+        p = self._parked
+        if p is not None:
+            self._parked = None
+            self.sig.wait(p)
+
+    def _isIdle(self) -> bool:
+        return not self._enable or not self.shouldBeEnabledFn() or self.isIdleFn()
+
+    def __call__(self):
+        self._parked = None
+        try:
+            if self.pre_init:
+                yield from self.fn()
+
+            while True:
+                if self._isIdle():
+                    yield WaitWakeUp(self)
+                else:
+                    yield Edge(self.sig)
+
+                if self._enable and self.shouldBeEnabledFn():
+                    yield WaitCombRead()
+                    if int(self.sig.read()) == 1:
+                        if self.isGenerator:
+                            yield from self.fn()
+                        else:
+                            self.fn()
+        except ExitCallbackLoop:
+            pass
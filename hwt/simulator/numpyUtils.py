@@ -0,0 +1,361 @@
+"""
+Bulk conversions between simulation values of array type and NumPy arrays.
+
+The values of array signals in simulation (:class:`pyMathBitPrecise.array3t.Array3val`,
+:class:`hwt.hdl.types.arrayConst.HArrayConst`) are stored as a dictionary {index: item value}.
+Functions in this module load/read whole memories at once from/to a pair of NumPy arrays
+(values, validity masks) so the user does not have to construct a HConst for every item manually.
+The arrays may also be :class:`numpy.memmap` instances which allows for preload and dump
+of large memories from/to files.
+
+There are also batch conversions of agent data to/from NumPy structured arrays
+(with a value and a validity mask field for each data signal).
+
+:note: NumPy is an optional dependency (extra "numpy" of the hwt package) and it is imported
+    only when some function from this module is used.
+"""
+from typing import Optional, Tuple, Union, Dict, Sequence, List
+
+from hwt.doc_markers import internal
+from hwt.hdl.const import HConst
+from hwtSimApi.basic_hdl_simulator.proxy import BasicRtlSimProxy
+from pyMathBitPrecise.bit_utils import to_signed
+from pyMathBitPrecise.bits3t import Bits3val
+
+
+@internal
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("NumPy is required for bulk operations with simulation arrays"
+                          " (install it using: pip install hwt[numpy])", e)
+    return numpy
+
+
+def numpyDtypeForBitWidth(width: int):
+    """
+    :return: smallest unsigned NumPy dtype which can hold the value of specified width,
+        object dtype (python ints) for values wider than 64b
+    """
+    np = _import_numpy()
+    for t in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if width <= np.dtype(t).itemsize * 8:
+            return np.dtype(t)
+    return np.dtype(object)
+
+
+@internal
+def _resolveArrayStorage(arr) -> Tuple[object, Dict[int, object]]:
+    """
+    :return: tuple (array type, dictionary with items)
+    """
+    if isinstance(arr, BasicRtlSimProxy):
+        arr = arr.val
+    return arr._dtype, arr.val
+
+
+def arrayValueToNumpy(arr, out: Optional["numpy.ndarray"]=None,
+                      out_vld: Optional["numpy.ndarray"]=None) -> Tuple["numpy.ndarray", "numpy.ndarray"]:
+    """
+    Convert value of array type to a pair of NumPy arrays
+
+    :param arr: instance of :class:`pyMathBitPrecise.array3t.Array3val`,
+        :class:`hwt.hdl.types.arrayConst.HArrayConst` or a simulation proxy of array signal
+    :param out: optional preallocated array for values (e.g. :class:`numpy.memmap`)
+    :param out_vld: optional preallocated array for validity masks
+    :return: tuple (values, validity masks), missing items are 0 with 0 validity mask
+    :note: the value is always unsigned representation of the item
+    """
+    np = _import_numpy()
+    t, items = _resolveArrayStorage(arr)
+    size = int(t.size)
+    dtype = numpyDtypeForBitWidth(t.element_t.bit_length())
+    if out is None:
+        out = np.zeros(size, dtype=dtype)
+    else:
+        assert out.shape[0] >= size, (out.shape, size)
+        out[:size] = 0
+
+    if out_vld is None:
+        out_vld = np.zeros(size, dtype=dtype)
+    else:
+        assert out_vld.shape[0] >= size, (out_vld.shape, size)
+        out_vld[:size] = 0
+
+    if items:
+        all_mask = t.element_t.all_mask()
+        indexes = np.fromiter(items.keys(), dtype=np.int64, count=len(items))
+        values = items.values()
+        out[indexes] = np.fromiter((int(v.val) & all_mask for v in values), dtype=dtype, count=len(items))
+        out_vld[indexes] = np.fromiter((int(v.vld_mask) for v in values), dtype=dtype, count=len(items))
+
+    return out, out_vld
+
+
+def numpyToArrayItems(element_t, values: "numpy.ndarray", vld_mask: Optional["numpy.ndarray"]=None,
+                      offset: int=0, dst: Optional[Dict[int, object]]=None) -> Dict[int, object]:
+    """
+    Convert NumPy array of ints to a dictionary of items {index: value of element_t}
+
+    :param element_t: type of the array item
+    :param values: array of values (unsigned representation of the item value)
+    :param vld_mask: optional array of validity masks, if None all items are valid
+    :param offset: index of the first item in dst
+    :param dst: optional dictionary where the items should be stored
+    :note: values of signed items are converted from the unsigned representation,
+        the items are the same as if they were constructed by element_t.from_py()
+    """
+    np = _import_numpy()
+    all_mask = element_t.all_mask()
+    if dst is None:
+        dst = {}
+
+    values = np.asarray(values)
+    if values.dtype.kind == "i" and values.size and values.min() < 0:
+        raise ValueError("Values have to be in unsigned representation", values.min())
+    _from_py = element_t._from_py
+    signed = element_t.signed
+    w = element_t.bit_length()
+    if vld_mask is None:
+        for i, v in enumerate(values.tolist(), offset):
+            if v & all_mask != v:
+                raise ValueError("Not enough bits to represent value", element_t, i, v)
+            if signed:
+                v = to_signed(v, w)
+            dst[i] = _from_py(v, all_mask)
+    else:
+        vld_mask = np.asarray(vld_mask)
+        assert vld_mask.shape == values.shape, (vld_mask.shape, values.shape)
+        for i, (v, m) in enumerate(zip(values.tolist(), vld_mask.tolist()), offset):
+            if v & all_mask != v or m & all_mask != m:
+                raise ValueError("Not enough bits to represent value", element_t, i, v, m)
+            if signed:
+                v = to_signed(v, w)
+                if m == all_mask:
+                    dst[i] = _from_py(v, m)
+                else:
+                    # normalized in the same way as if the value was constructed by the user
+                    dst[i] = element_t.from_py(v, m)
+            else:
+                dst[i] = _from_py(v & m, m)
+
+    return dst
+
+
+def loadSimArray(arr: Union[BasicRtlSimProxy, "Array3val", "HArrayConst"], values: "numpy.ndarray",
+                 vld_mask: Optional["numpy.ndarray"]=None, offset: int=0):
+    """
+    Bulk load the content of memory in simulation
+
+    :param arr: simulation proxy of the memory signal or the value of array type
+    :param values: array of values (unsigned representation of the item value)
+    :param vld_mask: optional array of validity masks, if None all items are valid
+    :param offset: index of the first loaded item in the memory
+
+    :attention: The value is updated in place and no simulation event is generated.
+        It is meant to be used for memory initialization before the simulation
+        or while the memory is not accessed.
+    """
+    t, items = _resolveArrayStorage(arr)
+    size = int(t.size)
+    if offset < 0 or offset + len(values) > size:
+        raise IndexError("Loaded data out of array bounds", offset, len(values), size)
+    numpyToArrayItems(t.element_t, values, vld_mask, offset=offset, dst=items)
+    if isinstance(arr, BasicRtlSimProxy):
+        arr = arr.val
+    # the array is valid only if all items are fully valid
+    arr.vld_mask = int(len(items) == size and all(v._is_full_valid() for v in items.values()))
+
+
+def readSimArray(arr: Union[BasicRtlSimProxy, "Array3val", "HArrayConst"]) -> Tuple["numpy.ndarray", "numpy.ndarray"]:
+    """
+    Bulk read the content of memory in simulation
+
+    :see: :func:`~.arrayValueToNumpy`
+    """
+    return arrayValueToNumpy(arr)
+
+
+def loadSimArrayFromFile(arr: Union[BasicRtlSimProxy, "Array3val", "HArrayConst"], fileName: str,
+                         vldFileName: Optional[str]=None, offset: int=0):
+    """
+    Load the content of memory from a raw binary file using :class:`numpy.memmap`
+    (the file is not loaded to RAM as a whole)
+
+    :param fileName: name of the file with values, the item type of the file
+        is resolved from the width of the array item (:func:`~.numpyDtypeForBitWidth`)
+    :param vldFileName: optional name of the file with validity masks
+    """
+    np = _import_numpy()
+    t, _ = _resolveArrayStorage(arr)
+    dtype = numpyDtypeForBitWidth(t.element_t.bit_length())
+    if dtype == np.dtype(object):
+        raise NotImplementedError("Memory mapped files are not supported for items wider than 64b")
+    values = np.memmap(fileName, dtype=dtype, mode="r")
+    if vldFileName is None:
+        vld_mask = None
+    else:
+        vld_mask = np.memmap(vldFileName, dtype=dtype, mode="r")
+    loadSimArray(arr, values, vld_mask, offset=offset)
+
+
+def dumpSimArrayToFile(arr: Union[BasicRtlSimProxy, "Array3val", "HArrayConst"], fileName: str,
+                       vldFileName: Optional[str]=None):
+    """
+    Dump the content of memory to a raw binary file using :class:`numpy.memmap`
+
+    :see: :func:`~.loadSimArrayFromFile`
+    """
+    np = _import_numpy()
+    t, _ = _resolveArrayStorage(arr)
+    size = int(t.size)
+    dtype = numpyDtypeForBitWidth(t.element_t.bit_length())
+    if dtype == np.dtype(object):
+        raise NotImplementedError("Memory mapped files are not supported for items wider than 64b")
+    values = np.memmap(fileName, dtype=dtype, mode="w+", shape=(size,))
+    if vldFileName is None:
+        vld_mask = None
+    else:
+        vld_mask = np.memmap(vldFileName, dtype=dtype, mode="w+", shape=(size,))
+    values, vld_mask = arrayValueToNumpy(arr, out=values, out_vld=vld_mask)
+    values.flush()
+    if vldFileName is not None:
+        vld_mask.flush()
+
+
+def numpyStructDtype(fields: Sequence[Tuple[str, "HdlType"]]) -> "numpy.dtype":
+    """
+    :param fields: sequence of tuples (name, type) for each data signal
+    :return: NumPy structured dtype with field "<name>" for the value and "<name>_vld"
+        for the validity mask of each data signal
+    """
+    np = _import_numpy()
+    np_fields = []
+    for name, t in fields:
+        dtype = numpyDtypeForBitWidth(t.bit_length())
+        np_fields.append((name, dtype))
+        np_fields.append((f"{name:s}_vld", dtype))
+    return np.dtype(np_fields)
+
+
+def valuesToNumpyStruct(values: Sequence[Union[HConst, Bits3val, Tuple[Union[HConst, Bits3val], ...]]],
+                        fields: Sequence[Tuple[str, "HdlType"]]) -> "numpy.ndarray":
+    """
+    Convert a sequence of values (e.g. data collected by agent) to a NumPy structured array
+    in a single pass
+
+    :param values: sequence of values, if there are multiple fields each item is a tuple of values
+        (int and None are accepted as a fully valid and invalid value)
+    :param fields: sequence of tuples (name, type) for each data signal (:func:`~.numpyStructDtype`)
+    :note: the values are stored in unsigned representation (same as in :func:`~.arrayValueToNumpy`)
+    """
+    np = _import_numpy()
+    dtype = numpyStructDtype(fields)
+    if len(fields) == 1:
+        values = ((v,) for v in values)
+    masks = tuple(t.all_mask() for _, t in fields)
+
+    rows = []
+    for item in values:
+        row = []
+        for v, m in zip(item, masks):
+            # signed values are stored in unsigned representation
+            if v is None:
+                row.append(0)
+                row.append(0)
+            elif isinstance(v, int):
+                row.append(v & m)
+                row.append(m)
+            else:
+                row.append(int(v.val) & m)
+                row.append(int(v.vld_mask))
+        rows.append(tuple(row))
+    return np.array(rows, dtype=dtype)
+
+
+def numpyStructToValues(arr: "numpy.ndarray", fields: Sequence[Tuple[str, "HdlType"]]) -> List[object]:
+    """
+    Convert NumPy array to a list of values for agent (inverse of :func:`~.valuesToNumpyStruct`)
+
+    :param arr: NumPy structured array with fields "<name>" and optionally "<name>_vld"
+        (if the validity field is missing the value is fully valid) or a plain array
+        of ints if there is only a single field
+    :return: list of values, fully valid values are ints (negative for signed types), fully invalid None,
+        if there are multiple fields each item is a tuple
+    """
+    np = _import_numpy()
+    arr = np.asarray(arr)
+    columns = []
+    for name, t in fields:
+        all_mask = t.all_mask()
+        if arr.dtype.names is None:
+            assert len(fields) == 1, ("Plain array can be used only for a single field", fields)
+            vals = arr.tolist()
+            vlds = None
+        else:
+            vals = arr[name].tolist()
+            vld_name = f"{name:s}_vld"
+            vlds = arr[vld_name].tolist() if vld_name in arr.dtype.names else None
+
+        if t.signed:
+            # convert from unsigned representation
+            w = t.bit_length()
+            vals = [to_signed(v, w) for v in vals]
+
+        if vlds is None:
+            col = vals
+        else:
+            col = []
+            for v, m in zip(vals, vlds):
+                if m == all_mask:
+                    col.append(v)
+                elif m == 0:
+                    col.append(None)
+                else:
+                    # from_py normalizes the signed value in the same way as if it was constructed by the user
+                    col.append(t.from_py(v if t.signed else v & m, m))
+        columns.append(col)
+
+    if len(columns) == 1:
+        return columns[0]
+    else:
+        return list(zip(*columns))
+
+
+@internal
+def _valueToIntOrNone(v):
+    if v is None or isinstance(v, int):
+        return v
+    elif v.vld_mask == v._dtype.all_mask():
+        return int(v)
+    else:
+        return None
+
+
+def valuesToNumpyWithValidity(values: Sequence[Union[HConst, Bits3val, int, None, Tuple]]) -> Tuple["numpy.ndarray", "numpy.ndarray"]:
+    """
+    Convert a sequence of values (or tuples of values) to a pair of NumPy arrays in a single pass
+
+    :return: tuple (values, validity flags), values which are not fully valid (or None)
+        have value 0 and validity False, if items are tuples arrays are 2D
+    :note: the value is converted using int() (signed values are negative ints)
+    """
+    np = _import_numpy()
+    if isinstance(values, np.ndarray) and values.dtype.names is None:
+        return values, np.ones(values.shape, dtype=bool)
+
+    vals = []
+    vlds = []
+    for item in values:
+        if isinstance(item, (tuple, list)):
+            row = [_valueToIntOrNone(v) for v in item]
+            vlds.append([v is not None for v in row])
+            vals.append([0 if v is None else v for v in row])
+        else:
+            v = _valueToIntOrNone(item)
+            vlds.append(v is not None)
+            vals.append(0 if v is None else v)
+
+    # :note: numpy automatically uses object dtype for ints which does not fit in to int64
+    return np.array(vals), np.array(vlds, dtype=bool)
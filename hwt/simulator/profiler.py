@@ -0,0 +1,177 @@
+from inspect import isgenerator
+import sys
+from time import perf_counter
+from typing import Dict, Tuple, Callable, Generator, Optional, TextIO
+
+from hwt.doc_markers import internal
+from hwtSimApi.basic_hdl_simulator.model import BasicRtlSimModel
+
+
+class SimProcessStat():
+    """
+    Statistics for a single simulation process
+
+    :ivar ~.path: tuple of names (module path and name of the process)
+    :ivar ~.count: number of evaluations of the process
+    :ivar ~.time: total time spent in the process [s]
+    """
+    __slots__ = ["path", "count", "time"]
+
+    def __init__(self, path: Tuple[str, ...]):
+        self.path = path
+        self.count = 0
+        self.time = 0.0
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__:s} {'/'.join(self.path):s} count:{self.count:d} time:{self.time:f}s>"
+
+
+class _ProfiledRtlProcess():
+    """
+    Wrapper of a process of the simulation model which measures its evaluation
+    """
+    __slots__ = ["proc", "stat", "__name__"]
+
+    def __init__(self, proc: Callable[[], None], stat: SimProcessStat):
+        self.proc = proc
+        self.stat = stat
+        self.__name__ = proc.__name__
+
+    def __call__(self):
+        t = perf_counter()
+        self.proc()
+        stat = self.stat
+        stat.time += perf_counter() - t
+        stat.count += 1
+
+
+class SimProfiler():
+    """
+    Collects number of evaluations and time spent in processes of the simulation model
+    (RTL processes generated from :class:`hwt.hdl.statements.codeBlockContainer.HdlStmCodeBlockContainer`)
+    and in simulation processes of agents and user
+
+    Usage:
+
+    .. code-block:: python
+
+        profiler = SimProfiler()
+        rtl_simulator = rtl_simulator_cls(profiler=profiler)
+        ...
+        hdl_simulator.run(until, extraProcesses=[profiler.wrapProcess(p, ("user", p.__name__)) for p in procs])
+        profiler.report()
+
+    :note: :class:`hwt.simulator.simTestCase.SimTestCase` does this automatically if PROFILE_SIM is True
+
+    :ivar ~.stats: dictionary path: statistics
+    """
+    RTL_PREFIX = "rtl"
+    AGENT_PREFIX = "agents"
+
+    def __init__(self):
+        self.stats: Dict[Tuple[str, ...], SimProcessStat] = {}
+
+    def _getStat(self, path: Tuple[str, ...]) -> SimProcessStat:
+        try:
+            return self.stats[path]
+        except KeyError:
+            s = self.stats[path] = SimProcessStat(path)
+            return s
+
+    @internal
+    def _instrumentSimModel(self, model: BasicRtlSimModel, path: Tuple[str, ...], replacements: dict):
+        path = (*path, model._name if model._name is not None else model.__class__.__name__)
+        for p in model._processes:
+            replacements[p] = _ProfiledRtlProcess(p, self._getStat((*path, p.__name__)))
+
+        model._processes = tuple(replacements.get(p, p) for p in model._processes)
+        model._outputs = {replacements.get(p, p): o for p, o in model._outputs.items()}
+        for sm in model._subHwModules:
+            self._instrumentSimModel(sm, path, replacements)
+
+    @internal
+    def _replaceSensitivity(self, model: BasicRtlSimModel, replacements: dict):
+        for s in model._hwIOs:
+            for procs in (s.simSensProcs, s.simRisingSensProcs, s.simFallingSensProcs):
+                for p in tuple(procs):
+                    r = replacements.get(p, None)
+                    if r is not None:
+                        procs.remove(p)
+                        procs.add(r)
+        for sm in model._subHwModules:
+            self._replaceSensitivity(sm, replacements)
+
+    def instrumentSimModel(self, model: BasicRtlSimModel):
+        """
+        Wrap all processes of the simulation model so the evaluations are measured
+
+        :attention: has to be called before the model is bound to the simulator
+        """
+        replacements = {}
+        self._instrumentSimModel(model, (self.RTL_PREFIX,), replacements)
+        self._replaceSensitivity(model, replacements)
+
+    def wrapProcess(self, proc: Generator, path: Tuple[str, ...]) -> Generator:
+        """
+        Wrap simulation process (generator) so the time spent in it is measured,
+        the processes spawned by this process are accounted to the same path
+        """
+        stat = self._getStat(path)
+        return self._profiledProcess(proc, stat)
+
+    @internal
+    def _profiledProcess(self, proc: Generator, stat: SimProcessStat):
+        while True:
+            t = perf_counter()
+            try:
+                ev = next(proc)
+            except StopIteration:
+                stat.time += perf_counter() - t
+                stat.count += 1
+                return
+            stat.time += perf_counter() - t
+            stat.count += 1
+            if isgenerator(ev):
+                ev = self._profiledProcess(ev, stat)
+            yield ev
+
+    def wrapAgentProcess(self, proc: Generator, hwIO: "HwIO") -> Generator:
+        """
+        :see: :meth:`~.wrapProcess`
+        """
+        return self.wrapProcess(proc, (self.AGENT_PREFIX, hwIO._getFullName(), proc.__qualname__))
+
+    def report(self, sort_by: str="time", limit: Optional[int]=None, file: TextIO=sys.stdout):
+        """
+        Print a table with statistics of processes
+
+        :param sort_by: "time", "count" or "path"
+        :param limit: max number of printed processes
+        """
+        if sort_by == "path":
+            stats = sorted(self.stats.values(), key=lambda s: s.path)
+        elif sort_by in ("time", "count"):
+            stats = sorted(self.stats.values(), key=lambda s: getattr(s, sort_by), reverse=True)
+        else:
+            raise ValueError(sort_by)
+
+        if limit is not None:
+            stats = stats[:limit]
+
+        total = sum(s.time for s in self.stats.values())
+        file.write(f"{'time [s]':>12s} {'%':>6s} {'count':>10s} {'per call [us]':>14s}  process\n")
+        for s in stats:
+            per_call = s.time / s.count * 1e6 if s.count else 0.0
+            percent = s.time / total * 100 if total else 0.0
+            file.write(f"{s.time:12.6f} {percent:6.2f} {s.count:10d} {per_call:14.3f}  {'/'.join(s.path):s}\n")
+
+    def dumpCollapsed(self, file: TextIO):
+        """
+        Write statistics in "collapsed stack" format (a line "path;of;process <time in us>"),
+        which can be used to generate a flamegraph (e.g. flamegraph.pl, speedscope)
+        """
+        for s in sorted(self.stats.values(), key=lambda s: s.path):
+            t = int(round(s.time * 1e6))
+            if t:
+                file.write(";".join(p.replace(";", "_").replace(" ", "_") for p in s.path))
+                file.write(f" {t:d}\n")
@@ -1,10 +1,12 @@
 from datetime import datetime
+from heapq import heappush, heappop
 import importlib
 from io import StringIO
+from itertools import count
 import os
 import sys
 from types import ModuleType
-from typing import Union, Optional, Set, Tuple, Callable
+from typing import Union, Optional, Set, Tuple, Callable, Dict
 
 from hwt.doc_markers import internal
 from hwt.hdl.const import HConst
@@ -13,9 +15,11 @@ from hwt.hdl.types.enum import HEnum
 from hwt.hwIO import HwIO
 from hwt.hwModule import HwModule
 from hwt.mainBases import RtlSignalBase
+from hwt.serializer.combLoopAnalyzer.tarjan import StronglyConnectedComponentSearchTarjan
 from hwt.serializer.serializer_filter import SerializerFilterDoNotExclude
 from hwt.serializer.simModel import SimModelSerializer
-from hwt.serializer.store_manager import SaveToStream, SaveToFilesFlat
+from hwt.serializer.store_manager import SaveToStream, SaveToFilesFlatBuffered
+from hwt.simulator.profiler import SimProfiler
 from hwt.synth import to_rtl
 from hwt.synthesizer.dummyPlatform import DummyPlatform
 from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
@@ -33,30 +37,171 @@ from pyMathBitPrecise.bits3t import Bits3t
 from pyMathBitPrecise.enum3t import Enum3t
 
 
+@internal
+def _flattenSimModelCollect(model: BasicRtlSimModel,
+                            processes: list, outputs: dict):
+    """
+    Move processes of all sub models to lists of the top model
+    and remove port signals which are just aliases of the parent signals.
+    """
+    processes.extend(model._processes)
+    outputs.update(model._outputs)
+    for sm in model._subHwModules:
+        # the ports of sub model were replaced by the parent signals in connectSimPort(),
+        # the signal has to be initialized only once in the model which owns it
+        sm._hwIOs = tuple(s for s in sm._hwIOs if s.parent is sm)
+        _flattenSimModelCollect(sm, processes, outputs)
+        sm._processes = ()
+        sm._outputs = {}
+
+
+def flattenSimModel(model: BasicRtlSimModel):
+    """
+    Flatten the hierarchy of the simulation model so all processes
+    are evaluated as a part of the top model.
+
+    :note: The sub models are kept as attributes of the parent model
+        and the signals stay in the model where they were declared,
+        this is required for the name resolution during the waveform registration.
+    :note: The port signals of sub models are already replaced by the signals of the parent
+        in :func:`hwtSimApi.basic_hdl_simulator.model_utils.connectSimPort`,
+        there is nothing to resolve in processes.
+    """
+    processes = []
+    outputs = {}
+    _flattenSimModelCollect(model, processes, outputs)
+    model._processes = tuple(processes)
+    model._outputs = outputs
+
+
+def simModelProcessRanks(proc_outputs: Dict[Callable, Tuple[BasicRtlSimProxy, ...]]) -> Dict[Callable, int]:
+    """
+    Levelize processes of the simulation model. The process which drives an input
+    of other process has lower rank than the driven process.
+    Processes in a combinational loop share the same rank.
+
+    :param proc_outputs: dictionary process: output signals
+    :return: dictionary process: rank
+    """
+    g = {}
+    for proc, outputs in proc_outputs.items():
+        succ = g[proc] = []
+        for o in outputs:
+            succ.extend(o.simSensProcs)
+
+    sccs = list(StronglyConnectedComponentSearchTarjan(g).search_strongly_connected_components())
+    # the SCC search yields the components in reversed topological order
+    ranks = {}
+    for rank, scc in enumerate(reversed(sccs)):
+        for proc in scc:
+            ranks[proc] = rank
+    return ranks
+
+
 class BasicRtlSimulatorWithSignalRegisterMethods(BasicRtlSimulator):
+    """
+    :ivar ~.flatten: if True the hierarchy of the simulation model is flattened
+        on instantiation of the simulator (:func:`~.flattenSimModel`)
+    :ivar ~.profiler: optional :class:`hwt.simulator.profiler.SimProfiler` used for this simulator instance
+    :ivar ~.static_scheduling: if True the combinational processes are evaluated
+        in the order resolved by :func:`~.simModelProcessRanks` and the updates of the signals
+        are applied immediately after the evaluation of the process,
+        this avoids redundant re-evaluation of the processes in long combinational chains
+    """
     supported_type_classes = tuple()
 
-    def __init__(self, model_cls, synthesised_unit):
+    def __init__(self, model_cls, synthesised_unit, flatten=False, static_scheduling=False):
         """
         Only store variables for later construction
         """
         self.model_cls = model_cls
         self.synthesised_unit = synthesised_unit
+        self.flatten = flatten
+        self.static_scheduling = static_scheduling
+        self.profiler = None
         self.wave_writer = None
         self._obj2scope = {}
         self._traced_signals = set()
 
-    def __call__(self) -> "BasicRtlSimulatorVcd":
+    def __call__(self, profiler: Optional[SimProfiler]=None) -> "BasicRtlSimulatorVcd":
         """
         Create and initialize the BasicRtlSimulatorWithVCD object
+
+        :param profiler: optional profiler which will measure evaluations of processes of the model
         """
-        sim = self.__class__(self.model_cls, self.synthesised_unit)
+        sim = self.__class__(self.model_cls, self.synthesised_unit,
+                             self.flatten, self.static_scheduling)
         super(BasicRtlSimulatorWithSignalRegisterMethods, sim).__init__()
+        sim.profiler = profiler
         model = self.model_cls(sim)
         model._init_body()
+        if profiler is not None:
+            # before flattening to keep the hierarchy in names of processes
+            profiler.instrumentSimModel(model)
+        if self.flatten:
+            flattenSimModel(model)
         sim.bound_model(model)
         return sim
 
+    def bound_model(self, model: BasicRtlSimModel):
+        super(BasicRtlSimulatorWithSignalRegisterMethods, self).bound_model(model)
+        if self.static_scheduling:
+            self._proc_rank = simModelProcessRanks(self._proc_outputs)
+            # heap of tuples (rank, unique index, process)
+            self._comb_procs_queue = []
+            self._comb_procs_queue_index = count()
+
+    def _add_hdl_proc_to_run(self, trigger: Optional[BasicRtlSimProxy], proc) -> None:
+        if not self.static_scheduling:
+            return super(BasicRtlSimulatorWithSignalRegisterMethods, self)._add_hdl_proc_to_run(trigger, proc)
+
+        to_run = self._comb_procs_to_run
+        if proc in to_run:
+            return
+        super(BasicRtlSimulatorWithSignalRegisterMethods, self)._add_hdl_proc_to_run(trigger, proc)
+        if proc in to_run:
+            heappush(self._comb_procs_queue,
+                     (self._proc_rank[proc], next(self._comb_procs_queue_index), proc))
+
+    def _run_comb_processes(self) -> None:
+        """
+        Delta step for combinational processes
+        """
+        if not self.static_scheduling:
+            return super(BasicRtlSimulatorWithSignalRegisterMethods, self)._run_comb_processes()
+
+        to_run = self._comb_procs_to_run
+        queue = self._comb_procs_queue
+        proc_outputs = self._proc_outputs
+        mkUpdater = self._mkUpdater
+        addSp = self._seq_procs_to_run.add
+        while queue:
+            _, _, proc = heappop(queue)
+            # removed before evaluation so the process can be triggered again
+            # if it is in a combinational loop
+            to_run.remove(proc)
+            proc()
+            va = []
+            for sig in proc_outputs[proc]:
+                if sig.val_next is not None:
+                    updater, is_event_dependent = mkUpdater(sig.val_next)
+                    va.append((sig, updater, is_event_dependent, proc))
+                    sig.val_next = None
+                    # else value is latched
+
+            lav = self.logApplyingValues
+            if va and lav:
+                lav(self, va)
+
+            # the update is applied immediately, processes with a higher rank
+            # will see the updated value when they are evaluated
+            for s, vUpdater, isEventDependent, comesFrom in va:
+                if isEventDependent:
+                    # now=0 and this was process initialization or async reg
+                    addSp(comesFrom)
+                else:
+                    s._apply_update(vUpdater)
+
     def _init_listeners(self):
         self.logPropagation = False
         self.logApplyingValues = False
@@ -67,7 +212,9 @@ class BasicRtlSimulatorWithSignalRegisterMethods(BasicRtlSimulator):
               unique_name: str,
               build_dir: Optional[str],
               target_platform=DummyPlatform(),
-              do_compile=True) -> "BasicRtlSimulatorVcd":
+              do_compile=True,
+              flatten=False,
+              static_scheduling=False) -> "BasicRtlSimulatorVcd":
         """
         Create a hwtSimApi.basic_hdl_simulator based simulation model
         for specified unit and load it to python
@@ -77,6 +224,10 @@ class BasicRtlSimulatorWithSignalRegisterMethods(BasicRtlSimulator):
         :param target_platform: target platform for this synthesis
         :param build_dir: directory to store sim model build files,
             if None sim model will be constructed only in memory
+        :param flatten: if True the hierarchy of the model is flattened
+            into a single evaluation unit (:func:`~.flattenSimModel`)
+        :param static_scheduling: if True the combinational processes are evaluated
+            in the static order (:func:`~.simModelProcessRanks`)
         """
         if unique_name is None:
             unique_name = module._getDefaultName()
@@ -89,9 +240,9 @@ class BasicRtlSimulatorWithSignalRegisterMethods(BasicRtlSimulator):
             if not os.path.isabs(build_dir):
                 build_dir = os.path.join(os.getcwd(), build_dir)
             build_private_dir = os.path.join(build_dir, unique_name)
-            store_man = SaveToFilesFlat(SimModelSerializer,
-                                        build_private_dir,
-                                        _filter=_filter)
+            store_man = SaveToFilesFlatBuffered(SimModelSerializer,
+                                                build_private_dir,
+                                                _filter=_filter)
             store_man.module_path_prefix = unique_name
 
         to_rtl(module,
@@ -121,7 +272,8 @@ class BasicRtlSimulatorWithSignalRegisterMethods(BasicRtlSimulator):
 
         model_cls = simModule.__dict__[module._name]
         # can not use just function as it would get bounded to class
-        return cls(model_cls, module)
+        return cls(model_cls, module, flatten=flatten,
+                   static_scheduling=static_scheduling)
 
     @internal
     @staticmethod
@@ -1,10 +1,13 @@
 import os
 from random import Random
-from typing import Optional
+from typing import Optional, Union
 import unittest
 
 from hwt.simulator.agentConnector import autoAddAgents, \
     collect_processes_from_sim_agents
+from hwt.simulator.checkpoint import SimCheckpoint
+from hwt.simulator.numpyUtils import valuesToNumpyWithValidity
+from hwt.simulator.profiler import SimProfiler
 from hwt.simulator.rtlSimulatorVcd import BasicRtlSimulatorVcd
 from hwt.simulator.utils import reconnectHwModuleSignalsToModel, Bits3valToInt, \
     allHConstsToInts
@@ -49,10 +52,22 @@ class SimTestCase(unittest.TestCase):
     :ivar ~.RECOMPILE: if False the compilation of the simulation is dissabled.
         This is useful while debugging of the simulation because compilation of simulation
         may take significant amount of time and may not be required.
+    :ivar ~.FLATTEN_SIM_MODEL: if True the hierarchy of the simulation model is flattened
+        into a single evaluation unit (:func:`hwt.simulator.rtlSimulator.flattenSimModel`)
+    :ivar ~.STATIC_SCHEDULE_SIM_MODEL: if True the combinational processes of the simulation model
+        are evaluated in static order (:func:`hwt.simulator.rtlSimulator.simModelProcessRanks`)
+    :ivar ~.PROFILE_SIM: if True the evaluations of all simulation processes are measured
+        by :class:`hwt.simulator.profiler.SimProfiler` (stored in sim_profiler) and the statistics
+        are stored in DEFAULT_LOG_DIR in flamegraph "collapsed" format after runSim()
+    :ivar ~.sim_profiler: profiler of actual simulation (if PROFILE_SIM is True), created in restartSim()
     """
     # value chosen because in this position bits are changing frequently
     _defaultSeed = 317
     RECOMPILE = True
+    FLATTEN_SIM_MODEL = False
+    STATIC_SCHEDULE_SIM_MODEL = False
+    PROFILE_SIM = False
+    sim_profiler = None
     rtl_simulator_cls = None
     hdl_simulator = None
     DEFAULT_BUILD_DIR = None  # "tmp"
@@ -100,6 +115,35 @@ class SimTestCase(unittest.TestCase):
 
         self.assertSequenceEqual(seq1, seq2, msg, seq_type)
 
+    def assertValSequenceEqualBulk(self, seq1, seq2, msg=None, max_diff_report=10):
+        """
+        Same as :meth:`~.assertValSequenceEqual` for flat sequences (or sequences of tuples)
+        but the values are converted to NumPy arrays in a single pass
+        and compared as a whole. Suitable for long sequences.
+
+        :param seq1: sequence of values (e.g. data collected by agent)
+        :param seq2: sequence of expected ints, if item is None it is not checked
+        :param max_diff_report: max number of differences in the error message
+        """
+        v1, vld1 = valuesToNumpyWithValidity(seq1)
+        v2, vld2 = valuesToNumpyWithValidity(seq2)
+        if v1.shape != v2.shape:
+            self.fail(self._formatMessage(
+                msg, f"Sequences differ in shape (length) {v1.shape} != {v2.shape}"))
+
+        # None in seq2 is a wildcard, invalid value in seq1 does not match any int in seq2
+        diff = vld2 & (~vld1 | (v1 != v2))
+        if diff.ndim > 1:
+            diff = diff.any(axis=tuple(range(1, diff.ndim)))
+
+        if diff.any():
+            diff_indexes = diff.nonzero()[0]
+            lines = [f"Sequences differ in {len(diff_indexes):d} items of {len(diff):d}, first differences:", ]
+            for i in diff_indexes[:max_diff_report]:
+                i = int(i)
+                lines.append(f"    [{i:d}]: {allHConstsToInts(seq1[i])} != {seq2[i]}")
+            self.fail(self._formatMessage(msg, "\n".join(lines)))
+
     def getTestName(self):
         className, testName = self.id().split(".")[-2:]
         return f"{className:s}_{testName:s}"
@@ -123,11 +167,23 @@ class SimTestCase(unittest.TestCase):
                 os.makedirs(d, exist_ok=True)
 
             self.rtl_simulator.set_trace_file(outputFileName, -1)
-        procs = collect_processes_from_sim_agents(self.dut)
+        profiler = self.sim_profiler
+        if profiler is None:
+            procs = collect_processes_from_sim_agents(self.dut)
+            procs = self.procs + procs
+        else:
+            procs = collect_processes_from_sim_agents(self.dut, profiler.wrapAgentProcess)
+            procs = [profiler.wrapProcess(p, ("user", p.__qualname__)) for p in self.procs] + procs
+
         # run simulation, stimul processes are register after initial
         # initialization
-        self.hdl_simulator.run(until=until, extraProcesses=self.procs + procs)
+        self.hdl_simulator.run(until=until, extraProcesses=procs)
         self.rtl_simulator.finalize()
+
+        if profiler is not None and outputFileName is not None:
+            with open(os.path.splitext(outputFileName)[0] + ".folded", "w") as f:
+                profiler.dumpCollapsed(f)
+
         return self.hdl_simulator
 
     def randomize(self, hwIO):
@@ -153,7 +209,12 @@ class SimTestCase(unittest.TestCase):
             simulation processes
             )
         """
-        rtl_simulator = self.rtl_simulator_cls()
+        if self.PROFILE_SIM:
+            self.sim_profiler = SimProfiler()
+            rtl_simulator = self.rtl_simulator_cls(profiler=self.sim_profiler)
+        else:
+            self.sim_profiler = None
+            rtl_simulator = self.rtl_simulator_cls()
         hdl_simulator = HdlSimulator(rtl_simulator)
 
         dut = self.dut
@@ -165,6 +226,32 @@ class SimTestCase(unittest.TestCase):
 
         return dut, rtl_simulator, self.procs
 
+    def checkpointSim(self, file_name: Optional[str]=None) -> SimCheckpoint:
+        """
+        Take a snapshot of the state of the simulation (after runSim())
+
+        :param file_name: if specified the checkpoint is also stored to this file
+        :see: :class:`hwt.simulator.checkpoint.SimCheckpoint`
+        """
+        c = SimCheckpoint.capture(self.rtl_simulator, self.hdl_simulator, self.dut)
+        if file_name is not None:
+            c.save(file_name)
+        return c
+
+    def restoreSim(self, checkpoint: Union[SimCheckpoint, str]):
+        """
+        Restart the simulation and load the state from checkpoint
+
+        :param checkpoint: checkpoint or name of the file with the checkpoint
+        :note: self.procs are cleared, the processes have to be added again
+            before next call of runSim()
+        """
+        if isinstance(checkpoint, str):
+            checkpoint = SimCheckpoint.load(checkpoint)
+        self.restartSim()
+        checkpoint.restore(self.rtl_simulator, self.hdl_simulator, self.dut)
+        return self.dut, self.rtl_simulator, self.procs
+
     def rmSim(self):
         """
         Remove all buid sim objects from this object
@@ -218,7 +305,9 @@ class SimTestCase(unittest.TestCase):
             unique_name=unique_name,
             build_dir=build_dir,
             target_platform=target_platform,
-            do_compile=cls.RECOMPILE)
+            do_compile=cls.RECOMPILE,
+            flatten=cls.FLATTEN_SIM_MODEL,
+            static_scheduling=cls.STATIC_SCHEDULE_SIM_MODEL)
 
         if onAfterToRtl:
             onAfterToRtl(dut)
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from io import StringIO
+from typing import Optional
 
 from hwt.constraints import _get_absolute_path
 from hwt.hwModule import HwModule, HdlConstraintList
@@ -10,11 +11,13 @@ from hwt.serializer.store_manager import SaveToStream, StoreManager
 from hwt.serializer.vhdl import Vhdl2008Serializer
 from hwt.synthesizer.componentPath import ComponentPath
 from hwt.synthesizer.dummyPlatform import DummyPlatform
+from hwt.synthesizer.elaborationProfiler import ElaborationProfiler
 
 
 def to_rtl(hmodule_or_cls: HwModule, store_manager: StoreManager,
            name: str=None,
-           target_platform=DummyPlatform()):
+           target_platform=DummyPlatform(),
+           profiler: Optional[ElaborationProfiler]=None):
     """
     Convert unit to RTL using specified serializer
 
@@ -24,39 +27,50 @@ def to_rtl(hmodule_or_cls: HwModule, store_manager: StoreManager,
     :param target_platform: meta-informations about target platform, distributed
         on every unit under _target_platform attribute
         before HwModule.hwImpl() is called
+    :param profiler: optional profiler which collects the time and resource usage
+        of each phase of the elaboration for each module instance
     """
     if isinstance(hmodule_or_cls, HwModule):
         m = hmodule_or_cls
     else:
         m = hmodule_or_cls()
 
-    m._target_platform = target_platform
-    m._store_manager = store_manager
-    m._loadHwDeclarations()
-    if name is not None:
-        assert isinstance(name, str)
-        m._hdl_module_name = m._name = name
-
-    # serialize all unit instances to HDL code
-    constraints = HdlConstraintList()
-    for _, obj in m._to_rtl(target_platform, store_manager):
-        obj: HwModule
-        # collect constraints directly in current component
-        constraints.extend(obj._constraints)
-
-        if obj._shared_component_with:
-            # if the instance is shared with something else make
-            # the paths in constraints relative to a component
-            assert obj._shared_component_with[0]._shared_component_with is None
-            path_old = _get_absolute_path(obj._shared_component_with[0])
-            path_new = _get_absolute_path(obj)
-            for c in _HwModule_constraints_copy_recursively(
-                    obj, path_old, path_new):
-                constraints.append(c)
-
-    if constraints:
-        # serialize all constraints in design
-        store_manager.write(constraints)
+    if profiler is not None:
+        store_manager.profiler = profiler
+    profiler = store_manager.profiler
+
+    with profiler.phase(m, "to_rtl"):
+        m._target_platform = target_platform
+        m._store_manager = store_manager
+        with profiler.phase(m, "loadHwDeclarations"):
+            m._loadHwDeclarations()
+        if name is not None:
+            assert isinstance(name, str)
+            m._hdl_module_name = m._name = name
+
+        # serialize all unit instances to HDL code
+        constraints = HdlConstraintList()
+        for _, obj in m._to_rtl(target_platform, store_manager):
+            obj: HwModule
+            # collect constraints directly in current component
+            constraints.extend(obj._constraints)
+
+            if obj._shared_component_with:
+                # if the instance is shared with something else make
+                # the paths in constraints relative to a component
+                assert obj._shared_component_with[0]._shared_component_with is None
+                path_old = _get_absolute_path(obj._shared_component_with[0])
+                path_new = _get_absolute_path(obj)
+                for c in _HwModule_constraints_copy_recursively(
+                        obj, path_old, path_new):
+                    constraints.append(c)
+
+        if constraints:
+            # serialize all constraints in design
+            with profiler.phase(m, "write_constraints"):
+                store_manager.write(constraints)
+
+        store_manager.finalize()
 
     return store_manager
 
@@ -80,13 +94,14 @@ def _HwModule_constraints_copy_recursively(m: HwModule, path_orig: ComponentPath
 
 def to_rtl_str(hmodule_or_cls: HwModule,
                serializer_cls=Vhdl2008Serializer, name: str=None,
-               target_platform=DummyPlatform()):
+               target_platform=DummyPlatform(),
+               profiler: Optional[ElaborationProfiler]=None):
     """
     Generate HDL string and return it
     """
     buff = StringIO()
     store_manager = SaveToStream(serializer_cls, buff)
-    to_rtl(hmodule_or_cls, store_manager, name, target_platform)
+    to_rtl(hmodule_or_cls, store_manager, name, target_platform, profiler=profiler)
     return buff.getvalue()
 
 
@@ -104,15 +119,22 @@ def serializeAsIpcore(hmodule: HwModule, folderName=".", name=None,
     return p
 
 
-def synthesised(m: HwModule, target_platform=DummyPlatform()):
+def synthesised(m: HwModule, target_platform=DummyPlatform(),
+                profiler: Optional[ElaborationProfiler]=None):
     """
     Elaborate design without producing any HDL
     """
     sm = StoreManager(DummySerializerConfig,
                       _filter=SerializerFilterDoNotExclude())
-    if not hasattr(m, "_hwIOs"):
-        m._loadHwDeclarations()
+    if profiler is not None:
+        sm.profiler = profiler
+    profiler = sm.profiler
 
-    for _ in m._to_rtl(target_platform, sm):
-        pass
+    with profiler.phase(m, "synthesised"):
+        if not hasattr(m, "_hwIOs"):
+            with profiler.phase(m, "loadHwDeclarations"):
+                m._loadHwDeclarations()
+
+        for _ in m._to_rtl(target_platform, sm):
+            pass
     return m
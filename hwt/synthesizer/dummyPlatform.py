@@ -1,5 +1,6 @@
 from typing import List
 
+from hwt.serializer.resourceAnalyzer.costModel import ResourceCostModel
 from hwt.synthesizer.rtlLevel.extract_part_drivers import RtlNetlistPassExtractPartDrivers
 from hwt.synthesizer.rtlLevel.mark_visibility_of_signals_and_check_drivers import RtlNetlistPassMarkVisibilityOfSignalsAndCheckDrivers
 from hwt.synthesizer.rtlLevel.remove_unconnected_signals import RtlNetlistPassRemoveUnconnectedSignals
@@ -14,6 +15,8 @@ class DummyPlatform():
 
     :note: all processors has to be callable with only one parameter
         which is actual HwModule/RtlNetlist instance
+    :ivar ~.resourceCostModel: model used to convert the output of the resource analyzers
+        to the resources of the target device
     """
 
     def __init__(self):
@@ -27,3 +30,4 @@ class DummyPlatform():
             RtlNetlistPassMarkVisibilityOfSignalsAndCheckDrivers(),
         ]
         self.afterToRtl = []
+        self.resourceCostModel = ResourceCostModel()
@@ -0,0 +1,230 @@
+from collections import defaultdict
+import json
+import sys
+from time import perf_counter
+import tracemalloc
+from typing import List, Optional, Dict, TextIO
+
+from hwt.doc_markers import internal
+from hwt.hdl.operator import HOperatorNode
+
+
+class ElaborationPhaseRecord():
+    """
+    Record about a single phase of elaboration of a single module instance
+
+    :ivar ~.module: path of the module instance (names separated by "/")
+    :ivar ~.phase: name of the phase
+    :ivar ~.depth: nesting level of the phase (phases of sub modules are nested in phases of parent)
+    :ivar ~.start: time of the start of the phase relative to the start of the profiling [s]
+    :ivar ~.duration: wall time of the phase [s], including nested phases
+    :ivar ~.mem_delta: difference of traced memory after and before phase [B] (None if memory is not traced)
+    :ivar ~.mem_peak: peak of traced memory during the phase [B] (None if memory is not traced)
+    :ivar ~.counts: dictionary with number of objects (e.g. signals, statements, operators)
+    """
+    __slots__ = ["module", "phase", "depth", "start", "duration", "mem_delta", "mem_peak", "counts"]
+
+    def __init__(self, module: str, phase: str, depth: int, start: float):
+        self.module = module
+        self.phase = phase
+        self.depth = depth
+        self.start = start
+        self.duration = None
+        self.mem_delta = None
+        self.mem_peak = None
+        self.counts = {}
+
+    def as_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+class _ElaborationPhase():
+    """
+    Context manager which measures a phase of elaboration
+    """
+    __slots__ = ["profiler", "record", "_mem_start"]
+
+    def __init__(self, profiler: "ElaborationProfiler", record: ElaborationPhaseRecord):
+        self.profiler = profiler
+        self.record = record
+        self._mem_start = None
+
+    def __enter__(self):
+        p = self.profiler
+        if p.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                p._tracemalloc_started = True
+            self._mem_start = tracemalloc.get_traced_memory()[0]
+        p._depth += 1
+        self.record.start = perf_counter() - p._t0
+        return self.record
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        p = self.profiler
+        r = self.record
+        r.duration = perf_counter() - p._t0 - r.start
+        p._depth -= 1
+        if self._mem_start is not None:
+            cur, peak = tracemalloc.get_traced_memory()
+            r.mem_delta = cur - self._mem_start
+            r.mem_peak = peak
+        if p._depth == 0 and p._tracemalloc_started:
+            tracemalloc.stop()
+            p._tracemalloc_started = False
+
+
+class _NoElaborationPhase():
+    """
+    Context manager which does nothing (used if profiling is disabled)
+    """
+    __slots__ = []
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+_NO_ELABORATION_PHASE = _NoElaborationPhase()
+
+
+class NoElaborationProfiler():
+    """
+    Profiler used if profiling of elaboration is disabled
+    """
+
+    def phase(self, module: "HwModule", phase_name: str):
+        return _NO_ELABORATION_PHASE
+
+    def recordNetlistStats(self, record: Optional[ElaborationPhaseRecord], netlist: "RtlNetlist"):
+        pass
+
+
+NO_ELABORATION_PROFILER = NoElaborationProfiler()
+
+
+@internal
+def _modulePath(m: "HwModule") -> str:
+    path = []
+    while m is not None:
+        n = m._name
+        path.append(n if n is not None else m.__class__.__name__)
+        m = m._parent
+    return "/".join(reversed(path))
+
+
+class ElaborationProfiler(NoElaborationProfiler):
+    """
+    Collects a wall time, object counts and memory deltas for each phase of the elaboration
+    of each module instance (:meth:`hwt.hwModule.HwModule._to_rtl`).
+
+    Usage:
+
+    .. code-block:: python
+
+        p = ElaborationProfiler()
+        to_rtl_str(MyTop(), profiler=p)
+        p.report()
+        with open("trace.json", "w") as f:
+            p.dumpChromeTrace(f) # open in chrome://tracing or https://ui.perfetto.dev/
+
+    :ivar ~.trace_memory: if True the memory is traced using tracemalloc
+        (significantly slows down the elaboration)
+    :ivar ~.records: list of records in order of the start of the phase
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.records: List[ElaborationPhaseRecord] = []
+        self._t0 = perf_counter()
+        self._depth = 0
+        self._tracemalloc_started = False
+
+    def phase(self, module: "HwModule", phase_name: str) -> _ElaborationPhase:
+        """
+        :return: context manager which measures the phase, its __enter__ returns :class:`~.ElaborationPhaseRecord`
+        """
+        r = ElaborationPhaseRecord(_modulePath(module), phase_name, self._depth, None)
+        self.records.append(r)
+        return _ElaborationPhase(self, r)
+
+    def recordNetlistStats(self, record: Optional[ElaborationPhaseRecord], netlist: "RtlNetlist"):
+        """
+        Store number of signals, statements and operators of the netlist in the record
+        """
+        operators = 0
+        for s in netlist.signals:
+            for d in s.drivers:
+                if isinstance(d, HOperatorNode):
+                    operators += 1
+        record.counts.update(
+            signals=len(netlist.signals),
+            statements=len(netlist.statements),
+            operators=operators,
+            subHwModules=len(netlist.subHwModules),
+        )
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        :return: dictionary phase name: {"count": number of records, "duration": total duration [s]}
+            (nested phases of the same name are accounted only once)
+        """
+        res = defaultdict(lambda: {"count": 0, "duration": 0.0})
+        open_phases = []
+        for r in self.records:
+            # records are in order of start, the nested phases of same name are not counted twice
+            while open_phases and open_phases[-1].depth >= r.depth:
+                open_phases.pop()
+            s = res[r.phase]
+            s["count"] += 1
+            if not any(p.phase == r.phase for p in open_phases):
+                s["duration"] += r.duration
+            open_phases.append(r)
+        return dict(res)
+
+    def report(self, file: TextIO=sys.stdout, limit: Optional[int]=None):
+        """
+        Print a summary per phase and the slowest phases of module instances
+        """
+        file.write(f"{'phase':40s} {'count':>8s} {'time [s]':>12s}\n")
+        for name, s in sorted(self.summary().items(), key=lambda x: x[1]["duration"], reverse=True):
+            file.write(f"{name:40s} {s['count']:8d} {s['duration']:12.6f}\n")
+
+        file.write("\n")
+        records = sorted(self.records, key=lambda r: r.duration, reverse=True)
+        if limit is not None:
+            records = records[:limit]
+        for r in records:
+            mem = "" if r.mem_delta is None else f" mem_delta:{r.mem_delta:d}B"
+            counts = "".join(f" {k:s}:{v:d}" for k, v in r.counts.items())
+            file.write(f"{r.duration:12.6f} {r.phase:s} {r.module:s}{mem:s}{counts:s}\n")
+
+    def toJson(self):
+        return [r.as_dict() for r in self.records]
+
+    def dumpJson(self, file: TextIO):
+        json.dump(self.toJson(), file, indent=2)
+
+    def dumpChromeTrace(self, file: TextIO):
+        """
+        Dump records in Chrome trace event format
+        """
+        events = []
+        for r in self.records:
+            args = dict(r.counts)
+            if r.mem_delta is not None:
+                args["mem_delta"] = r.mem_delta
+                args["mem_peak"] = r.mem_peak
+            events.append({
+                "name": f"{r.phase:s} {r.module:s}",
+                "cat": r.phase,
+                "ph": "X",
+                "ts": r.start * 1e6,
+                "dur": r.duration * 1e6,
+                "pid": 0,
+                "tid": 0,
+                "args": args,
+            })
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
@@ -337,8 +337,9 @@ class PropDeclrCollector(object):
             (some components can change interface by parametrization)
         """
         self._registerSubmodule(uName, u)
-        u._loadHwDeclarations()
         sm = self._store_manager
+        with sm.profiler.phase(u, "loadHwDeclarations"):
+            u._loadHwDeclarations()
         with WithNameScope(sm, sm.name_scope.parent):
             self._lazy_loaded.extend(u._to_rtl(
                 self._target_platform, self._store_manager))
@@ -0,0 +1,95 @@
+from itertools import chain
+from typing import Union
+
+from hwt.doc_markers import internal
+from hwt.hObjList import HObjList
+from hwt.hdl.portItem import HdlPortItem
+from hwt.hwIO import HwIO
+from hwt.hwModule import HwModule
+from hwt.pyUtils.setList import SetList
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
+
+
+@internal
+def _releaseRtlSignal(s: RtlSignal):
+    """
+    Disconnect the signal from everything except the ports of the components
+    """
+    s.drivers = SetList(d for d in s.drivers if isinstance(d, HdlPortItem))
+    s.endpoints = SetList(ep for ep in s.endpoints if isinstance(ep, HdlPortItem))
+    s._usedOps = {}
+    s._usedOpsAlias = {}
+    s.next = None
+
+
+@internal
+def _releaseHwIOSignals(hwIO: Union[HwIO, HObjList]):
+    if isinstance(hwIO, HObjList):
+        for item in hwIO:
+            _releaseHwIOSignals(item)
+        return
+
+    if hwIO._hwIOs:
+        for c in hwIO._hwIOs:
+            _releaseHwIOSignals(c)
+    else:
+        for s in (getattr(hwIO, "_sig", None), getattr(hwIO, "_sigInside", None)):
+            if isinstance(s, RtlSignal):
+                _releaseRtlSignal(s)
+
+
+class ReleaseNetlistAfterToRtl():
+    """
+    A callback for :attr:`hwt.synthesizer.dummyPlatform.DummyPlatform.afterToRtl`
+    which drops the netlist of the module (statements, internal signals, operators, HDL AST)
+    once the module was written by the store manager.
+    Only the :class:`hdlConvertorAst.hdlAst.HdlModuleDec` and the signals connected to ports
+    (without any drivers/endpoints except the ports) are kept, which is what the parent module
+    requires to instantiate this module. From the pipeline regions
+    (:class:`hwt.synthesizer.rtlLevel.insert_pipeline_registers.PipelineRegion`) only the latency is kept. With this the peak memory consumption of
+    :func:`hwt.synth.to_rtl` scales with the depth of the hierarchy instead of the size of the design.
+
+    .. code-block:: python
+
+        p = DummyPlatform()
+        p.afterToRtl.append(ReleaseNetlistAfterToRtl())
+        to_rtl(MyTop(), store_manager, target_platform=p)
+
+    :attention: The netlist is not available after :func:`hwt.synth.to_rtl`,
+        this makes this callback incompatible with anything which inspects
+        the elaborated module later (:class:`hwt.serializer.combLoopAnalyzer.CombLoopAnalyzer`,
+        :meth:`hwt.serializer.resourceAnalyzer.analyzer.ResourceAnalyzer.visit_HwModule`,
+        walking of signal drivers and endpoints). The analyzers which are used as a store manager/serializer
+        still work because they see the module before it is released.
+    """
+
+    def __call__(self, m: HwModule):
+        if m._shared_component_with is not None:
+            # does not have own netlist
+            return
+
+        ctx = m._ctx
+        for hwIO in chain(m._hwIOs, m._private_hwIOs):
+            _releaseHwIOSignals(hwIO)
+
+        # signals of this module connected to ports of the sub modules
+        for sm in m._subHwModules:
+            for hwIO in sm._hwIOs:
+                _releaseHwIOSignals(hwIO)
+            for pi in sm._ctx.hwModDec.ports:
+                pi: HdlPortItem
+                s = pi.getOuterSig()
+                if s is not None:
+                    _releaseRtlSignal(s)
+
+        # the regions may be still referenced by the user, only the latency is kept
+        for r in ctx.pipelineRegions:
+            r.outputs = []
+            r.registers = []
+            r.clk = r.rst = r.en = None
+        ctx.pipelineRegions = []
+
+        ctx.signals = set()
+        ctx.statements = set()
+        ctx.hwModDef = None
+        m._lazy_loaded = []
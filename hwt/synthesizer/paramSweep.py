@@ -0,0 +1,256 @@
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import os
+from itertools import product
+from time import perf_counter
+from typing import Type, Dict, Sequence, Optional, Callable, List, TextIO, Tuple
+
+from hwt.doc_markers import internal
+from hwt.hwModule import HwModule
+from hwt.serializer.resourceAnalyzer.hierarchical import ResourceAnalyzerHierarchical
+from hwt.serializer.resourceAnalyzer.resourceTypes import ResourceMUX, \
+    ResourceFF, ResourceLatch, ResourceRAM
+from hwt.serializer.serializer_config import DummySerializerConfig
+from hwt.serializer.serializer_filter import SerializerFilterDoNotExclude
+from hwt.serializer.store_manager import StoreManager
+from hwt.synthesizer.dummyPlatform import DummyPlatform
+
+
+@internal
+def _resourceKeyToStr(k) -> str:
+    """
+    Convert the key from the output of the resource analyzer to a string
+    (the keys contain objects which are not picklable)
+    """
+    if k is ResourceFF:
+        return "FF"
+    elif k is ResourceLatch:
+        return "Latch"
+    elif isinstance(k, ResourceRAM):
+        return repr(k)
+    elif k[0] is ResourceMUX:
+        _, width, inputs = k
+        return f"MUX_{width:d}b_{inputs:d}in"
+    else:
+        op, width = k
+        return f"{op.id:s}_{width:d}b"
+
+
+class _HwParamSweepSerializerFilter(SerializerFilterDoNotExclude):
+    """
+    Serializer filter which never replaces the top module
+    (the top of the previous configuration may be of the same class)
+    """
+
+    def do_serialize(self, module: HwModule) -> Tuple[bool, Optional[HwModule]]:
+        if module._parent is None:
+            return True, None
+        return super(_HwParamSweepSerializerFilter, self).do_serialize(module)
+
+
+class _HwParamSweepWorkerState():
+    """
+    State of the elaboration which is kept between the configurations processed in a single process
+
+    :ivar ~.filter: serializer filter which remembers the module bodies from previous elaborations,
+        the sub modules with :attr:`hwt.hwModule.HwModule._serializeDecision` (e.g. :func:`hwt.serializer.mode.serializeParamsUniq`)
+        reuse the body of the already elaborated instance with the same parameters
+    :ivar ~.analyzer: resource analyzer with the cache of the results for the module bodies
+        (only the bodies which may be reused are kept between configurations)
+    """
+
+    def __init__(self):
+        self.filter = _HwParamSweepSerializerFilter()
+        self.analyzer = ResourceAnalyzerHierarchical()
+
+
+_sweepWorkerState: Optional[_HwParamSweepWorkerState] = None
+
+
+@internal
+def _countNetlistObjects(m: HwModule) -> Tuple[int, int]:
+    """
+    :return: number of signals and statements in the whole hierarchy (all instances)
+    """
+    if m._shared_component_with is not None:
+        m, _, _ = m._shared_component_with
+    signals = len(m._ctx.signals)
+    statements = len(m._ctx.statements)
+    for sm in m._subHwModules:
+        s, st = _countNetlistObjects(sm)
+        signals += s
+        statements += st
+    return signals, statements
+
+
+@internal
+def _elaborateConfiguration(module_cls: Type[HwModule], params: Dict[str, object],
+                            target_platform: DummyPlatform, reuse_submodules: bool) -> dict:
+    """
+    Elaborate a single configuration and collect the metrics
+
+    :note: executed in the worker process
+    """
+    global _sweepWorkerState
+    if reuse_submodules:
+        if _sweepWorkerState is None:
+            _sweepWorkerState = _HwParamSweepWorkerState()
+        state = _sweepWorkerState
+    else:
+        state = _HwParamSweepWorkerState()
+
+    row = {"params": params, "error": None}
+    try:
+        t = perf_counter()
+        m = module_cls()
+        for name, v in params.items():
+            setattr(m, name, v)
+        m._loadHwDeclarations()
+        sm = StoreManager(DummySerializerConfig, _filter=state.filter)
+        for _ in m._to_rtl(target_platform, sm):
+            pass
+        row["elaboration_time"] = perf_counter() - t
+
+        signals, statements = _countNetlistObjects(m)
+        row["signals"] = signals
+        row["statements"] = statements
+        row["ports"] = {pi.name: pi.getInternSig()._dtype.bit_length() for pi in m._ctx.hwModDec.ports}
+
+        t = perf_counter()
+        a = state.analyzer
+        a.visit_HwModule(m)
+        resources = a.report()
+        row["analysis_time"] = perf_counter() - t
+        row["resources"] = {_resourceKeyToStr(k): v for k, v in resources.items()}
+        row["estimate"] = target_platform.resourceCostModel.estimate(resources).as_dict()
+    except Exception as e:
+        row["error"] = repr(e)
+    finally:
+        if state.analyzer.top is not None:
+            # keep only the results for the module bodies which may be reused by the filter
+            state.analyzer.releaseNotShared()
+
+    return row
+
+
+class HwParamSweep():
+    """
+    Elaborate the module for each combination of the parameter values
+    and collect metrics (elaboration time, signal and statement counts, widths of the ports,
+    output of :class:`hwt.serializer.resourceAnalyzer.hierarchical.ResourceAnalyzerHierarchical`
+    and its estimate by :attr:`hwt.synthesizer.dummyPlatform.DummyPlatform.resourceCostModel`).
+
+    .. code-block:: python
+
+        sweep = HwParamSweep(MyFifo, {"DATA_WIDTH": [8, 16, 32], "DEPTH": [4, 16, 64]})
+        rows = sweep.run()
+        with open("sweep.csv", "w") as f:
+            writeParamSweepTableCsv(rows, f)
+
+    The configurations are elaborated in a process pool, each process keeps the bodies of the sub modules
+    elaborated for previous configurations and the sub modules with a :attr:`hwt.hwModule.HwModule._serializeDecision`
+    (:func:`hwt.serializer.mode.serializeParamsUniq`, :func:`hwt.serializer.mode.serializeOnce`) are not elaborated
+    again if they have the same parameters. The resource analysis of such module bodies is also reused.
+
+    :ivar ~.module_cls: class of the module (has to be importable by the worker processes)
+    :ivar ~.grid: dictionary name of HwParam: sequence of values
+    :ivar ~.constraint: optional function which returns False for configurations which should be skipped
+    :ivar ~.target_platform: platform used for elaboration (has to be picklable)
+    :ivar ~.max_workers: max number of worker processes, 1 to elaborate in current process
+    :ivar ~.reuse_submodules: if True the bodies of the sub modules are kept between configurations
+        (this increases the memory consumption of the workers)
+    """
+
+    def __init__(self, module_cls: Type[HwModule],
+                 grid: Dict[str, Sequence[object]],
+                 constraint: Optional[Callable[[Dict[str, object]], bool]]=None,
+                 target_platform: Optional[DummyPlatform]=None,
+                 max_workers: Optional[int]=None,
+                 reuse_submodules=True):
+        self.module_cls = module_cls
+        self.grid = grid
+        self.constraint = constraint
+        if target_platform is None:
+            target_platform = DummyPlatform()
+        self.target_platform = target_platform
+        self.max_workers = max_workers
+        self.reuse_submodules = reuse_submodules
+
+    def configurations(self) -> List[Dict[str, object]]:
+        """
+        :return: list of unique combinations of parameter values which satisfy the constraint
+        """
+        m = self.module_cls()
+        param_names = set(p._name for p in m._hwParams)
+        for name in self.grid.keys():
+            if name not in param_names:
+                raise AttributeError(self.module_cls, "does not have parameter", name)
+
+        names = list(self.grid.keys())
+        seen = set()
+        res = []
+        for values in product(*(self.grid[n] for n in names)):
+            if values in seen:
+                continue
+            seen.add(values)
+            cfg = dict(zip(names, values))
+            if self.constraint is None or self.constraint(cfg):
+                res.append(cfg)
+        return res
+
+    def run(self) -> List[dict]:
+        """
+        :return: list of rows, a dictionary for each configuration with keys
+            params, error (repr of exception or None), elaboration_time, analysis_time [s],
+            signals, statements, ports (name: width), resources (name: cnt), estimate (type of primitive: cnt)
+        """
+        configs = self.configurations()
+        args = (
+            [self.module_cls] * len(configs),
+            configs,
+            [self.target_platform] * len(configs),
+            [self.reuse_submodules] * len(configs),
+        )
+        executor = None
+        if len(configs) > 1 and (self.max_workers is None or self.max_workers > 1):
+            try:
+                executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            except (OSError, NotImplementedError, ImportError):
+                # platform without support for multiprocessing
+                executor = None
+
+        if executor is None:
+            return list(map(_elaborateConfiguration, *args))
+
+        with executor:
+            workers = self.max_workers or os.cpu_count() or 1
+            chunksize = max(1, len(configs) // (workers * 4))
+            return list(executor.map(_elaborateConfiguration, *args, chunksize=chunksize))
+
+
+@internal
+def _flattenRow(row: dict, prefix: str, res: dict):
+    for k, v in row.items():
+        if isinstance(v, dict):
+            _flattenRow(v, f"{prefix:s}{k:s}.", res)
+        else:
+            res[prefix + k] = v
+
+
+def writeParamSweepTableCsv(rows: List[dict], stream: TextIO):
+    """
+    Write the results of :meth:`~.HwParamSweep.run` as a CSV table
+    (nested dictionaries are flattened, the names of columns are joined by ".")
+    """
+    flat = []
+    columns = {}
+    for r in rows:
+        fr = {}
+        _flattenRow(r, "", fr)
+        flat.append(fr)
+        for k in fr.keys():
+            columns.setdefault(k, None)
+
+    w = csv.DictWriter(stream, fieldnames=list(columns.keys()))
+    w.writeheader()
+    w.writerows(flat)
@@ -0,0 +1,242 @@
+from math import ceil
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from hwt.code import If
+from hwt.doc_markers import internal
+from hwt.hdl.const import HConst
+from hwt.hdl.operator import HOperatorNode, isConst
+from hwt.hdl.operatorDefs import EVENT_OPS
+from hwt.hdl.statements.assignmentContainer import HdlAssignmentContainer
+from hwt.hdl.types.bits import HBits
+from hwt.mainBases import HwIOBase
+from hwt.serializer.resourceAnalyzer.costModel import ResourceCostModel
+from hwt.serializer.timingAnalyzer import operatorNodeDepth
+from hwt.synthesizer.exceptions import SigLvlConfErr
+from hwt.synthesizer.rtlLevel.rtlNetlistPass import RtlNetlistPass
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
+
+
+class PipelineRegion():
+    """
+    A region of combinational logic where the pipeline registers may be inserted.
+    The region is formed by the expressions which drive the outputs
+    (only the operators, the named signals are the inputs of the region).
+    All outputs are delayed by the same number of clock cycles (:attr:`~.latency`).
+
+    :ivar ~.name: name used as a prefix for the names of the inserted registers
+    :ivar ~.outputs: list of signals driven by the region, each has to be driven only
+        by a single unconditional assignment
+    :ivar ~.clk: clock signal for the inserted registers
+    :ivar ~.rst: optional synchronous reset of the inserted registers (registers are reset to 0)
+    :ivar ~.en: optional clock enable of the inserted registers (e.g. ready of the consumer)
+    :ivar ~.max_depth: max number of logic levels between the registers,
+        None to use the value from :class:`~.RtlNetlistPassInsertPipelineRegisters`
+    :ivar ~.latency: number of added register stages (resolved by the pass)
+    :ivar ~.registers: list of the inserted registers (resolved by the pass)
+    :note: :class:`hwt.synthesizer.netlistRelease.ReleaseNetlistAfterToRtl` clears all signal references
+        of the region, only the :attr:`~.latency` is available after the release.
+    """
+
+    def __init__(self, name: str, outputs: Sequence[RtlSignal], clk: Union[RtlSignal, HwIOBase],
+                 rst: Union[RtlSignal, HwIOBase, None]=None,
+                 en: Union[RtlSignal, HwIOBase, None]=None,
+                 max_depth: Optional[float]=None):
+        self.name = name
+        self.outputs = [o._sig if isinstance(o, HwIOBase) else o for o in outputs]
+        self.clk = clk
+        self.rst = rst
+        self.en = en
+        self.max_depth = max_depth
+        self.latency: Optional[int] = None
+        self.registers: List[RtlSignal] = []
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__:s} {self.name:s} latency:{self.latency}>"
+
+
+def pipelineRegion(m: "HwModule", name: str, outputs: Sequence[RtlSignal], clk: Union[RtlSignal, HwIOBase],
+                   rst: Union[RtlSignal, HwIOBase, None]=None,
+                   en: Union[RtlSignal, HwIOBase, None]=None,
+                   max_depth: Optional[float]=None) -> PipelineRegion:
+    """
+    Mark the logic which drives the outputs as a region where the pipeline registers can be inserted
+    by :class:`~.RtlNetlistPassInsertPipelineRegisters`. Use in :meth:`hwt.hwModule.HwModule.hwImpl`
+    after the outputs are driven.
+
+    .. code-block:: python
+
+        def hwImpl(self):
+            res = self._sig("res", HBits(32))
+            res((self.a._sig * self.b._sig) + self.c._sig)
+            vld = self._sig("vld")
+            vld(self.din.vld)
+            pipelineRegion(self, "mac", [res, vld], self.clk, rst=self.rst_n, en=self.dout.rd)
+            self.dout.data(res)
+            self.dout.vld(vld)
+            self.din.rd(self.dout.rd)
+
+    :note: The outputs of a handshaked datapath should include the valid signal so it is delayed
+        together with the data. The :attr:`PipelineRegion.latency` is resolved when the netlist
+        of the module is converted to HDL.
+    """
+    p = m._target_platform
+    if p is not None and not any(isinstance(_p, RtlNetlistPassInsertPipelineRegisters)
+                                 for _p in p.beforeHdlArchGeneration):
+        raise SigLvlConfErr(
+            "Target platform does not contain RtlNetlistPassInsertPipelineRegisters,"
+            " the pipeline region would not be processed", m, name)
+    r = PipelineRegion(name, outputs, clk, rst=rst, en=en, max_depth=max_depth)
+    m._ctx.pipelineRegions.append(r)
+    return r
+
+
+class RtlNetlistPassInsertPipelineRegisters(RtlNetlistPass):
+    """
+    Insert registers into the :class:`~.PipelineRegion` instances of the netlist so the number of logic levels
+    between registers is below the limit. The depth of operators is resolved by the cost model
+    (:class:`hwt.serializer.resourceAnalyzer.costModel.ResourceCostModel`).
+    Each operator is assigned to a pipeline stage by its arrival depth (depth // max_depth)
+    and the registers are inserted on each edge which crosses the border of the stage,
+    the outputs are aligned to the last stage.
+
+    Usage:
+
+    .. code-block:: python
+
+        p = DummyPlatform()
+        # before other passes so the original logic is removed as unconnected
+        p.beforeHdlArchGeneration.insert(0, RtlNetlistPassInsertPipelineRegisters(max_depth=4))
+
+    :ivar ~.max_depth: default max number of logic levels between the registers
+    :ivar ~.cost_model: the model of the delays of operators, if None the model from
+        :attr:`hwt.synthesizer.dummyPlatform.DummyPlatform.resourceCostModel` of the module is used
+    """
+
+    def __init__(self, max_depth: float=4.0, cost_model: Optional[ResourceCostModel]=None):
+        self.max_depth = max_depth
+        self.cost_model = cost_model
+
+    @internal
+    def _getOutputDriver(self, o: RtlSignal) -> HdlAssignmentContainer:
+        if len(o.drivers) != 1:
+            raise SigLvlConfErr("Output of pipeline region has to have exactly one driver", o, o.drivers)
+        d = o.drivers[0]
+        if not isinstance(d, HdlAssignmentContainer) or d.parentStm is not None or d.indexes:
+            raise SigLvlConfErr("Output of pipeline region has to be driven by a single unconditional assignment", o, d)
+        return d
+
+    @internal
+    def _operatorNode(self, s: Union[RtlSignal, HConst]) -> Optional[HOperatorNode]:
+        """
+        :return: the operator node which drives the signal if the signal is a part of region
+        """
+        # :note: the visibility of signals is not resolved yet, the signals which are not a result of operator
+        #     are the inputs of the region
+        if isinstance(s, HConst) or isConst(s) or len(s.drivers) != 1:
+            return None
+        d = s.drivers[0]
+        if not isinstance(d, HOperatorNode) or d.operator in EVENT_OPS:
+            return None
+        return d
+
+    @internal
+    def _arrival(self, s: Union[RtlSignal, HConst], cost_model: ResourceCostModel, arrival: Dict[RtlSignal, float]) -> float:
+        op = self._operatorNode(s)
+        if op is None:
+            return 0.0
+        a = arrival.get(s, None)
+        if a is None:
+            a = max(self._arrival(o, cost_model, arrival) for o in op.operands) + \
+                operatorNodeDepth(cost_model, op)
+            arrival[s] = a
+        return a
+
+    @staticmethod
+    def _stage(arrival: float, max_depth: float) -> int:
+        return max(0, ceil(arrival / max_depth) - 1)
+
+    @internal
+    def _delayed(self, region: PipelineRegion, s: Union[RtlSignal, HConst], n: int,
+                 delayed: Dict[Tuple[RtlSignal, int], RtlSignal]) -> Union[RtlSignal, HConst]:
+        """
+        :return: signal s delayed by n clock cycles
+        """
+        if n == 0 or isinstance(s, HConst) or isConst(s):
+            return s
+        r = delayed.get((s, n), None)
+        if r is not None:
+            return r
+
+        prev = self._delayed(region, s, n - 1, delayed)
+        t = s._dtype
+        name = f"{region.name:s}_{'st' if s.hasGenericName else s._name:s}_d{n:d}"
+        if region.rst is not None and isinstance(t, HBits):
+            r = s.ctx.sig(name, t, clk=region.clk, syncRst=region.rst, def_val=0)
+        else:
+            r = s.ctx.sig(name, t, clk=region.clk)
+        if region.en is None:
+            r(prev)
+        else:
+            If(region.en,
+               r(prev)
+            )
+        region.registers.append(r)
+        delayed[(s, n)] = r
+        return r
+
+    @internal
+    def _rebuild(self, region: PipelineRegion, s: Union[RtlSignal, HConst], stage: int,
+                 max_depth: float,
+                 arrival: Dict[RtlSignal, float],
+                 rebuilt: Dict[RtlSignal, RtlSignal],
+                 delayed: Dict[Tuple[RtlSignal, int], RtlSignal]) -> Union[RtlSignal, HConst]:
+        """
+        :return: value of the expression s in the specified pipeline stage
+        """
+        op = self._operatorNode(s)
+        if op is None:
+            # input of the region is valid in stage 0
+            return self._delayed(region, s, stage, delayed)
+
+        s_stage = self._stage(arrival[s], max_depth)
+        assert s_stage <= stage, (s, s_stage, stage)
+        res = rebuilt.get(s, None)
+        if res is None:
+            operands = [self._rebuild(region, o, s_stage, max_depth, arrival, rebuilt, delayed)
+                        for o in op.operands]
+            res = op.operator._evalFn(*operands)
+            rebuilt[s] = res
+
+        return self._delayed(region, res, stage - s_stage, delayed)
+
+    def runOnRtlNetlist(self, netlist: "RtlNetlist"):
+        if not netlist.pipelineRegions:
+            return
+
+        cost_model = self.cost_model
+        if cost_model is None:
+            cost_model = netlist.parent._target_platform.resourceCostModel
+
+        for region in netlist.pipelineRegions:
+            region: PipelineRegion
+            max_depth = region.max_depth
+            if max_depth is None:
+                max_depth = self.max_depth
+            assert max_depth > 0, (region, max_depth)
+
+            drivers = [self._getOutputDriver(o) for o in region.outputs]
+            arrival: Dict[RtlSignal, float] = {}
+            last_stage = 0
+            for d in drivers:
+                last_stage = max(last_stage, self._stage(self._arrival(d.src, cost_model, arrival), max_depth))
+
+            region.latency = last_stage
+            if last_stage == 0:
+                continue
+
+            rebuilt: Dict[RtlSignal, RtlSignal] = {}
+            delayed: Dict[Tuple[RtlSignal, int], RtlSignal] = {}
+            for o, d in zip(region.outputs, drivers):
+                src = self._rebuild(region, d.src, last_stage, max_depth, arrival, rebuilt, delayed)
+                d._destroy()
+                o(src)
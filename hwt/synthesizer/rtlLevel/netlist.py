@@ -35,6 +35,8 @@ class RtlNetlist():
     :ivar ~.hwIOs: initialized in create_HdlModuleDef
     :ivar ~.hwModDec: initialized in create_HdlModuleDec
     :ivar ~.hwModDef: initialized in create_HdlModuleDef
+    :ivar ~.pipelineRegions: regions of combinational logic where the pipeline registers
+        may be inserted (:mod:`hwt.synthesizer.rtlLevel.insert_pipeline_registers`)
     """
 
     def __init__(self, parent: Optional["HwModule"]=None):
@@ -45,6 +47,7 @@ class RtlNetlist():
         self.hwIOs: Dict[RtlSignal, DIRECTION] = {}
         self.hwModDec: Optional[HdlModuleDec] = None
         self.hwModDef: Optional[HdlModuleDef] = None
+        self.pipelineRegions: List["PipelineRegion"] = []
 
     def sig(self, name: str, dtype=BIT, clk=None, syncRst=None,
             def_val=None, nop_val=NOT_SPECIFIED, nextSig=NOT_SPECIFIED) -> Union[RtlSignal, HwIOBase]:
@@ -149,9 +152,11 @@ class RtlNetlist():
         * Remove unconnected
         * Mark visibility of signals
         """
+        profiler = store_manager.profiler
         for optPass in target_platform.beforeHdlArchGeneration:
             optPass: RtlNetlistPass
-            optPass.runOnRtlNetlist(self)
+            with profiler.phase(self.parent, optPass.__class__.__name__):
+                optPass.runOnRtlNetlist(self)
 
         ns = store_manager.name_scope
         mdef = HdlModuleDef()
@@ -159,8 +164,9 @@ class RtlNetlist():
         mdef.module_name = HdlValueId(self.hwModDec.name, obj=self.hwModDec)
         mdef.name = "rtl"
 
-        processes = sorted(self.statements, key=HdlStatement_sort_key)
-        processes = sorted(statements_to_HdlStmCodeBlockContainers(processes), key=HdlStatement_sort_key)
+        with profiler.phase(self.parent, "statements_to_HdlStmCodeBlockContainers"):
+            processes = sorted(self.statements, key=HdlStatement_sort_key)
+            processes = sorted(statements_to_HdlStmCodeBlockContainers(processes), key=HdlStatement_sort_key)
 
         # add signals, variables, etc. in architecture
         for s in sorted((s for s in self.signals
@@ -0,0 +1,303 @@
+from typing import Dict, Generator, List, Optional, Set, Tuple, Union
+
+from hwt.code import If
+from hwt.doc_markers import internal
+from hwt.hdl.const import HConst
+from hwt.hdl.operator import HOperatorNode, isConst
+from hwt.hdl.operatorDefs import EVENT_OPS, CAST_OPS, HOperatorDef
+from hwt.hdl.portItem import HdlPortItem
+from hwt.hdl.statements.assignmentContainer import HdlAssignmentContainer
+from hwt.hdl.statements.ifContainter import IfContainer
+from hwt.hdl.statements.statement import HdlStatement
+from hwt.serializer.resourceAnalyzer.costModel import ResourceCostModel
+from hwt.serializer.timingAnalyzer import operatorNodeDepth
+from hwt.synthesizer.rtlLevel.rtlNetlistPass import RtlNetlistPass
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal, CREATE_NEXT_SIGNAL
+
+# (clock edge condition, reset condition or None)
+RegisterSignature = Tuple[RtlSignal, Optional[RtlSignal]]
+# (register, cast operators applied on register, the last is applied first)
+CastedRegister = Tuple[RtlSignal, List[HOperatorDef]]
+
+
+@internal
+def _isConstOperand(o: Union[RtlSignal, HConst]) -> bool:
+    return isinstance(o, HConst) or isConst(o)
+
+
+@internal
+def _castedRegister(o: RtlSignal) -> Optional[CastedRegister]:
+    """
+    Resolve the register behind the chain of cast operators (:data:`hwt.hdl.operatorDefs.CAST_OPS`),
+    e.g. the arithmetic on HBits vector with signed=None is performed on BitsAsUnsigned of the register
+
+    :return: the register and the list of casts or None if o is not a (casted) register
+    """
+    casts = []
+    while o.next is None:
+        if len(o.drivers) != 1:
+            return None
+        d = o.drivers[0]
+        if not isinstance(d, HOperatorNode) or d.operator not in CAST_OPS:
+            return None
+        casts.append(d.operator)
+        o = d.operands[0]
+        if _isConstOperand(o):
+            return None
+    return o, casts
+
+
+@internal
+def _applyCasts(v: Union[RtlSignal, HConst], casts: List[HOperatorDef]) -> Union[RtlSignal, HConst]:
+    for c in reversed(casts):
+        v = c._evalFn(v)
+    return v
+
+
+@internal
+def _simpleRegisterSignature(r: RtlSignal) -> Optional[RegisterSignature]:
+    """
+    :return: clock and reset condition if the register was created by :meth:`hwt.synthesizer.rtlLevel.netlist.RtlNetlist.sig`
+        (the register is loaded from its "next" signal in every clock cycle), None otherwise
+    """
+    if r.next is None or len(r.drivers) != 1:
+        return None
+    stm = r.drivers[0]
+    if not isinstance(stm, IfContainer) or stm.elIfs or stm.ifFalse or \
+            stm._event_dependent_from_branch != 0 or len(stm.ifTrue) != 1 or \
+            len(stm._outputs) != 1:
+        return None
+
+    body = stm.ifTrue[0]
+    if isinstance(body, HdlAssignmentContainer):
+        if body.src is r.next and not body.indexes:
+            return (stm.cond, None)
+    elif isinstance(body, IfContainer):
+        if body.elIfs or len(body.ifTrue) != 1 or body.ifFalse is None or len(body.ifFalse) != 1:
+            return None
+        rst_a = body.ifTrue[0]
+        a = body.ifFalse[0]
+        if isinstance(rst_a, HdlAssignmentContainer) and isinstance(rst_a.src, HConst) and not rst_a.indexes and \
+                isinstance(a, HdlAssignmentContainer) and a.src is r.next and not a.indexes:
+            return (stm.cond, body.cond)
+
+    return None
+
+
+class RtlNetlistPassRetimeRegistersForward(RtlNetlistPass):
+    """
+    Move the registers created by :meth:`hwt.synthesizer.rtlLevel.netlist.RtlNetlist.sig`
+    forward over the operators if it reduces the number of logic levels of the longer of the two
+    stages around the register (the stage before the register and the stage after it).
+
+    An operator can be retimed if all its non constant operands are registers with the same clock and reset
+    (possibly behind a cast, e.g. the arithmetic on HBits vector with signed=None uses BitsAsUnsigned of the register).
+    The operator (and the casts) is then computed from the "next" signals of the registers and its result
+    is stored in a new register. The reset/default value of the new register is the operator evaluated
+    on the default values of the original registers, so the behavior of the circuit including the reset is not changed.
+
+    :attention: The original registers remain if they are used elsewhere. This includes the registers with a clock enable
+        (the hold logic of the "next" signal uses the register) and because of this the pass may increase the number of flip-flops.
+
+    Usage:
+
+    .. code-block:: python
+
+        p = DummyPlatform()
+        # before RtlNetlistPassRemoveUnconnectedSignals so the registers which are not used anymore are removed
+        p.beforeHdlArchGeneration.insert(0, RtlNetlistPassRetimeRegistersForward())
+
+    :ivar ~.max_iterations: max number of passes over the netlist (each register is moved
+        at most once in a single iteration)
+    :ivar ~.cost_model: the model of the delays of operators, if None the model from
+        :attr:`hwt.synthesizer.dummyPlatform.DummyPlatform.resourceCostModel` of the module is used
+    """
+
+    def __init__(self, max_iterations: int=8, cost_model: Optional[ResourceCostModel]=None):
+        self.max_iterations = max_iterations
+        self.cost_model = cost_model
+
+    @internal
+    def _arrival(self, s: Union[RtlSignal, HConst], cost_model: ResourceCostModel,
+                 cache: Dict[RtlSignal, float], in_progress: Set[RtlSignal]) -> float:
+        """
+        :return: number of logic levels from the start of the stage to the signal
+        """
+        if isinstance(s, HConst) or isConst(s) or s.next is not None:
+            return 0.0
+        a = cache.get(s, None)
+        if a is not None:
+            return a
+        if s in in_progress:
+            # combinational loop
+            return 0.0
+        in_progress.add(s)
+        a = 0.0
+        for d in s.drivers:
+            if isinstance(d, HOperatorNode):
+                if d.operator in EVENT_OPS:
+                    continue
+                _a = operatorNodeDepth(cost_model, d) + \
+                    max(self._arrival(o, cost_model, cache, in_progress) for o in d.operands)
+            elif isinstance(d, HdlStatement) and d._event_dependent_from_branch is None:
+                _a = cost_model.muxCost(1, 2)[1] + \
+                    max((self._arrival(i, cost_model, cache, in_progress) for i in d._inputs), default=0.0)
+            else:
+                # port or register
+                continue
+            a = max(a, _a)
+        in_progress.remove(s)
+        cache[s] = a
+        return a
+
+    @internal
+    def _required(self, s: RtlSignal, cost_model: ResourceCostModel,
+                  cache: Dict[RtlSignal, float], in_progress: Set[RtlSignal]) -> float:
+        """
+        :return: number of logic levels from the signal to the end of the stage
+        """
+        r = cache.get(s, None)
+        if r is not None:
+            return r
+        if s in in_progress:
+            # combinational loop
+            return 0.0
+        in_progress.add(s)
+        r = 0.0
+        for e in s.endpoints:
+            if isinstance(e, HOperatorNode):
+                if e.operator in EVENT_OPS:
+                    continue
+                _r = operatorNodeDepth(cost_model, e) + self._required(e.result, cost_model, cache, in_progress)
+            elif isinstance(e, HdlStatement) and e._event_dependent_from_branch is None:
+                _r = cost_model.muxCost(1, 2)[1] + \
+                    max((self._required(o, cost_model, cache, in_progress) for o in e._outputs if o.next is None), default=0.0)
+            else:
+                # port or register
+                continue
+            r = max(r, _r)
+        in_progress.remove(s)
+        cache[s] = r
+        return r
+
+    @internal
+    def _canRetime(self, op: HOperatorNode, registers: Dict[RtlSignal, Optional[RegisterSignature]]
+                   ) -> Optional[Tuple[RegisterSignature, List[Optional[CastedRegister]]]]:
+        """
+        :return: signature of the operand registers and the list of (casted) registers for each operand
+            (None for constants) if the operator can be retimed
+        """
+        if op.operator in EVENT_OPS or op.operator in CAST_OPS:
+            # the cast is retimed together with the operator which uses it
+            return None
+        res = op.result
+        if isConst(res) or any(isinstance(e, HdlPortItem) for e in res.endpoints) or not res.endpoints:
+            return None
+        sig = None
+        operands = []
+        for o in op.operands:
+            if _isConstOperand(o):
+                operands.append(None)
+                continue
+            cr = _castedRegister(o)
+            if cr is None:
+                return None
+            reg = cr[0]
+            o_sig = registers.get(reg, None)
+            if o_sig is None:
+                if reg not in registers:
+                    o_sig = registers[reg] = _simpleRegisterSignature(reg)
+                if o_sig is None:
+                    return None
+            if sig is None:
+                sig = o_sig
+            elif sig[0] is not o_sig[0] or sig[1] is not o_sig[1]:
+                return None
+            operands.append(cr)
+        if sig is None:
+            return None
+        return sig, operands
+
+    @internal
+    def _retime(self, netlist: "RtlNetlist", op: HOperatorNode, signature: RegisterSignature,
+                operands: List[Optional[CastedRegister]], def_val: HConst) -> RtlSignal:
+        clk_cond, rst_cond = signature
+        res = op.result
+        name = f"{next(cr[0] for cr in operands if cr is not None)._name:s}_{op.operator.id:s}"
+        r = res._dtype.getRtlSignalCls()(netlist, name, res._dtype, def_val, next_signal=CREATE_NEXT_SIGNAL)
+        if rst_cond is None:
+            body = [r(r.next, dst_resolve_fn=lambda x: x)]
+        else:
+            body = If(rst_cond,
+                      r(def_val, dst_resolve_fn=lambda x: x)
+                   ).Else(
+                      r(r.next, dst_resolve_fn=lambda x: x)
+                   )
+        If(clk_cond,
+           body
+        )
+        r(op.operator._evalFn(*(o if cr is None else _applyCasts(cr[0].next, cr[1])
+                                for o, cr in zip(op.operands, operands))))
+
+        for e in tuple(res.endpoints):
+            if isinstance(e, HOperatorNode):
+                e._replace_input(res, r)
+            else:
+                e._replace_input((res, r))
+        op._destroy()
+        return r
+
+    @internal
+    def _candidateOperators(self, s: RtlSignal) -> Generator[HOperatorNode, None, None]:
+        """
+        :return: generator of operators which use the signal directly or through casts
+        """
+        for e in tuple(s.endpoints):
+            if not isinstance(e, HOperatorNode) or e.result is None:
+                continue
+            if e.operator in CAST_OPS:
+                yield from self._candidateOperators(e.result)
+            else:
+                yield e
+
+    def runOnRtlNetlist(self, netlist: "RtlNetlist"):
+        cost_model = self.cost_model
+        if cost_model is None:
+            cost_model = netlist.parent._target_platform.resourceCostModel
+
+        for _ in range(self.max_iterations):
+            registers: Dict[RtlSignal, Optional[RegisterSignature]] = {}
+            arrival: Dict[RtlSignal, float] = {}
+            required: Dict[RtlSignal, float] = {}
+            touched: Set[RtlSignal] = set()
+            changed = False
+            for s in sorted(netlist.signals, key=lambda s: s._instId):
+                if s.next is None or s in touched:
+                    continue
+                for op in tuple(self._candidateOperators(s)):
+                    if op.result is None:
+                        # already retimed
+                        continue
+                    can_retime = self._canRetime(op, registers)
+                    if can_retime is None:
+                        continue
+                    signature, operands = can_retime
+                    regs = [cr[0] for cr in operands if cr is not None]
+                    if any(o in touched for o in regs):
+                        continue
+                    def_val = op.operator._evalFn(*(o if cr is None else _applyCasts(cr[0].def_val, cr[1])
+                                                    for o, cr in zip(op.operands, operands)))
+                    if not isinstance(def_val, HConst):
+                        continue
+
+                    before = max(self._arrival(o.next, cost_model, arrival, set()) for o in regs)
+                    d = operatorNodeDepth(cost_model, op)
+                    after = self._required(op.result, cost_model, required, set())
+                    if max(before + d, after) < max(before, d + after):
+                        touched.update(regs)
+                        self._retime(netlist, op, signature, operands, def_val)
+                        changed = True
+                        break
+
+            if not changed:
+                break
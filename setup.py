@@ -40,7 +40,10 @@ setup(name="hwt",
           "hwtSimApi>=1.3",  # simulator API
           "pyDigitalWaveTools>=1.1",  # simulator output dump
       ],
+      extras_require={
+          "numpy": ["numpy"],  # bulk conversions of simulation arrays and agent data (hwt.simulator.numpyUtils)
+      },
       license="MIT",
-      packages=find_packages(),
+      packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
       zip_safe=True
 )